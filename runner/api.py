@@ -2,73 +2,437 @@
 
 from __future__ import annotations
 
+from dataclasses import replace
 from typing import Any
 from uuid import uuid4
 
-from runner.http import RunnerHttpClient
-from runner.types import Job, JobExecutionResult, job_from_dict
+from runner.codec import JobListing
+from runner.http import AsyncRunnerHttpClient, RunnerHttpClient, RunnerHttpError
+from runner.types import Job, JobExecutionResult
+
+# Statuses a backend without long-poll support answers to the ``wait`` parameter.
+_LONG_POLL_UNSUPPORTED_STATUSES = frozenset({400, 404, 405, 422, 501})
+# Statuses a backend without an optional batch endpoint answers with.
+_ENDPOINT_UNSUPPORTED_STATUSES = frozenset({404, 405, 501})
 
 
 class RunnerBackendApi:
-    def __init__(self, client: RunnerHttpClient) -> None:
+    def __init__(self, client: RunnerHttpClient, *, long_poll_seconds: float = 0.0) -> None:
         self._client = client
+        self._long_poll_seconds = long_poll_seconds
+        self._long_poll_supported: bool | None = None
+        self._claim_next_supported: bool | None = None
+        self._batch_heartbeat_supported: bool | None = None
+        self._bulk_complete_supported: bool | None = None
+        self._release_supported: bool | None = None
+
+    @property
+    def long_poll_active(self) -> bool:
+        """Whether empty pending-job listings were held open by the backend."""
+        return self._long_poll_seconds > 0 and self._long_poll_supported is not False
 
     def get_job(self, job_id: str) -> Job:
-        payload = self._client.request_json(
+        body = self._client.request_bytes(
             "GET",
             f"/runner/jobs/{job_id}",
             headers=_trace_headers(action="get-job", job_id=job_id),
+            endpoint="get-job",
+            revalidate=True,
         )
-        if not isinstance(payload, dict):
-            raise ValueError("Invalid job payload from backend")
-        return job_from_dict(payload)
+        return self._client.codec.decode_job(body)
+
+    def list_pending_jobs(self, *, limit: int = 1, long_poll: bool = True) -> list[Job]:
+        """List pending jobs, letting the backend hold the request when long-poll is enabled.
 
-    def list_pending_jobs(self, *, limit: int = 1) -> list[Job]:
-        payload = self._client.request_json(
+        Falls back to short polling for good once the backend rejects the
+        ``wait`` parameter or answers without echoing it.
+        """
+        if long_poll and self.long_poll_active:
+            try:
+                body = self._client.request_bytes(
+                    "GET",
+                    "/runner/jobs",
+                    params=_pending_params(limit, wait_seconds=self._long_poll_seconds),
+                    headers=_trace_headers(action="list-pending"),
+                    endpoint="list-pending",
+                    timeout=self._client.timeout_seconds + self._long_poll_seconds,
+                )
+            except RunnerHttpError as exc:
+                if exc.status_code not in _LONG_POLL_UNSUPPORTED_STATUSES:
+                    raise
+                self._long_poll_supported = False
+            else:
+                listing = self._client.codec.decode_job_listing(body)
+                self._long_poll_supported = listing.echoes_wait
+                return listing.jobs
+
+        body = self._client.request_bytes(
             "GET",
             "/runner/jobs",
-            params={"status": "pending", "limit": limit},
+            params=_pending_params(limit),
             headers=_trace_headers(action="list-pending"),
+            endpoint="list-pending",
         )
+        return self._client.codec.decode_job_listing(body).jobs
+
+    def claim_next_jobs(self, *, limit: int = 1, long_poll: bool = True) -> list[Job] | None:
+        """Atomically claim up to ``limit`` pending jobs in one round trip.
 
-        raw_items: list[dict[str, Any]]
-        if isinstance(payload, list):
-            raw_items = [item for item in payload if isinstance(item, dict)]
-        elif isinstance(payload, dict) and isinstance(payload.get("items"), list):
-            raw_items = [item for item in payload["items"] if isinstance(item, dict)]
-        else:
-            raise ValueError("Invalid jobs payload from backend")
+        Returns ``None`` when the backend has no claim-next endpoint, in which
+        case callers fall back to :meth:`list_pending_jobs` plus :meth:`claim_job`.
+        """
+        if self._claim_next_supported is False:
+            return None
 
-        return [job_from_dict(item) for item in raw_items]
+        wait_seconds = self._long_poll_seconds if long_poll and self.long_poll_active else 0.0
+        try:
+            body = self._client.request_bytes(
+                "POST",
+                "/runner/jobs/claim-next",
+                json=_claim_next_body(limit, wait_seconds=wait_seconds),
+                headers=_trace_headers(action="claim-next"),
+                endpoint="claim-next",
+                timeout=self._client.timeout_seconds + wait_seconds if wait_seconds else None,
+            )
+        except RunnerHttpError as exc:
+            if exc.status_code in _ENDPOINT_UNSUPPORTED_STATUSES:
+                self._claim_next_supported = False
+                return None
+            if not wait_seconds or exc.status_code not in _LONG_POLL_UNSUPPORTED_STATUSES:
+                raise
+            self._long_poll_supported = False
+            return self.claim_next_jobs(limit=limit, long_poll=False)
+
+        self._claim_next_supported = True
+        listing = self._client.codec.decode_job_listing(body)
+        if wait_seconds:
+            self._long_poll_supported = listing.echoes_wait
+        return _claimed_jobs(listing)
 
     def claim_job(self, job_id: str) -> None:
         _ = self._client.request_json(
             "POST",
             f"/runner/jobs/{job_id}/claim",
             headers=_trace_headers(action="claim", job_id=job_id),
+            endpoint="claim",
         )
 
+    def release_job(self, job_id: str) -> bool:
+        """Hand a claimed job that never started back to the queue.
+
+        Returns ``False`` without a request once the backend has shown it has
+        no release endpoint; the job is then left to its lease timeout.
+        """
+        if self._release_supported is False:
+            return False
+        try:
+            _ = self._client.request_json(
+                "POST",
+                f"/runner/jobs/{job_id}/release",
+                headers=_trace_headers(action="release", job_id=job_id),
+                endpoint="release",
+            )
+        except RunnerHttpError as exc:
+            if exc.status_code not in _ENDPOINT_UNSUPPORTED_STATUSES:
+                raise
+            self._release_supported = False
+            return False
+        self._release_supported = True
+        return True
+
     def heartbeat_job(self, job_id: str, status: str) -> None:
         _ = self._client.request_json(
             "POST",
             f"/runner/jobs/{job_id}/heartbeat",
             json={"status": status},
             headers=_trace_headers(action="heartbeat", job_id=job_id),
+            endpoint="heartbeat",
         )
 
+    def heartbeat_jobs(self, job_ids: list[str], status: str) -> None:
+        """Renew leases for several jobs in one request, falling back to one call per job."""
+        if not job_ids:
+            return
+        if self._batch_heartbeat_supported is not False:
+            try:
+                _ = self._client.request_json(
+                    "POST",
+                    "/runner/jobs/heartbeat",
+                    json={"job_ids": job_ids, "status": status},
+                    headers=_trace_headers(action="heartbeat-batch"),
+                    endpoint="heartbeat-batch",
+                )
+            except RunnerHttpError as exc:
+                if exc.status_code not in _ENDPOINT_UNSUPPORTED_STATUSES:
+                    raise
+                self._batch_heartbeat_supported = False
+            else:
+                self._batch_heartbeat_supported = True
+                return
+
+        for job_id in job_ids:
+            self.heartbeat_job(job_id, status)
+
     def complete_job(self, result: JobExecutionResult) -> None:
-        payload = {
-            "status": result.status,
-            "result": result.result,
-            "error": result.error,
-            "logs": [log.to_dict() for log in result.logs],
-        }
         _ = self._client.request_json(
             "POST",
             f"/runner/jobs/{result.job_id}/complete",
-            json=payload,
+            json=_completion_payload(result),
             headers=_trace_headers(action="complete", job_id=result.job_id),
+            endpoint="complete",
+            compress=True,
+        )
+
+    def complete_jobs(self, results: list[JobExecutionResult]) -> list[JobExecutionResult]:
+        """Complete several jobs in one request.
+
+        Returns the results the backend did not acknowledge so callers can
+        complete them one by one; without a bulk endpoint that is all of them.
+        """
+        if not results or self._bulk_complete_supported is False:
+            return list(results)
+        try:
+            payload = self._client.request_json(
+                "POST",
+                "/runner/jobs/complete",
+                json=_bulk_completion_body(results),
+                headers=_trace_headers(action="complete-batch"),
+                endpoint="complete-batch",
+                compress=True,
+            )
+        except RunnerHttpError as exc:
+            if exc.status_code not in _ENDPOINT_UNSUPPORTED_STATUSES:
+                raise
+            self._bulk_complete_supported = False
+            return list(results)
+
+        self._bulk_complete_supported = True
+        return _unacknowledged(results, payload)
+
+
+class AsyncRunnerBackendApi:
+    """Asyncio counterpart of :class:`RunnerBackendApi`."""
+
+    def __init__(self, client: AsyncRunnerHttpClient, *, long_poll_seconds: float = 0.0) -> None:
+        self._client = client
+        self._long_poll_seconds = long_poll_seconds
+        self._long_poll_supported: bool | None = None
+        self._claim_next_supported: bool | None = None
+        self._batch_heartbeat_supported: bool | None = None
+        self._bulk_complete_supported: bool | None = None
+        self._release_supported: bool | None = None
+
+    @property
+    def long_poll_active(self) -> bool:
+        """Whether empty pending-job listings were held open by the backend."""
+        return self._long_poll_seconds > 0 and self._long_poll_supported is not False
+
+    async def get_job(self, job_id: str) -> Job:
+        body = await self._client.request_bytes(
+            "GET",
+            f"/runner/jobs/{job_id}",
+            headers=_trace_headers(action="get-job", job_id=job_id),
+            endpoint="get-job",
+            revalidate=True,
         )
+        return self._client.codec.decode_job(body)
+
+    async def list_pending_jobs(self, *, limit: int = 1, long_poll: bool = True) -> list[Job]:
+        if long_poll and self.long_poll_active:
+            try:
+                body = await self._client.request_bytes(
+                    "GET",
+                    "/runner/jobs",
+                    params=_pending_params(limit, wait_seconds=self._long_poll_seconds),
+                    headers=_trace_headers(action="list-pending"),
+                    endpoint="list-pending",
+                    timeout=self._client.timeout_seconds + self._long_poll_seconds,
+                )
+            except RunnerHttpError as exc:
+                if exc.status_code not in _LONG_POLL_UNSUPPORTED_STATUSES:
+                    raise
+                self._long_poll_supported = False
+            else:
+                listing = self._client.codec.decode_job_listing(body)
+                self._long_poll_supported = listing.echoes_wait
+                return listing.jobs
+
+        body = await self._client.request_bytes(
+            "GET",
+            "/runner/jobs",
+            params=_pending_params(limit),
+            headers=_trace_headers(action="list-pending"),
+            endpoint="list-pending",
+        )
+        return self._client.codec.decode_job_listing(body).jobs
+
+    async def claim_next_jobs(self, *, limit: int = 1, long_poll: bool = True) -> list[Job] | None:
+        if self._claim_next_supported is False:
+            return None
+
+        wait_seconds = self._long_poll_seconds if long_poll and self.long_poll_active else 0.0
+        try:
+            body = await self._client.request_bytes(
+                "POST",
+                "/runner/jobs/claim-next",
+                json=_claim_next_body(limit, wait_seconds=wait_seconds),
+                headers=_trace_headers(action="claim-next"),
+                endpoint="claim-next",
+                timeout=self._client.timeout_seconds + wait_seconds if wait_seconds else None,
+            )
+        except RunnerHttpError as exc:
+            if exc.status_code in _ENDPOINT_UNSUPPORTED_STATUSES:
+                self._claim_next_supported = False
+                return None
+            if not wait_seconds or exc.status_code not in _LONG_POLL_UNSUPPORTED_STATUSES:
+                raise
+            self._long_poll_supported = False
+            return await self.claim_next_jobs(limit=limit, long_poll=False)
+
+        self._claim_next_supported = True
+        listing = self._client.codec.decode_job_listing(body)
+        if wait_seconds:
+            self._long_poll_supported = listing.echoes_wait
+        return _claimed_jobs(listing)
+
+    async def claim_job(self, job_id: str) -> None:
+        _ = await self._client.request_json(
+            "POST",
+            f"/runner/jobs/{job_id}/claim",
+            headers=_trace_headers(action="claim", job_id=job_id),
+            endpoint="claim",
+        )
+
+    async def release_job(self, job_id: str) -> bool:
+        if self._release_supported is False:
+            return False
+        try:
+            _ = await self._client.request_json(
+                "POST",
+                f"/runner/jobs/{job_id}/release",
+                headers=_trace_headers(action="release", job_id=job_id),
+                endpoint="release",
+            )
+        except RunnerHttpError as exc:
+            if exc.status_code not in _ENDPOINT_UNSUPPORTED_STATUSES:
+                raise
+            self._release_supported = False
+            return False
+        self._release_supported = True
+        return True
+
+    async def heartbeat_job(self, job_id: str, status: str) -> None:
+        _ = await self._client.request_json(
+            "POST",
+            f"/runner/jobs/{job_id}/heartbeat",
+            json={"status": status},
+            headers=_trace_headers(action="heartbeat", job_id=job_id),
+            endpoint="heartbeat",
+        )
+
+    async def heartbeat_jobs(self, job_ids: list[str], status: str) -> None:
+        if not job_ids:
+            return
+        if self._batch_heartbeat_supported is not False:
+            try:
+                _ = await self._client.request_json(
+                    "POST",
+                    "/runner/jobs/heartbeat",
+                    json={"job_ids": job_ids, "status": status},
+                    headers=_trace_headers(action="heartbeat-batch"),
+                    endpoint="heartbeat-batch",
+                )
+            except RunnerHttpError as exc:
+                if exc.status_code not in _ENDPOINT_UNSUPPORTED_STATUSES:
+                    raise
+                self._batch_heartbeat_supported = False
+            else:
+                self._batch_heartbeat_supported = True
+                return
+
+        for job_id in job_ids:
+            await self.heartbeat_job(job_id, status)
+
+    async def complete_job(self, result: JobExecutionResult) -> None:
+        _ = await self._client.request_json(
+            "POST",
+            f"/runner/jobs/{result.job_id}/complete",
+            json=_completion_payload(result),
+            headers=_trace_headers(action="complete", job_id=result.job_id),
+            endpoint="complete",
+            compress=True,
+        )
+
+    async def complete_jobs(self, results: list[JobExecutionResult]) -> list[JobExecutionResult]:
+        if not results or self._bulk_complete_supported is False:
+            return list(results)
+        try:
+            payload = await self._client.request_json(
+                "POST",
+                "/runner/jobs/complete",
+                json=_bulk_completion_body(results),
+                headers=_trace_headers(action="complete-batch"),
+                endpoint="complete-batch",
+                compress=True,
+            )
+        except RunnerHttpError as exc:
+            if exc.status_code not in _ENDPOINT_UNSUPPORTED_STATUSES:
+                raise
+            self._bulk_complete_supported = False
+            return list(results)
+
+        self._bulk_complete_supported = True
+        return _unacknowledged(results, payload)
+
+
+def _pending_params(limit: int, *, wait_seconds: float | None = None) -> dict[str, Any]:
+    params: dict[str, Any] = {"status": "pending", "limit": limit}
+    if wait_seconds:
+        params["wait"] = wait_seconds
+    return params
+
+
+def _claim_next_body(limit: int, *, wait_seconds: float) -> dict[str, Any]:
+    body: dict[str, Any] = {"limit": limit}
+    if wait_seconds:
+        body["wait"] = wait_seconds
+    return body
+
+
+def _claimed_jobs(listing: JobListing) -> list[Job]:
+    # Claimed jobs start their runner lifecycle at picked_up whatever status
+    # the backend recorded for the claim itself.
+    return [replace(job, status="picked_up") for job in listing.jobs]
+
+
+def _completion_payload(result: JobExecutionResult) -> dict[str, Any]:
+    return {
+        "status": result.status,
+        "result": result.result,
+        "error": result.error,
+        "logs": [log.to_dict() for log in result.logs],
+        **({"timings": _rounded_timings(result.timings)} if result.timings else {}),
+    }
+
+
+def _rounded_timings(timings: dict[str, float]) -> dict[str, float]:
+    return {phase: round(seconds, 6) for phase, seconds in timings.items()}
+
+
+def _bulk_completion_body(results: list[JobExecutionResult]) -> dict[str, Any]:
+    return {
+        "items": [{"job_id": result.job_id, **_completion_payload(result)} for result in results]
+    }
+
+
+def _unacknowledged(results: list[JobExecutionResult], payload: Any) -> list[JobExecutionResult]:
+    items = payload.get("items") if isinstance(payload, dict) else None
+    acknowledged = {
+        item.get("job_id")
+        for item in items or []
+        if isinstance(item, dict) and item.get("ok") is True
+    }
+    return [result for result in results if result.job_id not in acknowledged]
 
 
 def _trace_headers(*, action: str, job_id: str | None = None) -> dict[str, str]:
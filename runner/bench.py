@@ -0,0 +1,459 @@
+"""Load-test harness running the poller against an in-process fake backend."""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime, timezone
+import gzip
+import hashlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import math
+import multiprocessing
+from pathlib import Path
+import random
+import re
+import shlex
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Literal
+from urllib.parse import parse_qs, urlsplit
+
+from runner.api import AsyncRunnerBackendApi, RunnerBackendApi
+from runner.config import RunnerSettings
+from runner.http import AsyncRunnerHttpClient, RunnerHttpClient
+from runner.jobs import AsyncJobExecutor, JobExecutor
+from runner.poller import AsyncRunnerPoller, RunnerPoller
+from runner.scheduler import LaneScheduler
+
+Engine = Literal["sync", "async"]
+ExecutionMode = Literal["api", "host"]
+
+_JOB_PATH = re.compile(
+    r"/runner/jobs/(?P<job_id>[^/]+)(?:/(?P<action>claim|release|heartbeat|complete))?"
+)
+_COMPILE_PATH = re.compile(r"/styles/(?P<style_id>[^/]+)/versions/(?P<version>[^/]+)/compile")
+_ARTIFACT_PATH = re.compile(r"/artifacts/(?P<artifact_id>[^/]+)")
+
+
+@dataclass(frozen=True)
+class BenchConfig:
+    jobs: int = 200
+    workers: int = 8
+    prefetch_depth: int = 0
+    latency_seconds: float = 0.0
+    error_rate: float = 0.0
+    artifact_bytes: int = 64 * 1024
+    timeout_seconds: float = 300.0
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        if self.jobs < 1:
+            raise ValueError("jobs must be >= 1")
+        if self.workers < 1:
+            raise ValueError("workers must be >= 1")
+        if self.prefetch_depth < 0:
+            raise ValueError("prefetch_depth must be >= 0")
+        if self.latency_seconds < 0:
+            raise ValueError("latency_seconds must be >= 0")
+        if not 0 <= self.error_rate <= 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        if self.artifact_bytes < 0:
+            raise ValueError("artifact_bytes must be >= 0")
+
+
+class FakeBackend:
+    """Threaded HTTP server implementing the runner's backend contracts.
+
+    Every request waits ``latency_seconds`` before it is answered. Compile
+    and artifact requests fail with ``503`` at ``error_rate``; job lifecycle
+    calls never fail, so every seeded job is eventually completed.
+    """
+
+    def __init__(self, config: BenchConfig, *, host: str = "127.0.0.1") -> None:
+        self._config = config
+        self._artifact = random.Random(config.seed).randbytes(config.artifact_bytes)
+        self._artifact_sha256 = hashlib.sha256(self._artifact).hexdigest()
+        self._random = random.Random(config.seed)
+        self._lock = threading.Lock()
+        self._jobs: dict[str, dict[str, Any]] = {}
+        self._pending: list[str] = []
+        self._claimed_at: dict[str, float] = {}
+        self._completed: dict[str, tuple[float, dict[str, Any]]] = {}
+        self.all_completed = threading.Event()
+        self._server = ThreadingHTTPServer((host, 0), _backend_handler(self))
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="bench-backend", daemon=True
+        )
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeBackend":
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def seed_jobs(self, count: int) -> None:
+        created_at = datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            for index in range(count):
+                job_id = f"bench-{len(self._jobs) + 1}"
+                self._jobs[job_id] = {
+                    "job_id": job_id,
+                    "job_type": "compile_captureone",
+                    "payload": {"style_id": f"style-{index % 10}", "version": "v1"},
+                    "status": "pending",
+                    "created_at": created_at,
+                }
+                self._pending.append(job_id)
+            self.all_completed.clear()
+
+    def completions(self) -> list[dict[str, Any]]:
+        """Return completion payloads with the backend-side claim-to-complete time."""
+        with self._lock:
+            return [
+                {
+                    **payload,
+                    "job_id": job_id,
+                    "backend_seconds": completed_at - self._claimed_at.get(job_id, completed_at),
+                }
+                for job_id, (completed_at, payload) in self._completed.items()
+            ]
+
+    def last_completed_at(self) -> float | None:
+        with self._lock:
+            return max((at for at, _ in self._completed.values()), default=None)
+
+    def handle(
+        self, method: str, path: str, query: dict[str, list[str]], body: Any
+    ) -> tuple[int, Any]:
+        if self._config.latency_seconds:
+            time.sleep(self._config.latency_seconds)
+
+        if method == "GET" and path == "/runner/jobs":
+            limit = int(query.get("limit", ["1"])[0])
+            with self._lock:
+                return 200, {"items": [self._jobs[job_id] for job_id in self._pending[:limit]]}
+        if method == "POST" and path == "/runner/jobs/claim-next":
+            limit = int(body.get("limit", 1)) if isinstance(body, dict) else 1
+            with self._lock:
+                claimed = self._pending[:limit]
+                del self._pending[:limit]
+                now = time.monotonic()
+                for job_id in claimed:
+                    self._claimed_at[job_id] = now
+                return 200, {"items": [self._jobs[job_id] for job_id in claimed]}
+        if method == "POST" and path == "/runner/jobs/heartbeat":
+            return 200, {}
+        if method == "POST" and path == "/runner/jobs/complete":
+            items = body.get("items", []) if isinstance(body, dict) else []
+            for item in items:
+                self._complete(item["job_id"], item)
+            return 200, {"items": [{"job_id": item["job_id"], "ok": True} for item in items]}
+
+        match = _JOB_PATH.fullmatch(path)
+        if match is not None:
+            return self._job_action(method, match["job_id"], match["action"], body)
+
+        match = _COMPILE_PATH.fullmatch(path)
+        if match is not None and method == "POST":
+            if self._fails():
+                return 503, {"detail": "injected compile failure"}
+            artifact_id = f"artifact-{match['style_id']}-{self._random_suffix()}"
+            return 200, {
+                "artifact_id": artifact_id,
+                "download_url": f"/artifacts/{artifact_id}",
+                "sha256": self._artifact_sha256,
+            }
+
+        match = _ARTIFACT_PATH.fullmatch(path)
+        if match is not None and method == "GET":
+            if self._fails():
+                return 503, {"detail": "injected download failure"}
+            return 200, self._artifact
+        return 404, {"detail": "not found"}
+
+    def _job_action(
+        self, method: str, job_id: str, action: str | None, body: Any
+    ) -> tuple[int, Any]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return 404, {"detail": "job not found"}
+            if action is None and method == "GET":
+                return 200, job
+            if action == "claim" and method == "POST":
+                if job_id not in self._pending:
+                    return 409, {"detail": "job already claimed"}
+                self._pending.remove(job_id)
+                self._claimed_at[job_id] = time.monotonic()
+                return 200, {}
+            if action == "release" and method == "POST":
+                if job_id not in self._pending:
+                    self._pending.insert(0, job_id)
+                self._claimed_at.pop(job_id, None)
+                return 200, {}
+        if action == "heartbeat" and method == "POST":
+            return 200, {}
+        if action == "complete" and method == "POST":
+            self._complete(job_id, body if isinstance(body, dict) else {})
+            return 200, {}
+        return 405, {"detail": "method not allowed"}
+
+    def _complete(self, job_id: str, payload: dict[str, Any]) -> None:
+        with self._lock:
+            self._completed[job_id] = (time.monotonic(), payload)
+            if len(self._completed) >= len(self._jobs):
+                self.all_completed.set()
+
+    def _fails(self) -> bool:
+        with self._lock:
+            return self._random.random() < self._config.error_rate
+
+    def _random_suffix(self) -> str:
+        with self._lock:
+            return f"{self._random.getrandbits(64):016x}"
+
+
+def _backend_handler(backend: FakeBackend) -> type[BaseHTTPRequestHandler]:
+    class _Handler(BaseHTTPRequestHandler):
+        # Keep-alive, like a production backend behind a load balancer. Without
+        # TCP_NODELAY every response pays a delayed-ACK stall on its body write.
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self) -> None:
+            self._dispatch("GET")
+
+        def do_POST(self) -> None:
+            self._dispatch("POST")
+
+        def log_message(self, format: str, *args: object) -> None:
+            return
+
+        def _dispatch(self, method: str) -> None:
+            raw = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            encoding = self.headers.get("Content-Encoding", "identity").lower()
+            if encoding == "gzip":
+                raw = gzip.decompress(raw)
+            elif encoding != "identity":
+                self._reply(415, {"detail": f"unsupported content encoding {encoding}"})
+                return
+            url = urlsplit(self.path)
+            body = json.loads(raw) if raw else None
+            status, payload = backend.handle(method, url.path, parse_qs(url.query), body)
+            self._reply(status, payload)
+
+        def _reply(self, status: int, payload: Any) -> None:
+            if isinstance(payload, bytes):
+                data, content_type = payload, "application/octet-stream"
+            else:
+                data, content_type = json.dumps(payload).encode("utf-8"), "application/json"
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    return _Handler
+
+
+def run_bench(
+    config: BenchConfig,
+    *,
+    engines: tuple[Engine, ...] = ("sync", "async"),
+    execution_modes: tuple[ExecutionMode, ...] = ("api", "host"),
+    settings: RunnerSettings | None = None,
+    isolate: bool = True,
+) -> list[dict[str, Any]]:
+    """Run one scenario per engine and execution mode and return their reports.
+
+    With ``isolate`` every scenario runs in a fresh process so its peak RSS is
+    not inflated by the scenarios before it.
+    """
+    base = settings or RunnerSettings.from_env()
+    scenarios = [(engine, mode) for engine in engines for mode in execution_modes]
+    if not isolate:
+        return [run_scenario(config, engine, mode, base) for engine, mode in scenarios]
+
+    reports = []
+    for engine, mode in scenarios:
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            reports.append(pool.submit(run_scenario, config, engine, mode, base).result())
+    return reports
+
+
+def run_scenario(
+    config: BenchConfig,
+    engine: Engine,
+    execution_mode: ExecutionMode,
+    settings: RunnerSettings | None = None,
+) -> dict[str, Any]:
+    backend = FakeBackend(config).start()
+    workdir = Path(tempfile.mkdtemp(prefix="runner-bench-"))
+    try:
+        bench_settings = _bench_settings(
+            settings or RunnerSettings(), backend, config, execution_mode, workdir
+        )
+        backend.seed_jobs(config.jobs)
+        started = time.monotonic()
+        if engine == "async":
+            finished = asyncio.run(_drive_async(bench_settings, backend, config))
+        else:
+            finished = _drive_sync(bench_settings, backend, config)
+        if not finished:
+            raise RuntimeError(
+                f"bench timed out after {config.timeout_seconds}s "
+                f"({len(backend.completions())}/{config.jobs} jobs completed)"
+            )
+        elapsed = (backend.last_completed_at() or time.monotonic()) - started
+        return _report(config, engine, execution_mode, backend.completions(), elapsed)
+    finally:
+        backend.close()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def _bench_settings(
+    settings: RunnerSettings,
+    backend: FakeBackend,
+    config: BenchConfig,
+    execution_mode: ExecutionMode,
+    workdir: Path,
+) -> RunnerSettings:
+    app_path = workdir / "Capture One.app"
+    app_path.mkdir()
+    # `true` stands in for the Capture One CLI so host mode pays a real process spawn.
+    import_command = shutil.which("true") or f"{sys.executable} -c pass"
+    return replace(
+        settings,
+        api_base_url=backend.base_url,
+        poll_interval_seconds=0.01,
+        poll_max_interval_seconds=0.05,
+        poll_workers=config.workers,
+        prefetch_depth=config.prefetch_depth,
+        long_poll_seconds=0.0,
+        heartbeat_interval_seconds=0.0,
+        execution_mode=execution_mode,
+        captureone_auto_open=True,
+        captureone_app_path=str(app_path),
+        captureone_import_dir=str(workdir / "imports"),
+        captureone_launch_mode="cli",
+        captureone_cli_command=f"{shlex.quote(import_command)} {{costyle_path}}",
+        artifact_cache_dir="",
+    )
+
+
+def _drive_sync(settings: RunnerSettings, backend: FakeBackend, config: BenchConfig) -> bool:
+    with RunnerHttpClient(settings) as client:
+        poller = RunnerPoller(
+            RunnerBackendApi(client),
+            JobExecutor(client, settings=settings),
+            poll_interval_seconds=settings.poll_interval_seconds,
+            max_poll_interval_seconds=settings.poll_max_interval_seconds,
+            workers=config.workers,
+            completion_batch_size=settings.completion_batch_size,
+            completion_flush_interval_seconds=settings.completion_flush_interval_seconds,
+            prefetch_depth=settings.prefetch_depth,
+            scheduler=LaneScheduler.from_settings(settings),
+            lookahead=settings.scheduler_lookahead,
+            emit=lambda _: None,
+            codec=client.codec,
+        )
+        thread = threading.Thread(target=poller.poll_forever, name="bench-poller", daemon=True)
+        thread.start()
+        try:
+            return backend.all_completed.wait(config.timeout_seconds)
+        finally:
+            poller.stop()
+            thread.join()
+            poller.close()
+
+
+async def _drive_async(
+    settings: RunnerSettings, backend: FakeBackend, config: BenchConfig
+) -> bool:
+    async with AsyncRunnerHttpClient(settings) as client:
+        poller = AsyncRunnerPoller(
+            AsyncRunnerBackendApi(client),
+            AsyncJobExecutor(client, settings=settings),
+            poll_interval_seconds=settings.poll_interval_seconds,
+            max_poll_interval_seconds=settings.poll_max_interval_seconds,
+            workers=config.workers,
+            completion_batch_size=settings.completion_batch_size,
+            completion_flush_interval_seconds=settings.completion_flush_interval_seconds,
+            prefetch_depth=settings.prefetch_depth,
+            scheduler=LaneScheduler.from_settings(settings),
+            lookahead=settings.scheduler_lookahead,
+            emit=lambda _: None,
+            codec=client.codec,
+        )
+        task = asyncio.create_task(poller.poll_forever())
+        try:
+            return await asyncio.to_thread(backend.all_completed.wait, config.timeout_seconds)
+        finally:
+            poller.stop()
+            await task
+            await poller.aclose()
+
+
+def _report(
+    config: BenchConfig,
+    engine: Engine,
+    execution_mode: ExecutionMode,
+    completions: list[dict[str, Any]],
+    elapsed: float,
+) -> dict[str, Any]:
+    samples: dict[str, list[float]] = {"job": [c["backend_seconds"] for c in completions]}
+    for completion in completions:
+        for phase, seconds in (completion.get("timings") or {}).items():
+            samples.setdefault(phase, []).append(seconds)
+    return {
+        "engine": engine,
+        "execution_mode": execution_mode,
+        "config": asdict(config),
+        "jobs_completed": len(completions),
+        "jobs_failed": sum(1 for c in completions if c.get("status") == "failed"),
+        "elapsed_seconds": round(elapsed, 6),
+        "jobs_per_second": round(len(completions) / elapsed, 3) if elapsed > 0 else None,
+        "peak_rss_bytes": peak_rss_bytes(),
+        "phases": {
+            phase: {
+                "count": len(values),
+                "p50_ms": round(percentile(values, 50) * 1000, 3),
+                "p99_ms": round(percentile(values, 99) * 1000, 3),
+            }
+            for phase, values in sorted(samples.items())
+        },
+    }
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of ``values``."""
+    if not values:
+        raise ValueError("percentile of an empty sample")
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def peak_rss_bytes() -> int | None:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere.
+    return peak if sys.platform == "darwin" else peak * 1024
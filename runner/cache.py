@@ -0,0 +1,207 @@
+"""On-disk cache for deterministic compile results and their artifacts."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import hashlib
+import json
+import os
+from pathlib import Path
+import shutil
+import tempfile
+import threading
+from typing import Any
+
+from runner.config import RunnerSettings
+
+
+@dataclass(frozen=True)
+class CachedCompile:
+    compile_result: dict[str, Any]
+    artifact_path: Path | None = None
+    artifact_sha256: str | None = None
+
+
+class ArtifactCache:
+    """Size-bounded LRU cache keyed by (style_id, version, target).
+
+    Compile responses are stored as small JSON entries; artifact bytes are
+    stored once per content hash under ``blobs/``. Every file counts towards
+    ``max_bytes`` and the least recently used files are evicted first, so an
+    entry may outlive its blob, in which case only the compile call is skipped.
+    Callers :meth:`invalidate` an entry whose stored response turns out stale.
+    """
+
+    def __init__(self, root: str | Path, *, max_bytes: int) -> None:
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be > 0")
+
+        self._root = Path(root).expanduser()
+        self._entries_dir = self._root / "entries"
+        self._blobs_dir = self._root / "blobs"
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: RunnerSettings) -> "ArtifactCache | None":
+        if not settings.artifact_cache_dir:
+            return None
+        return cls(settings.artifact_cache_dir, max_bytes=settings.artifact_cache_max_bytes)
+
+    def get(self, style_id: str, version: str, target: str) -> CachedCompile | None:
+        entry_path = self._entry_path(style_id, version, target)
+        try:
+            entry = json.loads(entry_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        compile_result = entry.get("compile_result") if isinstance(entry, dict) else None
+        if not isinstance(compile_result, dict):
+            return None
+        _touch(entry_path)
+
+        artifact_sha256 = entry.get("artifact_sha256")
+        if not isinstance(artifact_sha256, str):
+            return CachedCompile(compile_result=compile_result)
+
+        blob_path = self._blobs_dir / artifact_sha256
+        if not _touch(blob_path):
+            return CachedCompile(compile_result=compile_result)
+        return CachedCompile(
+            compile_result=compile_result,
+            artifact_path=blob_path,
+            artifact_sha256=artifact_sha256,
+        )
+
+    def put_result(
+        self, style_id: str, version: str, target: str, compile_result: dict[str, Any]
+    ) -> None:
+        """Cache a compile response without an artifact."""
+        self._write_entry(style_id, version, target, compile_result, artifact_sha256=None)
+        self._evict()
+
+    def put_artifact(
+        self,
+        style_id: str,
+        version: str,
+        target: str,
+        compile_result: dict[str, Any],
+        artifact_path: Path,
+    ) -> str:
+        """Cache a compile response together with the artifact file it produced."""
+        self._blobs_dir.mkdir(parents=True, exist_ok=True)
+        artifact_sha256 = _file_sha256(artifact_path)
+        blob_path = self._blobs_dir / artifact_sha256
+        if not _touch(blob_path):
+            _atomic_copy(artifact_path, blob_path)
+        self._write_entry(style_id, version, target, compile_result, artifact_sha256)
+        self._evict()
+        return artifact_sha256
+
+    def invalidate(self, style_id: str, version: str, target: str) -> None:
+        """Drop the entry for a key; its blob stays for other entries sharing it."""
+        self._entry_path(style_id, version, target).unlink(missing_ok=True)
+
+    def materialize(self, cached: CachedCompile, destination: Path) -> None:
+        """Copy a cached artifact to ``destination`` atomically.
+
+        The copy is checked against the stored sha256; a blob that no longer
+        matches is deleted and ``ValueError`` raised.
+        """
+        if cached.artifact_path is None:
+            raise ValueError("Cached compile has no artifact")
+        try:
+            _atomic_copy(cached.artifact_path, destination, sha256=cached.artifact_sha256)
+        except ValueError:
+            cached.artifact_path.unlink(missing_ok=True)
+            raise
+
+    def _entry_path(self, style_id: str, version: str, target: str) -> Path:
+        key = json.dumps([style_id, version, target])
+        return self._entries_dir / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.json"
+
+    def _write_entry(
+        self,
+        style_id: str,
+        version: str,
+        target: str,
+        compile_result: dict[str, Any],
+        artifact_sha256: str | None,
+    ) -> None:
+        self._entries_dir.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "key": {"style_id": style_id, "version": version, "target": target},
+            "compile_result": compile_result,
+            "artifact_sha256": artifact_sha256,
+        }
+        _atomic_write(
+            self._entry_path(style_id, version, target),
+            json.dumps(entry, sort_keys=True).encode("utf-8"),
+        )
+
+    def _evict(self) -> None:
+        with self._lock:
+            files: list[tuple[float, int, Path]] = []
+            for directory in (self._entries_dir, self._blobs_dir):
+                if not directory.is_dir():
+                    continue
+                for path in directory.iterdir():
+                    try:
+                        stat = path.stat()
+                    except OSError:
+                        continue
+                    files.append((stat.st_mtime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in files)
+            for _, size, path in sorted(files, key=lambda item: item[0]):
+                if total <= self._max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+
+
+def _touch(path: Path) -> bool:
+    try:
+        os.utime(path)
+    except OSError:
+        return False
+    return True
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def _atomic_copy(source: Path, destination: Path, *, sha256: str | None = None) -> None:
+    fd, tmp_name = tempfile.mkstemp(
+        dir=destination.parent, prefix=f".{destination.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as handle, source.open("rb") as src:
+            if sha256 is None:
+                shutil.copyfileobj(src, handle)
+            else:
+                digest = hashlib.sha256()
+                for chunk in iter(lambda: src.read(1024 * 1024), b""):
+                    digest.update(chunk)
+                    handle.write(chunk)
+                if digest.hexdigest() != sha256:
+                    raise ValueError(f"Cached artifact {source.name} failed sha256 verification")
+        os.replace(tmp_name, destination)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
+import asyncio
+from pathlib import Path
+import re
 from typing import Any
 
+from runner.cache import ArtifactCache, CachedCompile
 from runner.captureone.host import (
     HostIntegrationError,
     build_import_output_path,
@@ -11,76 +15,326 @@ from runner.captureone.host import (
     import_costyle_in_captureone,
 )
 from runner.config import RunnerSettings
-from runner.http import RunnerHttpClient
+from runner.http import AsyncRunnerHttpClient, RunnerHttpClient
+from runner.metrics import time_phase
+from runner.tracing import start_span
 from runner.types import CompileCaptureOnePayload
 
+_TARGET = "captureone"
+_SHA256_PATTERN = re.compile(r"[0-9a-fA-F]{64}")
+
 
 def run_compile_captureone(
     client: RunnerHttpClient,
     payload: CompileCaptureOnePayload,
     settings: RunnerSettings | None = None,
+    cache: ArtifactCache | None = None,
 ) -> dict[str, Any]:
-    compile_result = client.request_json(
-        "POST",
-        f"/styles/{payload.style_id}/versions/{payload.version}/compile",
-        params={"target": "captureone"},
+    cached = _cache_lookup(cache, payload)
+    if cached is not None:
+        compile_result = cached.compile_result
+    else:
+        compile_result = _compile(client, payload)
+
+    if settings is None or not _host_import_enabled(payload, settings):
+        if cached is None:
+            _cache_store_result(cache, payload, compile_result)
+        return compile_result
+
+    host_context = _host_context(settings)
+    artifact_id, _ = _artifact_reference(compile_result)
+
+    app_path = str(ensure_captureone_app_exists(settings.captureone_app_path))
+    host_context["captureone_app_path"] = app_path
+    output_path = _restore_cached_artifact(cache, cached, settings, artifact_id)
+    if output_path is None:
+        try:
+            output_path = _download_artifact(client, settings, compile_result, host_context)
+        except HostIntegrationError as exc:
+            if cached is None or exc.code != "DOWNLOAD_FAILED":
+                raise
+            # The cached download URL may have expired with the backend
+            # artifact; drop the entry and compile again.
+            _cache_invalidate(cache, payload)
+            compile_result = _compile(client, payload)
+            output_path = _download_artifact(client, settings, compile_result, host_context)
+
+        _cache_store_artifact(cache, payload, compile_result, output_path)
+
+    launch_method = _import_artifact(settings, app_path, output_path)
+    return _host_result(compile_result, launch_method, app_path, output_path)
+
+
+async def run_compile_captureone_async(
+    client: AsyncRunnerHttpClient,
+    payload: CompileCaptureOnePayload,
+    settings: RunnerSettings | None = None,
+    cache: ArtifactCache | None = None,
+) -> dict[str, Any]:
+    """Asyncio counterpart of :func:`run_compile_captureone`.
+
+    Network calls and the streamed artifact download run on the event loop;
+    cache access and the Capture One launch are blocking and are pushed to the
+    default thread pool.
+    """
+    cached = await asyncio.to_thread(_cache_lookup, cache, payload)
+    if cached is not None:
+        compile_result = cached.compile_result
+    else:
+        compile_result = await _compile_async(client, payload)
+
+    if settings is None or not _host_import_enabled(payload, settings):
+        if cached is None:
+            await asyncio.to_thread(_cache_store_result, cache, payload, compile_result)
+        return compile_result
+
+    host_context = _host_context(settings)
+    artifact_id, _ = _artifact_reference(compile_result)
+
+    app_path = str(ensure_captureone_app_exists(settings.captureone_app_path))
+    host_context["captureone_app_path"] = app_path
+    output_path = await asyncio.to_thread(
+        _restore_cached_artifact, cache, cached, settings, artifact_id
     )
+    if output_path is None:
+        try:
+            output_path = await _download_artifact_async(
+                client, settings, compile_result, host_context
+            )
+        except HostIntegrationError as exc:
+            if cached is None or exc.code != "DOWNLOAD_FAILED":
+                raise
+            await asyncio.to_thread(_cache_invalidate, cache, payload)
+            compile_result = await _compile_async(client, payload)
+            output_path = await _download_artifact_async(
+                client, settings, compile_result, host_context
+            )
+
+        await asyncio.to_thread(
+            _cache_store_artifact, cache, payload, compile_result, output_path
+        )
+
+    launch_method = await asyncio.to_thread(_import_artifact, settings, app_path, output_path)
+    return _host_result(compile_result, launch_method, app_path, output_path)
+
+
+def _compile(client: RunnerHttpClient, payload: CompileCaptureOnePayload) -> dict[str, Any]:
+    with time_phase("compile"):
+        compile_result = client.request_json(
+            "POST",
+            _compile_path(payload),
+            params={"target": _TARGET},
+            endpoint="compile",
+        )
     if not isinstance(compile_result, dict):
         raise ValueError("Invalid compile response payload")
+    return compile_result
+
+
+async def _compile_async(
+    client: AsyncRunnerHttpClient, payload: CompileCaptureOnePayload
+) -> dict[str, Any]:
+    with time_phase("compile"):
+        compile_result = await client.request_json(
+            "POST",
+            _compile_path(payload),
+            params={"target": _TARGET},
+            endpoint="compile",
+        )
+    if not isinstance(compile_result, dict):
+        raise ValueError("Invalid compile response payload")
+    return compile_result
+
+
+def _download_artifact(
+    client: RunnerHttpClient,
+    settings: RunnerSettings,
+    compile_result: dict[str, Any],
+    host_context: dict[str, Any],
+) -> Path:
+    artifact_id, download_url = _artifact_reference(compile_result)
+    output_path = build_import_output_path(settings.captureone_import_dir, artifact_id)
+    try:
+        with time_phase("download"):
+            client.download_to_file(
+                download_url,
+                output_path,
+                sha256=_artifact_sha256(compile_result),
+                revalidate=True,
+                endpoint="artifact-download",
+            )
+    except OSError as exc:
+        raise _write_failed(host_context, artifact_id, exc) from exc
+    except Exception as exc:
+        raise _download_failed(host_context, download_url, exc) from exc
+    return output_path
+
+
+async def _download_artifact_async(
+    client: AsyncRunnerHttpClient,
+    settings: RunnerSettings,
+    compile_result: dict[str, Any],
+    host_context: dict[str, Any],
+) -> Path:
+    artifact_id, download_url = _artifact_reference(compile_result)
+    output_path = await asyncio.to_thread(
+        build_import_output_path, settings.captureone_import_dir, artifact_id
+    )
+    try:
+        with time_phase("download"):
+            await client.download_to_file(
+                download_url,
+                output_path,
+                sha256=_artifact_sha256(compile_result),
+                revalidate=True,
+                endpoint="artifact-download",
+            )
+    except OSError as exc:
+        raise _write_failed(host_context, artifact_id, exc) from exc
+    except Exception as exc:
+        raise _download_failed(host_context, download_url, exc) from exc
+    return output_path
+
 
+def _cache_lookup(
+    cache: ArtifactCache | None, payload: CompileCaptureOnePayload
+) -> CachedCompile | None:
+    if cache is None:
+        return None
+    return cache.get(payload.style_id, payload.version, _TARGET)
+
+
+def _cache_invalidate(cache: ArtifactCache | None, payload: CompileCaptureOnePayload) -> None:
+    if cache is None:
+        return
+    try:
+        cache.invalidate(payload.style_id, payload.version, _TARGET)
+    except OSError:
+        pass
+
+
+def _cache_store_result(
+    cache: ArtifactCache | None,
+    payload: CompileCaptureOnePayload,
+    compile_result: dict[str, Any],
+) -> None:
+    # The cache is an optimisation only; a full or read-only cache dir must not fail the job.
+    if cache is None:
+        return
+    try:
+        cache.put_result(payload.style_id, payload.version, _TARGET, compile_result)
+    except OSError:
+        pass
+
+
+def _cache_store_artifact(
+    cache: ArtifactCache | None,
+    payload: CompileCaptureOnePayload,
+    compile_result: dict[str, Any],
+    artifact_path: Path,
+) -> None:
+    if cache is None:
+        return
+    try:
+        cache.put_artifact(
+            payload.style_id, payload.version, _TARGET, compile_result, artifact_path
+        )
+    except OSError:
+        pass
+
+
+def _restore_cached_artifact(
+    cache: ArtifactCache | None,
+    cached: CachedCompile | None,
+    settings: RunnerSettings,
+    artifact_id: str,
+) -> Path | None:
+    """Copy a cached artifact into the import dir, or return None to download it instead.
+
+    A blob that fails its sha256 check is deleted by the cache and downloaded again.
+    """
+    if cache is None or cached is None or cached.artifact_path is None:
+        return None
+    try:
+        output_path = build_import_output_path(settings.captureone_import_dir, artifact_id)
+        with time_phase("cache_restore"), start_span("cache_restore"):
+            cache.materialize(cached, output_path)
+    except (HostIntegrationError, OSError, ValueError):
+        return None
+    return output_path
+
+
+def _compile_path(payload: CompileCaptureOnePayload) -> str:
+    return f"/styles/{payload.style_id}/versions/{payload.version}/compile"
+
+
+def _host_import_enabled(payload: CompileCaptureOnePayload, settings: RunnerSettings) -> bool:
     effective_mode = payload.execution_mode
-    if settings is not None and effective_mode == "api":
+    if effective_mode == "api":
         effective_mode = settings.execution_mode
+    return effective_mode == "host" and settings.captureone_auto_open
 
-    if settings is None or effective_mode != "host" or not settings.captureone_auto_open:
-        return compile_result
 
-    host_context: dict[str, Any] = {
+def _host_context(settings: RunnerSettings) -> dict[str, Any]:
+    return {
         "mode": "host",
         "captureone_app_path": settings.captureone_app_path,
         "import_dir": settings.captureone_import_dir,
     }
 
+
+def _artifact_reference(compile_result: dict[str, Any]) -> tuple[str, str]:
     artifact_id = compile_result.get("artifact_id")
     download_url = compile_result.get("download_url")
     if not isinstance(artifact_id, str) or not artifact_id:
         raise ValueError("Compile response missing artifact_id")
     if not isinstance(download_url, str) or not download_url:
         raise ValueError("Compile response missing download_url")
+    return artifact_id, download_url
 
-    try:
-        app_path = str(ensure_captureone_app_exists(settings.captureone_app_path))
-        host_context["captureone_app_path"] = app_path
-        artifact_bytes = client.request_bytes("GET", download_url)
-    except HostIntegrationError:
-        raise
-    except Exception as exc:
-        raise HostIntegrationError(
-            code="DOWNLOAD_FAILED",
-            message="Failed to download compiled artifact from backend",
-            details={**host_context, "download_url": download_url, "error": str(exc)},
-        ) from exc
 
-    try:
-        output_path = build_import_output_path(settings.captureone_import_dir, artifact_id)
-        output_path.write_bytes(artifact_bytes)
-    except HostIntegrationError:
-        raise
-    except Exception as exc:
-        raise HostIntegrationError(
-            code="IMPORT_DIR_NOT_WRITABLE",
-            message="Failed to write .costyle artifact to import directory",
-            details={**host_context, "artifact_id": artifact_id, "error": str(exc)},
-        ) from exc
-
-    launch_method = import_costyle_in_captureone(
-        app_path=app_path,
-        costyle_path=output_path,
-        timeout_seconds=settings.captureone_open_timeout_seconds,
-        launch_mode=settings.captureone_launch_mode,
-        cli_command=settings.captureone_cli_command,
+def _artifact_sha256(compile_result: dict[str, Any]) -> str | None:
+    """Return the artifact checksum to verify downloads against, if the backend sent one."""
+    sha256 = compile_result.get("sha256")
+    if isinstance(sha256, str) and _SHA256_PATTERN.fullmatch(sha256):
+        return sha256
+    return None
+
+
+def _download_failed(
+    host_context: dict[str, Any], download_url: str, exc: Exception
+) -> HostIntegrationError:
+    return HostIntegrationError(
+        code="DOWNLOAD_FAILED",
+        message="Failed to download compiled artifact from backend",
+        details={**host_context, "download_url": download_url, "error": str(exc)},
+    )
+
+
+def _write_failed(
+    host_context: dict[str, Any], artifact_id: str, exc: Exception
+) -> HostIntegrationError:
+    return HostIntegrationError(
+        code="IMPORT_DIR_NOT_WRITABLE",
+        message="Failed to write .costyle artifact to import directory",
+        details={**host_context, "artifact_id": artifact_id, "error": str(exc)},
     )
 
+
+def _import_artifact(settings: RunnerSettings, app_path: str, output_path: Path) -> str:
+    with time_phase("host_import"), start_span("host_import"):
+        return import_costyle_in_captureone(
+            app_path=app_path,
+            costyle_path=output_path,
+            timeout_seconds=settings.captureone_open_timeout_seconds,
+            launch_mode=settings.captureone_launch_mode,
+            cli_command=settings.captureone_cli_command,
+        )
+
+
+def _host_result(
+    compile_result: dict[str, Any], launch_method: str, app_path: str, output_path: Path
+) -> dict[str, Any]:
     return {
         **compile_result,
         "host_integration": {
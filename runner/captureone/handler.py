@@ -0,0 +1,29 @@
+"""``compile_captureone`` job handler."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from runner.captureone.compile import run_compile_captureone, run_compile_captureone_async
+from runner.handlers import JobHandler
+from runner.types import CompileCaptureOnePayload
+
+
+def parse_compile_captureone_payload(payload: dict[str, Any]) -> CompileCaptureOnePayload:
+    style_id = payload.get("style_id")
+    version = payload.get("version")
+    if not isinstance(style_id, str) or not isinstance(version, str):
+        raise ValueError("Invalid compile_captureone payload")
+    execution_mode = payload.get("execution_mode", "api")
+    if execution_mode not in {"api", "host"}:
+        raise ValueError("Invalid compile_captureone payload")
+    return CompileCaptureOnePayload(
+        style_id=style_id, version=version, execution_mode=execution_mode
+    )
+
+
+HANDLER = JobHandler(
+    parse_payload=parse_compile_captureone_payload,
+    execute=run_compile_captureone,
+    execute_async=run_compile_captureone_async,
+)
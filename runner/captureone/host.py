@@ -7,8 +7,10 @@ import shlex
 import subprocess
 from typing import Any, Literal
 
+from runner.types import JobExecutionError
 
-class HostIntegrationError(RuntimeError):
+
+class HostIntegrationError(JobExecutionError):
     def __init__(self, *, code: str, message: str, details: dict[str, Any] | None = None) -> None:
         super().__init__(message)
         self.code = code
@@ -23,6 +25,9 @@ class HostIntegrationError(RuntimeError):
             **({"error_details": self.details} if self.details else {}),
         }
 
+    def to_result(self) -> dict[str, Any]:
+        return {"host_integration": self.to_host_integration()}
+
     def __str__(self) -> str:
         return f"{self.code}: {self.message}"
 
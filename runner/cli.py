@@ -3,14 +3,36 @@
 from __future__ import annotations
 
 import argparse
-from collections.abc import Sequence
+import asyncio
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from functools import partial
+import json
+import os
+import signal
+import sys
+from typing import TYPE_CHECKING, Any
 
-from runner.api import RunnerBackendApi
+from runner.api import AsyncRunnerBackendApi, RunnerBackendApi
 from runner.config import RunnerSettings
 from runner.doctor import run_doctor
-from runner.http import RunnerHttpClient
-from runner.jobs import JobExecutor
-from runner.poller import RunnerPoller
+from runner.http import AsyncRunnerHttpClient, RunnerHttpClient
+from runner.jobs import AsyncJobExecutor, JobExecutor
+from runner.metrics import REGISTRY, MergedMetrics, MetricsRegistry, MetricsServer
+from runner.poller import AsyncRunnerPoller, JobSlots, RunnerPoller, ShutdownSummary
+from runner.scheduler import LaneScheduler
+
+if TYPE_CHECKING:
+    from runner.cache import ArtifactCache
+
+# runner.bench, runner.supervisor and runner.cache are imported by the commands
+# that use them, keeping every command's startup free of http.server,
+# multiprocessing and the cache's file handling; the trace file exporter is
+# likewise only set up when a trace file is configured.
+
+_STOP_SIGNALS = (signal.SIGTERM, signal.SIGINT)
+# Extra time a supervised child gets past its own shutdown deadline before it is killed.
+_KILL_MARGIN_SECONDS = 10.0
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -30,46 +52,327 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Run one polling iteration and exit",
     )
+    poll_parser.add_argument(
+        "--workers",
+        type=_positive_int,
+        default=None,
+        help="Number of jobs to keep in flight concurrently (default: RUNNER_POLL_WORKERS or 1)",
+    )
+    supervise_parser = subparsers.add_parser(
+        "supervise", help="Run several poller processes and restart the ones that crash"
+    )
+    supervise_parser.add_argument(
+        "--processes",
+        type=_positive_int,
+        default=os.cpu_count() or 1,
+        help="Poller processes to keep running (default: CPU count)",
+    )
+    supervise_parser.add_argument(
+        "--workers",
+        type=_positive_int,
+        default=None,
+        help="Jobs in flight per process (default: RUNNER_POLL_WORKERS or 1)",
+    )
+    supervise_parser.add_argument(
+        "--max-in-flight",
+        type=_positive_int,
+        default=None,
+        help="Cap on jobs held by all processes together (default: no shared cap)",
+    )
     run_parser = subparsers.add_parser("run", help="Run a specific job by ID")
     run_parser.add_argument("--job-id", required=True, help="Backend job identifier")
     subparsers.add_parser("doctor", help="Run host integration preflight checks")
+    bench_parser = subparsers.add_parser(
+        "bench", help="Measure poller throughput against an in-process fake backend"
+    )
+    bench_parser.add_argument("--jobs", type=_positive_int, default=200, help="Jobs per scenario")
+    bench_parser.add_argument(
+        "--workers", type=_positive_int, default=8, help="Jobs kept in flight (default: 8)"
+    )
+    bench_parser.add_argument(
+        "--prefetch-depth",
+        type=int,
+        default=0,
+        help="Claimed jobs kept ready beyond the running ones; 0 disables pipelining",
+    )
+    bench_parser.add_argument(
+        "--engine",
+        choices=["sync", "async", "all"],
+        default="all",
+        help="Poller engine to measure (default: all)",
+    )
+    bench_parser.add_argument(
+        "--execution-mode",
+        choices=["api", "host", "all"],
+        default="all",
+        help="Execution mode to measure; host mode downloads artifacts (default: all)",
+    )
+    bench_parser.add_argument(
+        "--latency-ms", type=float, default=0.0, help="Added latency per backend request"
+    )
+    bench_parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of compile and artifact requests answered with 503",
+    )
+    bench_parser.add_argument(
+        "--artifact-bytes", type=int, default=64 * 1024, help="Size of the served artifact"
+    )
+    bench_parser.add_argument(
+        "--timeout", type=float, default=300.0, help="Seconds to wait for each scenario"
+    )
 
     return parser
 
 
+def _positive_int(value: str) -> int:
+    parsed = int(value)
+    if parsed < 1:
+        raise argparse.ArgumentTypeError("must be >= 1")
+    return parsed
+
+
 def main(argv: Sequence[str] | None = None) -> None:
     parser = build_parser()
     args = parser.parse_args(argv)
 
-    if args.command == "poll":
+    if args.command in {"poll", "run"}:
         settings = RunnerSettings.from_env()
-        with RunnerHttpClient(settings) as client:
-            api = RunnerBackendApi(client)
-            executor = JobExecutor(client, settings=settings)
-            poller = RunnerPoller(
-                api,
-                executor,
-                poll_interval_seconds=settings.poll_interval_seconds,
-            )
-            if args.once:
-                poller.poll_once()
-            else:
-                poller.poll_forever()
-    elif args.command == "run":
+        metrics_server = _start_metrics_server(settings)
+        try:
+            summary = _run_poller(args, settings)
+        finally:
+            if metrics_server is not None:
+                metrics_server.close()
+        _exit_if_abandoned(summary)
+    elif args.command == "supervise":
         settings = RunnerSettings.from_env()
-        with RunnerHttpClient(settings) as client:
-            api = RunnerBackendApi(client)
-            executor = JobExecutor(client, settings=settings)
-            poller = RunnerPoller(
-                api,
-                executor,
-                poll_interval_seconds=settings.poll_interval_seconds,
-            )
-            poller.run_job_id(args.job_id)
+        exit_code = _run_supervisor(args, settings)
+        if exit_code:
+            raise SystemExit(exit_code)
     elif args.command == "doctor":
         settings = RunnerSettings.from_env()
         if not run_doctor(settings):
             raise SystemExit(1)
+    elif args.command == "bench":
+        _run_bench(args)
+
+
+def _run_poller(
+    args: argparse.Namespace, settings: RunnerSettings, *, slots: JobSlots | None = None
+) -> ShutdownSummary | None:
+    from runner.tracing import JsonLinesSpanExporter, configure_tracing
+
+    if settings.trace_file:
+        configure_tracing(JsonLinesSpanExporter(settings.trace_file))
+    try:
+        if settings.engine == "async":
+            return asyncio.run(_run_async(args, settings, slots=slots))
+        return _run_sync(args, settings, slots=slots)
+    finally:
+        configure_tracing(None)
+
+
+def _exit_if_abandoned(summary: ShutdownSummary | None) -> None:
+    if summary is not None and summary.abandoned:
+        # Abandoned jobs were released but may still occupy worker threads,
+        # which would otherwise hold the process open past the deadline.
+        sys.stdout.flush()
+        os._exit(1)
+
+
+def _run_supervisor(args: argparse.Namespace, settings: RunnerSettings) -> int:
+    from runner.supervisor import Supervisor
+
+    metrics = MergedMetrics(REGISTRY)
+    metrics_server = _start_metrics_server(settings, registry=metrics)
+    supervisor = Supervisor(
+        partial(_supervised_poll, settings, _workers(args, settings)),
+        processes=args.processes,
+        max_in_flight=args.max_in_flight,
+        kill_after_seconds=settings.shutdown_grace_seconds + _KILL_MARGIN_SECONDS,
+        metrics=metrics,
+    )
+    try:
+        with _stop_on_signals(supervisor.stop):
+            return supervisor.run()
+    finally:
+        if metrics_server is not None:
+            metrics_server.close()
+
+
+def _supervised_poll(
+    settings: RunnerSettings,
+    workers: int,
+    index: int,
+    slots: JobSlots | None,
+    metrics_queue: Any,
+) -> None:
+    """Entry point of one ``supervise`` child; it has its own HTTP client and pool."""
+    from runner.supervisor import push_metrics
+
+    args = argparse.Namespace(command="poll", once=False, workers=workers)
+    with push_metrics(metrics_queue, index):
+        summary = _run_poller(args, settings, slots=slots)
+    _exit_if_abandoned(summary)
+
+
+def _run_sync(
+    args: argparse.Namespace, settings: RunnerSettings, *, slots: JobSlots | None = None
+) -> ShutdownSummary | None:
+    workers = _workers(args, settings)
+    with RunnerHttpClient(settings) as client:
+        api = RunnerBackendApi(client, long_poll_seconds=settings.long_poll_seconds)
+        executor = JobExecutor(client, settings=settings, artifact_cache=_artifact_cache(settings))
+        poller = RunnerPoller(
+            api,
+            executor,
+            poll_interval_seconds=settings.poll_interval_seconds,
+            max_poll_interval_seconds=settings.poll_max_interval_seconds,
+            workers=workers,
+            heartbeat_interval_seconds=settings.heartbeat_interval_seconds,
+            completion_batch_size=settings.completion_batch_size,
+            completion_flush_interval_seconds=settings.completion_flush_interval_seconds,
+            prefetch_depth=settings.prefetch_depth,
+            scheduler=LaneScheduler.from_settings(settings),
+            lookahead=settings.scheduler_lookahead,
+            shutdown_grace_seconds=settings.shutdown_grace_seconds,
+            slots=slots,
+            codec=client.codec,
+        )
+        try:
+            if args.command == "run":
+                poller.run_job_id(args.job_id)
+            elif args.once and workers > 1:
+                poller.poll_batch()
+            elif args.once:
+                poller.poll_once()
+            else:
+                with _stop_on_signals(poller.stop):
+                    poller.poll_forever()
+        finally:
+            poller.close()
+    return poller.shutdown_summary
+
+
+async def _run_async(
+    args: argparse.Namespace, settings: RunnerSettings, *, slots: JobSlots | None = None
+) -> ShutdownSummary | None:
+    workers = _workers(args, settings)
+    async with AsyncRunnerHttpClient(settings) as client:
+        api = AsyncRunnerBackendApi(client, long_poll_seconds=settings.long_poll_seconds)
+        executor = AsyncJobExecutor(
+            client, settings=settings, artifact_cache=_artifact_cache(settings)
+        )
+        poller = AsyncRunnerPoller(
+            api,
+            executor,
+            poll_interval_seconds=settings.poll_interval_seconds,
+            max_poll_interval_seconds=settings.poll_max_interval_seconds,
+            workers=workers,
+            heartbeat_interval_seconds=settings.heartbeat_interval_seconds,
+            completion_batch_size=settings.completion_batch_size,
+            completion_flush_interval_seconds=settings.completion_flush_interval_seconds,
+            prefetch_depth=settings.prefetch_depth,
+            scheduler=LaneScheduler.from_settings(settings),
+            lookahead=settings.scheduler_lookahead,
+            shutdown_grace_seconds=settings.shutdown_grace_seconds,
+            slots=slots,
+            codec=client.codec,
+        )
+        try:
+            if args.command == "run":
+                await poller.run_job_id(args.job_id)
+            elif args.once:
+                await poller.poll_batch()
+            else:
+                with _stop_on_loop_signals(poller.stop):
+                    await poller.poll_forever()
+        finally:
+            await poller.aclose()
+    return poller.shutdown_summary
+
+
+@contextmanager
+def _stop_on_signals(stop: Callable[[str], None]) -> Iterator[None]:
+    """Turn the first SIGTERM or SIGINT into ``stop``; a second one acts as usual."""
+    previous = {sig: signal.getsignal(sig) for sig in _STOP_SIGNALS}
+
+    def restore() -> None:
+        for sig, handler in previous.items():
+            signal.signal(sig, handler)
+
+    def handle(signum: int, _frame: object) -> None:
+        restore()
+        stop(signal.Signals(signum).name)
+
+    for sig in _STOP_SIGNALS:
+        signal.signal(sig, handle)
+    try:
+        yield
+    finally:
+        restore()
+
+
+@contextmanager
+def _stop_on_loop_signals(stop: Callable[[str], None]) -> Iterator[None]:
+    """Event-loop counterpart of :func:`_stop_on_signals`."""
+    loop = asyncio.get_running_loop()
+
+    def handle(sig: signal.Signals) -> None:
+        for registered in _STOP_SIGNALS:
+            loop.remove_signal_handler(registered)
+        stop(sig.name)
+
+    for sig in _STOP_SIGNALS:
+        loop.add_signal_handler(sig, handle, sig)
+    try:
+        yield
+    finally:
+        for sig in _STOP_SIGNALS:
+            loop.remove_signal_handler(sig)
+
+
+def _run_bench(args: argparse.Namespace) -> None:
+    from runner.bench import BenchConfig, run_bench
+
+    config = BenchConfig(
+        jobs=args.jobs,
+        workers=args.workers,
+        prefetch_depth=args.prefetch_depth,
+        latency_seconds=args.latency_ms / 1000,
+        error_rate=args.error_rate,
+        artifact_bytes=args.artifact_bytes,
+        timeout_seconds=args.timeout,
+    )
+    engines = ("sync", "async") if args.engine == "all" else (args.engine,)
+    modes = ("api", "host") if args.execution_mode == "all" else (args.execution_mode,)
+    for report in run_bench(config, engines=engines, execution_modes=modes):
+        print(json.dumps(report, sort_keys=True))
+
+
+def _start_metrics_server(
+    settings: RunnerSettings, *, registry: MetricsRegistry | MergedMetrics = REGISTRY
+) -> MetricsServer | None:
+    if not settings.metrics_port:
+        return None
+    return MetricsServer(
+        host=settings.metrics_host, port=settings.metrics_port, registry=registry
+    ).start()
+
+
+def _artifact_cache(settings: RunnerSettings) -> ArtifactCache | None:
+    if not settings.artifact_cache_dir:
+        return None
+    from runner.cache import ArtifactCache
+
+    return ArtifactCache.from_settings(settings)
+
+
+def _workers(args: argparse.Namespace, settings: RunnerSettings) -> int:
+    workers = getattr(args, "workers", None)
+    return workers if workers is not None else settings.poll_workers
 
 
 if __name__ == "__main__":
@@ -0,0 +1,191 @@
+"""JSON codecs for API payloads and log lines, backed by orjson or msgspec when installed."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import importlib
+import importlib.util
+import json
+from typing import Any
+
+from runner.types import Job, job_from_dict, job_from_fields
+
+# Preferred backends for ``auto``, fastest first.
+_AUTO_ORDER = ("msgspec", "orjson")
+
+
+@dataclass(frozen=True)
+class JobListing:
+    """Jobs decoded from a pending-jobs or claim-next response."""
+
+    jobs: list[Job]
+    echoes_wait: bool = False
+
+
+class JsonCodec:
+    """Stdlib codec; faster backends override the same methods.
+
+    ``dumps`` returns compact UTF-8 bytes for request bodies and ``loads``
+    accepts ``bytes``. ``dumps_str`` renders log lines; the stdlib keeps the
+    runner's original ``json.dumps`` line format. Decoding errors are raised
+    as ``ValueError`` whatever the backend.
+    """
+
+    name = "stdlib"
+
+    def dumps(self, obj: Any, *, sort_keys: bool = False) -> bytes:
+        return json.dumps(
+            obj, sort_keys=sort_keys, separators=(",", ":"), ensure_ascii=False, allow_nan=False
+        ).encode("utf-8")
+
+    def dumps_str(self, obj: Any, *, sort_keys: bool = False) -> str:
+        return json.dumps(obj, sort_keys=sort_keys)
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+    def decode_job(self, data: bytes) -> Job:
+        payload = self.loads(data) if data else None
+        if not isinstance(payload, dict):
+            raise ValueError("Invalid job payload from backend")
+        return job_from_dict(payload)
+
+    def decode_job_listing(self, data: bytes) -> JobListing:
+        """Decode a bare job list or an ``{"items": [...]}`` envelope.
+
+        ``echoes_wait`` tells whether the envelope carried the long-poll
+        ``wait`` back, which is how a backend confirms it held the request.
+        """
+        payload = self.loads(data) if data else None
+        if isinstance(payload, list):
+            raw_items = payload
+        elif isinstance(payload, dict) and isinstance(payload.get("items"), list):
+            raw_items = payload["items"]
+        else:
+            raise ValueError("Invalid jobs payload from backend")
+        jobs = [job_from_dict(item) for item in raw_items if isinstance(item, dict)]
+        return JobListing(jobs, echoes_wait=isinstance(payload, dict) and "wait" in payload)
+
+
+class OrjsonCodec(JsonCodec):
+    name = "orjson"
+
+    def __init__(self) -> None:
+        self._orjson = importlib.import_module("orjson")
+
+    def dumps(self, obj: Any, *, sort_keys: bool = False) -> bytes:
+        return self._orjson.dumps(obj, option=self._orjson.OPT_SORT_KEYS if sort_keys else 0)
+
+    def dumps_str(self, obj: Any, *, sort_keys: bool = False) -> str:
+        return self.dumps(obj, sort_keys=sort_keys).decode("utf-8")
+
+    def loads(self, data: bytes) -> Any:
+        return self._orjson.loads(data)
+
+
+class MsgspecCodec(JsonCodec):
+    """msgspec codec that decodes job responses into typed records, skipping the dicts."""
+
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        msgspec = importlib.import_module("msgspec")
+        self._msgspec = msgspec
+        self._encoder = msgspec.json.Encoder()
+        self._sorted_encoder = msgspec.json.Encoder(order="sorted")
+        self._decoder = msgspec.json.Decoder()
+        wire_job, wire_listing = _msgspec_wire_types(msgspec)
+        self._job_decoder = msgspec.json.Decoder(wire_job)
+        self._listing_decoder = msgspec.json.Decoder(list[wire_job] | wire_listing)
+
+    def dumps(self, obj: Any, *, sort_keys: bool = False) -> bytes:
+        encoder = self._sorted_encoder if sort_keys else self._encoder
+        return encoder.encode(obj)
+
+    def dumps_str(self, obj: Any, *, sort_keys: bool = False) -> str:
+        return self.dumps(obj, sort_keys=sort_keys).decode("utf-8")
+
+    def loads(self, data: bytes) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except self._msgspec.DecodeError as exc:
+            raise ValueError(str(exc)) from exc
+
+    def decode_job(self, data: bytes) -> Job:
+        try:
+            wire = self._job_decoder.decode(data)
+        except self._msgspec.DecodeError as exc:
+            raise ValueError("Invalid job payload from backend") from exc
+        return _job_from_wire(wire)
+
+    def decode_job_listing(self, data: bytes) -> JobListing:
+        try:
+            decoded = self._listing_decoder.decode(data)
+        except self._msgspec.DecodeError:
+            # Items that are not objects fail the typed decode; the generic
+            # path skips them like the stdlib codec and rejects anything else.
+            return super().decode_job_listing(data)
+        if isinstance(decoded, list):
+            return JobListing([_job_from_wire(wire) for wire in decoded])
+        return JobListing(
+            [_job_from_wire(wire) for wire in decoded.items],
+            echoes_wait=decoded.wait is not self._msgspec.UNSET,
+        )
+
+
+def _msgspec_wire_types(msgspec: Any) -> tuple[type, type]:
+    # Fields stay loosely typed so job_from_fields reports the same errors as
+    # the dict path; unknown fields are ignored by msgspec.
+    class WireJob(msgspec.Struct):
+        job_id: Any = None
+        job_type: Any = None
+        payload: Any = None
+        status: Any = None
+        created_at: Any = None
+
+    class WireListing(msgspec.Struct):
+        items: list[WireJob]
+        wait: Any = msgspec.UNSET
+
+    return WireJob, WireListing
+
+
+def _job_from_wire(wire: Any) -> Job:
+    return job_from_fields(
+        job_id=wire.job_id,
+        job_type=wire.job_type,
+        payload=wire.payload,
+        status=wire.status,
+        created_at=wire.created_at,
+    )
+
+
+_BACKENDS: dict[str, type[JsonCodec]] = {
+    "stdlib": JsonCodec,
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+}
+
+
+def json_codec(name: str = "auto") -> JsonCodec:
+    """Return the codec for a ``RUNNER_JSON_CODEC`` value.
+
+    ``auto`` picks the fastest installed backend and falls back to the
+    stdlib; naming a backend that is not installed is an error.
+    """
+    if name == "auto":
+        for candidate in _AUTO_ORDER:
+            try:
+                return _BACKENDS[candidate]()
+            except ImportError:
+                continue
+        return JsonCodec()
+    backend = _BACKENDS.get(name)
+    if backend is None:
+        raise ValueError(f"Unknown JSON codec: {name}")
+    if name != "stdlib" and importlib.util.find_spec(name) is None:
+        raise ValueError(
+            f"RUNNER_JSON_CODEC={name} requires the '{name}' package: "
+            f"pip install 'styleagent-runner[{name}]'"
+        )
+    return backend()
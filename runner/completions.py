@@ -0,0 +1,215 @@
+"""Coalesce finished job results into bulk completion requests."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from contextlib import suppress
+import threading
+from typing import Protocol
+
+from runner.types import JobExecutionResult
+
+
+class _CompletionApi(Protocol):
+    def complete_jobs(self, results: list[JobExecutionResult]) -> list[JobExecutionResult]: ...
+
+    def complete_job(self, result: JobExecutionResult) -> None: ...
+
+
+class _AsyncCompletionApi(Protocol):
+    def complete_jobs(
+        self, results: list[JobExecutionResult]
+    ) -> Awaitable[list[JobExecutionResult]]: ...
+
+    def complete_job(self, result: JobExecutionResult) -> Awaitable[None]: ...
+
+
+class CompletionBuffer:
+    """Send job results in batches of up to ``max_batch_size``.
+
+    A batch goes out as soon as it is full, otherwise every
+    ``flush_interval_seconds`` from a daemon thread, and once more on
+    :meth:`close`. Results the backend does not acknowledge, or whole batches
+    whose bulk request failed, are completed one at a time.
+    """
+
+    def __init__(
+        self,
+        api: _CompletionApi,
+        *,
+        max_batch_size: int,
+        flush_interval_seconds: float,
+        on_error: Callable[[list[str], Exception], None] | None = None,
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be >= 1")
+        if flush_interval_seconds <= 0:
+            raise ValueError("flush_interval_seconds must be > 0")
+
+        self._api = api
+        self._max_batch_size = max_batch_size
+        self._flush_interval_seconds = flush_interval_seconds
+        self._on_error = on_error
+        self._pending: list[JobExecutionResult] = []
+        # Batches taken off the buffer whose requests have not returned yet.
+        self._sending: dict[int, list[JobExecutionResult]] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def submit(self, result: JobExecutionResult) -> None:
+        with self._lock:
+            self._pending.append(result)
+            batch = self._take_batch() if len(self._pending) >= self._max_batch_size else []
+            if self._thread is None and not self._stopped.is_set():
+                self._thread = threading.Thread(
+                    target=self._run, name="runner-completions", daemon=True
+                )
+                self._thread.start()
+        if batch:
+            self._send(batch)
+
+    def pending(self) -> list[str]:
+        """Ids of the results not completed yet, including batches being sent."""
+        with self._lock:
+            return _job_ids(self._sending, self._pending)
+
+    def flush(self) -> None:
+        """Send every buffered result now."""
+        while True:
+            with self._lock:
+                batch = self._take_batch()
+            if not batch:
+                return
+            self._send(batch)
+
+    def close(self) -> None:
+        self._stopped.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            # Wait out a batch the thread is sending; it exists nowhere else.
+            thread.join()
+        self.flush()
+
+    def _take_batch(self) -> list[JobExecutionResult]:
+        batch = self._pending[: self._max_batch_size]
+        del self._pending[: self._max_batch_size]
+        if batch:
+            self._sending[id(batch)] = batch
+        return batch
+
+    def _send(self, batch: list[JobExecutionResult]) -> None:
+        try:
+            try:
+                rejected = self._api.complete_jobs(batch)
+            except Exception:
+                # A failed bulk request may be transient; each result still
+                # gets its own completion attempt rather than being dropped.
+                rejected = batch
+            for result in rejected:
+                try:
+                    self._api.complete_job(result)
+                except Exception as exc:
+                    self._report([result.job_id], exc)
+        finally:
+            with self._lock:
+                del self._sending[id(batch)]
+
+    def _report(self, job_ids: list[str], exc: Exception) -> None:
+        if self._on_error is not None:
+            self._on_error(job_ids, exc)
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self._flush_interval_seconds):
+            self.flush()
+
+
+class AsyncCompletionBuffer:
+    """Asyncio counterpart of :class:`CompletionBuffer` flushing from one task."""
+
+    def __init__(
+        self,
+        api: _AsyncCompletionApi,
+        *,
+        max_batch_size: int,
+        flush_interval_seconds: float,
+        on_error: Callable[[list[str], Exception], None] | None = None,
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be >= 1")
+        if flush_interval_seconds <= 0:
+            raise ValueError("flush_interval_seconds must be > 0")
+
+        self._api = api
+        self._max_batch_size = max_batch_size
+        self._flush_interval_seconds = flush_interval_seconds
+        self._on_error = on_error
+        self._pending: list[JobExecutionResult] = []
+        self._sending: dict[int, list[JobExecutionResult]] = {}
+        self._task: asyncio.Task[None] | None = None
+        self._closed = False
+        self._wake = asyncio.Event()
+
+    async def submit(self, result: JobExecutionResult) -> None:
+        self._pending.append(result)
+        if self._task is None and not self._closed:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        if len(self._pending) >= self._max_batch_size:
+            await self._send(self._take_batch())
+
+    def pending(self) -> list[str]:
+        """Ids of the results not completed yet, including batches being sent."""
+        return _job_ids(self._sending, self._pending)
+
+    async def flush(self) -> None:
+        while self._pending:
+            await self._send(self._take_batch())
+
+    async def aclose(self) -> None:
+        self._closed = True
+        self._wake.set()
+        if self._task is not None:
+            # Let the task finish a send in progress instead of cancelling it
+            # mid-request; its batch is already off the buffer.
+            await self._task
+            self._task = None
+        await self.flush()
+
+    def _take_batch(self) -> list[JobExecutionResult]:
+        batch = self._pending[: self._max_batch_size]
+        del self._pending[: self._max_batch_size]
+        if batch:
+            self._sending[id(batch)] = batch
+        return batch
+
+    async def _send(self, batch: list[JobExecutionResult]) -> None:
+        try:
+            try:
+                rejected = await self._api.complete_jobs(batch)
+            except Exception:
+                rejected = batch
+            for result in rejected:
+                try:
+                    await self._api.complete_job(result)
+                except Exception as exc:
+                    self._report([result.job_id], exc)
+        finally:
+            del self._sending[id(batch)]
+
+    def _report(self, job_ids: list[str], exc: Exception) -> None:
+        if self._on_error is not None:
+            self._on_error(job_ids, exc)
+
+    async def _run(self) -> None:
+        while not self._closed:
+            with suppress(TimeoutError):
+                await asyncio.wait_for(self._wake.wait(), self._flush_interval_seconds)
+            await self.flush()
+
+
+def _job_ids(
+    sending: dict[int, list[JobExecutionResult]], pending: list[JobExecutionResult]
+) -> list[str]:
+    sent = [result.job_id for batch in sending.values() for result in batch]
+    return sent + [result.job_id for result in pending]
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from collections.abc import Mapping
 import os
 from typing import Literal
@@ -12,9 +12,33 @@ from typing import Literal
 class RunnerSettings:
     api_base_url: str = "http://localhost:8000"
     poll_interval_seconds: float = 5.0
+    poll_max_interval_seconds: float = 60.0
+    poll_workers: int = 1
+    long_poll_seconds: float = 0.0
+    heartbeat_interval_seconds: float = 30.0
+    completion_batch_size: int = 1
+    completion_flush_interval_seconds: float = 1.0
+    prefetch_depth: int = 0
+    shutdown_grace_seconds: float = 30.0
+    lane_limits: dict[str, int] = field(default_factory=dict)
+    scheduler_lookahead: int = 1
+    engine: Literal["sync", "async"] = "sync"
     api_key: str | None = None
     http_timeout_seconds: float = 10.0
     http_retries: int = 2
+    http_backoff_max_seconds: float = 10.0
+    http_retry_budget_ratio: float = 0.2
+    http_retry_budget_reserve: int = 10
+    http_breaker_failure_threshold: int = 5
+    http_breaker_reset_seconds: float = 30.0
+    http_validator_cache_entries: int = 256
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 50
+    http_keepalive_expiry_seconds: float = 5.0
+    http2: bool = False
+    http_compression: Literal["off", "gzip", "zstd"] = "off"
+    http_compression_min_bytes: int = 1024
+    json_codec: Literal["auto", "stdlib", "orjson", "msgspec"] = "auto"
     execution_mode: Literal["api", "host"] = "api"
     captureone_app_path: str = "/Applications/Capture One.app"
     captureone_import_dir: str = "~/.styleagent/captureone/imports"
@@ -22,15 +46,44 @@ class RunnerSettings:
     captureone_auto_open: bool = True
     captureone_launch_mode: Literal["auto", "open", "cli"] = "auto"
     captureone_cli_command: str = ""
+    artifact_cache_dir: str = ""
+    artifact_cache_max_bytes: int = 256 * 1024 * 1024
+    metrics_port: int = 0
+    metrics_host: str = "127.0.0.1"
+    trace_file: str = ""
 
     @classmethod
     def from_env(cls, environ: Mapping[str, str] | None = None) -> "RunnerSettings":
         env = os.environ if environ is None else environ
         api_base_url = env.get("RUNNER_API_BASE_URL", cls.api_base_url).rstrip("/")
         poll_interval_raw = env.get("RUNNER_POLL_INTERVAL")
+        poll_max_interval_raw = env.get("RUNNER_POLL_MAX_INTERVAL")
+        poll_workers_raw = env.get("RUNNER_POLL_WORKERS")
+        long_poll_raw = env.get("RUNNER_LONG_POLL_SECONDS")
+        heartbeat_interval_raw = env.get("RUNNER_HEARTBEAT_INTERVAL_SECONDS")
+        completion_batch_raw = env.get("RUNNER_COMPLETION_BATCH_SIZE")
+        completion_flush_raw = env.get("RUNNER_COMPLETION_FLUSH_INTERVAL_SECONDS")
+        prefetch_depth_raw = env.get("RUNNER_PREFETCH_DEPTH")
+        shutdown_grace_raw = env.get("RUNNER_SHUTDOWN_GRACE_SECONDS")
+        lane_limits_raw = env.get("RUNNER_LANE_LIMITS", "").strip()
+        lookahead_raw = env.get("RUNNER_SCHEDULER_LOOKAHEAD")
+        engine = env.get("RUNNER_ENGINE", cls.engine).strip().lower()
         api_key = env.get("RUNNER_API_KEY") or None
         timeout_raw = env.get("RUNNER_HTTP_TIMEOUT_SECONDS")
         retries_raw = env.get("RUNNER_HTTP_RETRIES")
+        backoff_max_raw = env.get("RUNNER_HTTP_BACKOFF_MAX_SECONDS")
+        retry_budget_ratio_raw = env.get("RUNNER_HTTP_RETRY_BUDGET_RATIO")
+        retry_budget_reserve_raw = env.get("RUNNER_HTTP_RETRY_BUDGET_RESERVE")
+        breaker_threshold_raw = env.get("RUNNER_HTTP_BREAKER_FAILURE_THRESHOLD")
+        breaker_reset_raw = env.get("RUNNER_HTTP_BREAKER_RESET_SECONDS")
+        validator_cache_raw = env.get("RUNNER_HTTP_VALIDATOR_CACHE_ENTRIES")
+        max_connections_raw = env.get("RUNNER_HTTP_MAX_CONNECTIONS")
+        max_keepalive_raw = env.get("RUNNER_HTTP_MAX_KEEPALIVE_CONNECTIONS")
+        keepalive_expiry_raw = env.get("RUNNER_HTTP_KEEPALIVE_EXPIRY_SECONDS")
+        http2_raw = env.get("RUNNER_HTTP2")
+        http_compression = env.get("RUNNER_HTTP_COMPRESSION", cls.http_compression).strip().lower()
+        compression_min_raw = env.get("RUNNER_HTTP_COMPRESSION_MIN_BYTES")
+        json_codec = env.get("RUNNER_JSON_CODEC", cls.json_codec).strip().lower()
         execution_mode = env.get("RUNNER_EXECUTION_MODE", cls.execution_mode).strip().lower()
         captureone_app_path = env.get("RUNNER_CAPTUREONE_APP_PATH", cls.captureone_app_path).strip()
         captureone_import_dir = env.get("RUNNER_CAPTUREONE_IMPORT_DIR", cls.captureone_import_dir).strip()
@@ -38,6 +91,11 @@ class RunnerSettings:
         auto_open_raw = env.get("RUNNER_CAPTUREONE_AUTO_OPEN")
         launch_mode = env.get("RUNNER_CAPTUREONE_LAUNCH_MODE", cls.captureone_launch_mode).strip().lower()
         cli_command = env.get("RUNNER_CAPTUREONE_CLI_COMMAND", cls.captureone_cli_command).strip()
+        artifact_cache_dir = env.get("RUNNER_ARTIFACT_CACHE_DIR", cls.artifact_cache_dir).strip()
+        artifact_cache_max_raw = env.get("RUNNER_ARTIFACT_CACHE_MAX_BYTES")
+        metrics_port_raw = env.get("RUNNER_METRICS_PORT")
+        metrics_host = env.get("RUNNER_METRICS_HOST", cls.metrics_host).strip()
+        trace_file = env.get("RUNNER_TRACE_FILE", cls.trace_file).strip()
 
         poll_interval_seconds = cls.poll_interval_seconds
         if poll_interval_raw is not None:
@@ -45,6 +103,70 @@ class RunnerSettings:
             if poll_interval_seconds <= 0:
                 raise ValueError("RUNNER_POLL_INTERVAL must be > 0")
 
+        poll_max_interval_seconds = max(cls.poll_max_interval_seconds, poll_interval_seconds)
+        if poll_max_interval_raw is not None:
+            poll_max_interval_seconds = float(poll_max_interval_raw)
+            if poll_max_interval_seconds < poll_interval_seconds:
+                raise ValueError("RUNNER_POLL_MAX_INTERVAL must be >= RUNNER_POLL_INTERVAL")
+
+        poll_workers = cls.poll_workers
+        if poll_workers_raw is not None:
+            poll_workers = int(poll_workers_raw)
+            if poll_workers < 1:
+                raise ValueError("RUNNER_POLL_WORKERS must be >= 1")
+
+        long_poll_seconds = cls.long_poll_seconds
+        if long_poll_raw is not None:
+            long_poll_seconds = float(long_poll_raw)
+            if long_poll_seconds < 0:
+                raise ValueError("RUNNER_LONG_POLL_SECONDS must be >= 0")
+
+        heartbeat_interval_seconds = cls.heartbeat_interval_seconds
+        if heartbeat_interval_raw is not None:
+            heartbeat_interval_seconds = float(heartbeat_interval_raw)
+            if heartbeat_interval_seconds < 0:
+                raise ValueError("RUNNER_HEARTBEAT_INTERVAL_SECONDS must be >= 0")
+
+        completion_batch_size = cls.completion_batch_size
+        if completion_batch_raw is not None:
+            completion_batch_size = int(completion_batch_raw)
+            if completion_batch_size < 1:
+                raise ValueError("RUNNER_COMPLETION_BATCH_SIZE must be >= 1")
+
+        completion_flush_interval_seconds = cls.completion_flush_interval_seconds
+        if completion_flush_raw is not None:
+            completion_flush_interval_seconds = float(completion_flush_raw)
+            if completion_flush_interval_seconds <= 0:
+                raise ValueError("RUNNER_COMPLETION_FLUSH_INTERVAL_SECONDS must be > 0")
+
+        prefetch_depth = cls.prefetch_depth
+        if prefetch_depth_raw is not None:
+            prefetch_depth = int(prefetch_depth_raw)
+            if prefetch_depth < 0:
+                raise ValueError("RUNNER_PREFETCH_DEPTH must be >= 0")
+
+        shutdown_grace_seconds = cls.shutdown_grace_seconds
+        if shutdown_grace_raw is not None:
+            shutdown_grace_seconds = float(shutdown_grace_raw)
+            if shutdown_grace_seconds < 0:
+                raise ValueError("RUNNER_SHUTDOWN_GRACE_SECONDS must be >= 0")
+
+        lane_limits: dict[str, int] = {}
+        for entry in filter(None, (part.strip() for part in lane_limits_raw.split(","))):
+            lane, _, limit_raw = entry.partition("=")
+            if not lane.strip() or not limit_raw.strip().isdigit() or int(limit_raw) < 1:
+                raise ValueError(
+                    "RUNNER_LANE_LIMITS must be comma-separated <job_type>:<mode>=<limit>, "
+                    "limits >= 1"
+                )
+            lane_limits[lane.strip()] = int(limit_raw)
+
+        scheduler_lookahead = cls.scheduler_lookahead
+        if lookahead_raw is not None:
+            scheduler_lookahead = int(lookahead_raw)
+            if scheduler_lookahead < 1:
+                raise ValueError("RUNNER_SCHEDULER_LOOKAHEAD must be >= 1")
+
         http_timeout_seconds = cls.http_timeout_seconds
         if timeout_raw is not None:
             http_timeout_seconds = float(timeout_raw)
@@ -57,6 +179,83 @@ class RunnerSettings:
             if http_retries < 0:
                 raise ValueError("RUNNER_HTTP_RETRIES must be >= 0")
 
+        http_backoff_max_seconds = cls.http_backoff_max_seconds
+        if backoff_max_raw is not None:
+            http_backoff_max_seconds = float(backoff_max_raw)
+            if http_backoff_max_seconds <= 0:
+                raise ValueError("RUNNER_HTTP_BACKOFF_MAX_SECONDS must be > 0")
+
+        http_retry_budget_ratio = cls.http_retry_budget_ratio
+        if retry_budget_ratio_raw is not None:
+            http_retry_budget_ratio = float(retry_budget_ratio_raw)
+            if http_retry_budget_ratio < 0:
+                raise ValueError("RUNNER_HTTP_RETRY_BUDGET_RATIO must be >= 0")
+
+        http_retry_budget_reserve = cls.http_retry_budget_reserve
+        if retry_budget_reserve_raw is not None:
+            http_retry_budget_reserve = int(retry_budget_reserve_raw)
+            if http_retry_budget_reserve < 0:
+                raise ValueError("RUNNER_HTTP_RETRY_BUDGET_RESERVE must be >= 0")
+
+        http_breaker_failure_threshold = cls.http_breaker_failure_threshold
+        if breaker_threshold_raw is not None:
+            http_breaker_failure_threshold = int(breaker_threshold_raw)
+            if http_breaker_failure_threshold < 0:
+                raise ValueError("RUNNER_HTTP_BREAKER_FAILURE_THRESHOLD must be >= 0")
+
+        http_breaker_reset_seconds = cls.http_breaker_reset_seconds
+        if breaker_reset_raw is not None:
+            http_breaker_reset_seconds = float(breaker_reset_raw)
+            if http_breaker_reset_seconds <= 0:
+                raise ValueError("RUNNER_HTTP_BREAKER_RESET_SECONDS must be > 0")
+
+        http_validator_cache_entries = cls.http_validator_cache_entries
+        if validator_cache_raw is not None:
+            http_validator_cache_entries = int(validator_cache_raw)
+            if http_validator_cache_entries < 0:
+                raise ValueError("RUNNER_HTTP_VALIDATOR_CACHE_ENTRIES must be >= 0")
+
+        http_max_connections = cls.http_max_connections
+        if max_connections_raw is not None:
+            http_max_connections = int(max_connections_raw)
+            if http_max_connections < 1:
+                raise ValueError("RUNNER_HTTP_MAX_CONNECTIONS must be >= 1")
+
+        http_max_keepalive_connections = min(
+            cls.http_max_keepalive_connections, http_max_connections
+        )
+        if max_keepalive_raw is not None:
+            http_max_keepalive_connections = int(max_keepalive_raw)
+            if not 0 <= http_max_keepalive_connections <= http_max_connections:
+                raise ValueError(
+                    "RUNNER_HTTP_MAX_KEEPALIVE_CONNECTIONS must be between 0 and "
+                    "RUNNER_HTTP_MAX_CONNECTIONS"
+                )
+
+        http_keepalive_expiry_seconds = cls.http_keepalive_expiry_seconds
+        if keepalive_expiry_raw is not None:
+            http_keepalive_expiry_seconds = float(keepalive_expiry_raw)
+            if http_keepalive_expiry_seconds < 0:
+                raise ValueError("RUNNER_HTTP_KEEPALIVE_EXPIRY_SECONDS must be >= 0")
+
+        http2 = cls.http2
+        if http2_raw is not None:
+            http2 = http2_raw.strip().lower() in {"1", "true", "yes", "on"}
+
+        if http_compression not in {"off", "gzip", "zstd"}:
+            raise ValueError("RUNNER_HTTP_COMPRESSION must be one of: off, gzip, zstd")
+
+        http_compression_min_bytes = cls.http_compression_min_bytes
+        if compression_min_raw is not None:
+            http_compression_min_bytes = int(compression_min_raw)
+            if http_compression_min_bytes < 0:
+                raise ValueError("RUNNER_HTTP_COMPRESSION_MIN_BYTES must be >= 0")
+
+        if json_codec not in {"auto", "stdlib", "orjson", "msgspec"}:
+            raise ValueError("RUNNER_JSON_CODEC must be one of: auto, stdlib, orjson, msgspec")
+
+        if engine not in {"sync", "async"}:
+            raise ValueError("RUNNER_ENGINE must be one of: sync, async")
         if execution_mode not in {"api", "host"}:
             raise ValueError("RUNNER_EXECUTION_MODE must be one of: api, host")
         if launch_mode not in {"auto", "open", "cli"}:
@@ -72,12 +271,48 @@ class RunnerSettings:
         if auto_open_raw is not None:
             captureone_auto_open = auto_open_raw.strip().lower() in {"1", "true", "yes", "on"}
 
+        artifact_cache_max_bytes = cls.artifact_cache_max_bytes
+        if artifact_cache_max_raw is not None:
+            artifact_cache_max_bytes = int(artifact_cache_max_raw)
+            if artifact_cache_max_bytes <= 0:
+                raise ValueError("RUNNER_ARTIFACT_CACHE_MAX_BYTES must be > 0")
+
+        metrics_port = cls.metrics_port
+        if metrics_port_raw is not None:
+            metrics_port = int(metrics_port_raw)
+            if not 0 <= metrics_port <= 65535:
+                raise ValueError("RUNNER_METRICS_PORT must be between 0 and 65535")
+
         return cls(
             api_base_url=api_base_url,
             poll_interval_seconds=poll_interval_seconds,
+            poll_max_interval_seconds=poll_max_interval_seconds,
+            poll_workers=poll_workers,
+            long_poll_seconds=long_poll_seconds,
+            heartbeat_interval_seconds=heartbeat_interval_seconds,
+            completion_batch_size=completion_batch_size,
+            completion_flush_interval_seconds=completion_flush_interval_seconds,
+            prefetch_depth=prefetch_depth,
+            shutdown_grace_seconds=shutdown_grace_seconds,
+            lane_limits=lane_limits,
+            scheduler_lookahead=scheduler_lookahead,
+            engine=engine,
             api_key=api_key,
             http_timeout_seconds=http_timeout_seconds,
             http_retries=http_retries,
+            http_backoff_max_seconds=http_backoff_max_seconds,
+            http_retry_budget_ratio=http_retry_budget_ratio,
+            http_retry_budget_reserve=http_retry_budget_reserve,
+            http_breaker_failure_threshold=http_breaker_failure_threshold,
+            http_breaker_reset_seconds=http_breaker_reset_seconds,
+            http_validator_cache_entries=http_validator_cache_entries,
+            http_max_connections=http_max_connections,
+            http_max_keepalive_connections=http_max_keepalive_connections,
+            http_keepalive_expiry_seconds=http_keepalive_expiry_seconds,
+            http2=http2,
+            http_compression=http_compression,
+            http_compression_min_bytes=http_compression_min_bytes,
+            json_codec=json_codec,
             execution_mode=execution_mode,
             captureone_app_path=captureone_app_path,
             captureone_import_dir=captureone_import_dir,
@@ -85,4 +320,9 @@ class RunnerSettings:
             captureone_auto_open=captureone_auto_open,
             captureone_launch_mode=launch_mode,
             captureone_cli_command=cli_command,
+            artifact_cache_dir=artifact_cache_dir,
+            artifact_cache_max_bytes=artifact_cache_max_bytes,
+            metrics_port=metrics_port,
+            metrics_host=metrics_host,
+            trace_file=trace_file,
         )
@@ -0,0 +1,119 @@
+"""Job handler registry: one payload parser and executor per job type, imported on first use.
+
+Built-in handlers are listed below. Other packages add job types through the
+``styleagent_runner.job_handlers`` entry point group, naming the job type and
+pointing at a :class:`JobHandler`::
+
+    [project.entry-points."styleagent_runner.job_handlers"]
+    export_lightroom = "my_package.handler:HANDLER"
+
+Nothing is imported until a job of that type is parsed, so the CLI starts
+without loading handlers and a poller loads only the ones it runs.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass
+import importlib
+from importlib.metadata import entry_points
+import threading
+from typing import Any
+
+ENTRY_POINT_GROUP = "styleagent_runner.job_handlers"
+
+_BUILTIN_HANDLERS = {
+    "compile_captureone": "runner.captureone.handler:HANDLER",
+}
+
+
+@dataclass(frozen=True)
+class JobHandler:
+    """How to run one job type.
+
+    ``parse_payload`` validates the raw payload dict and raises
+    ``ValueError`` when it is invalid. ``execute`` and ``execute_async`` are
+    called as ``(client, payload, *, settings, cache)`` with the parsed
+    payload and return the result dict sent to the backend.
+    """
+
+    parse_payload: Callable[[dict[str, Any]], Any]
+    execute: Callable[..., dict[str, Any]]
+    execute_async: Callable[..., Awaitable[dict[str, Any]]]
+
+
+class HandlerRegistry:
+    """Resolve job types to handlers, importing each one the first time it is needed."""
+
+    def __init__(
+        self,
+        builtins: Mapping[str, str] = _BUILTIN_HANDLERS,
+        *,
+        group: str | None = ENTRY_POINT_GROUP,
+    ) -> None:
+        self._targets: dict[str, str] = dict(builtins)
+        self._group = group
+        self._discovered = group is None
+        self._handlers: dict[str, JobHandler] = {}
+        self._lock = threading.Lock()
+
+    def register(self, job_type: str, handler: JobHandler | str) -> None:
+        """Add a handler, or a ``"module:attribute"`` reference to import on first use."""
+        with self._lock:
+            self._handlers.pop(job_type, None)
+            if isinstance(handler, JobHandler):
+                self._handlers[job_type] = handler
+            else:
+                self._targets[job_type] = handler
+
+    def get(self, job_type: str) -> JobHandler:
+        handler = self._handlers.get(job_type)
+        if handler is not None:
+            return handler
+        with self._lock:
+            handler = self._handlers.get(job_type)
+            if handler is None:
+                handler = self._handlers[job_type] = self._load(job_type)
+            return handler
+
+    def job_types(self) -> list[str]:
+        """Every job type with a handler, whether or not it is loaded yet."""
+        with self._lock:
+            self._discover()
+            return sorted({*self._targets, *self._handlers})
+
+    def loaded(self) -> list[str]:
+        return sorted(self._handlers)
+
+    def _load(self, job_type: str) -> JobHandler:
+        target = self._targets.get(job_type)
+        if target is None:
+            self._discover()
+            target = self._targets.get(job_type)
+        if target is None:
+            raise ValueError(f"Unsupported job type: {job_type}")
+
+        module_name, _, attribute = target.partition(":")
+        handler = importlib.import_module(module_name)
+        for name in filter(None, attribute.split(".")):
+            handler = getattr(handler, name)
+        if not isinstance(handler, JobHandler):
+            raise TypeError(f"Handler for job type {job_type} is not a JobHandler: {target}")
+        return handler
+
+    def _discover(self) -> None:
+        # Reading entry point metadata scans installed distributions, so it
+        # is deferred until a job type is not built in.
+        if self._discovered:
+            return
+        self._discovered = True
+        for entry_point in entry_points(group=self._group):
+            self._targets.setdefault(entry_point.name, entry_point.value)
+
+
+HANDLERS = HandlerRegistry()
+
+
+def handler_for(job_type: str) -> JobHandler:
+    """Return the handler for ``job_type``; unknown types raise ``ValueError``."""
+    return HANDLERS.get(job_type)
@@ -0,0 +1,139 @@
+"""Background lease renewal for in-flight jobs."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import threading
+from typing import Protocol
+
+
+class _HeartbeatApi(Protocol):
+    def heartbeat_jobs(self, job_ids: list[str], status: str) -> None: ...
+
+
+class _AsyncHeartbeatApi(Protocol):
+    def heartbeat_jobs(self, job_ids: list[str], status: str) -> Awaitable[None]: ...
+
+
+class HeartbeatScheduler:
+    """Renew the lease of every tracked job from one daemon thread.
+
+    All jobs tracked at a tick are renewed with a single ``heartbeat_jobs``
+    call. The thread starts with the first tracked job and stops on
+    :meth:`close`.
+    """
+
+    def __init__(
+        self,
+        api: _HeartbeatApi,
+        *,
+        interval_seconds: float,
+        on_error: Callable[[list[str], Exception], None] | None = None,
+    ) -> None:
+        if interval_seconds <= 0:
+            raise ValueError("interval_seconds must be > 0")
+
+        self._api = api
+        self._interval_seconds = interval_seconds
+        self._on_error = on_error
+        self._job_ids: dict[str, None] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def track(self, job_id: str) -> None:
+        with self._lock:
+            self._job_ids[job_id] = None
+            if self._thread is None and not self._stopped.is_set():
+                self._thread = threading.Thread(
+                    target=self._run, name="runner-heartbeat", daemon=True
+                )
+                self._thread.start()
+
+    def untrack(self, job_id: str) -> None:
+        with self._lock:
+            self._job_ids.pop(job_id, None)
+
+    def tracked(self) -> list[str]:
+        with self._lock:
+            return list(self._job_ids)
+
+    def beat(self) -> None:
+        """Send one heartbeat round for the currently tracked jobs."""
+        job_ids = self.tracked()
+        if not job_ids:
+            return
+        try:
+            self._api.heartbeat_jobs(job_ids, status="running")
+        except Exception as exc:
+            if self._on_error is not None:
+                self._on_error(job_ids, exc)
+
+    def close(self) -> None:
+        self._stopped.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=self._interval_seconds)
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self._interval_seconds):
+            self.beat()
+
+
+class AsyncHeartbeatScheduler:
+    """Asyncio counterpart of :class:`HeartbeatScheduler` running as one task."""
+
+    def __init__(
+        self,
+        api: _AsyncHeartbeatApi,
+        *,
+        interval_seconds: float,
+        on_error: Callable[[list[str], Exception], None] | None = None,
+    ) -> None:
+        if interval_seconds <= 0:
+            raise ValueError("interval_seconds must be > 0")
+
+        self._api = api
+        self._interval_seconds = interval_seconds
+        self._on_error = on_error
+        self._job_ids: dict[str, None] = {}
+        self._task: asyncio.Task[None] | None = None
+        self._closed = False
+
+    def track(self, job_id: str) -> None:
+        self._job_ids[job_id] = None
+        if self._task is None and not self._closed:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def untrack(self, job_id: str) -> None:
+        self._job_ids.pop(job_id, None)
+
+    def tracked(self) -> list[str]:
+        return list(self._job_ids)
+
+    async def beat(self) -> None:
+        job_ids = self.tracked()
+        if not job_ids:
+            return
+        try:
+            await self._api.heartbeat_jobs(job_ids, status="running")
+        except Exception as exc:
+            if self._on_error is not None:
+                self._on_error(job_ids, exc)
+
+    async def aclose(self) -> None:
+        self._closed = True
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval_seconds)
+            await self.beat()
@@ -2,18 +2,52 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
+import asyncio
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from contextlib import AbstractContextManager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import gzip
+import hashlib
+import importlib
+import importlib.util
+import os
+from pathlib import Path
+import tempfile
+import threading
 import time
-from typing import Any
+from typing import Any, BinaryIO
 
 import httpx
 
+from runner.codec import JsonCodec, json_codec
 from runner.config import RunnerSettings
+from runner.metrics import HTTP_BODY_BYTES, time_phase, time_request
+from runner.resilience import RetryAttempts, RetryPolicy
+from runner.tracing import Span, inject_traceparent, start_span
+
+_DOWNLOAD_CHUNK_BYTES = 64 * 1024
+# Response headers replayed with a cached body when the backend answers 304.
+_REPLAYED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
 
 
 class RunnerHttpError(RuntimeError):
     """Raised when backend communication fails."""
 
+    def __init__(self, message: str, *, status_code: int | None = None) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class DownloadIntegrityError(RunnerHttpError):
+    """Raised when a downloaded body fails checksum verification or cannot be resumed."""
+
+
+class CircuitOpenError(RunnerHttpError):
+    """Raised without sending a request while an endpoint's circuit breaker is open."""
+
 
 class RunnerHttpClient:
     def __init__(
@@ -21,19 +55,15 @@ class RunnerHttpClient:
         settings: RunnerSettings,
         transport: httpx.BaseTransport | None = None,
         sleep: Callable[[float], None] = time.sleep,
+        retry_policy: RetryPolicy | None = None,
     ) -> None:
-        headers = {"User-Agent": "styleagent-runner/0.1.0"}
-        if settings.api_key:
-            headers["Authorization"] = f"Bearer {settings.api_key}"
-
-        self._retries = settings.http_retries
+        self._retry_policy = retry_policy or RetryPolicy.from_settings(settings)
         self._sleep = sleep
-        self._client = httpx.Client(
-            base_url=settings.api_base_url,
-            timeout=settings.http_timeout_seconds,
-            headers=headers,
-            transport=transport,
-        )
+        self.timeout_seconds = settings.http_timeout_seconds
+        self._validators = _ValidatorCache(settings.http_validator_cache_entries)
+        self._compressor = _body_compressor(settings)
+        self.codec = json_codec(settings.json_codec)
+        self._client = httpx.Client(transport=transport, **_client_options(settings))
 
     def close(self) -> None:
         self._client.close()
@@ -52,11 +82,34 @@ class RunnerHttpClient:
         json: dict[str, Any] | None = None,
         params: dict[str, Any] | None = None,
         headers: dict[str, str] | None = None,
+        timeout: float | None = None,
+        revalidate: bool = False,
+        compress: bool = False,
+        endpoint: str | None = None,
     ) -> Any:
-        response = self._request_response(method, path, json=json, params=params, headers=headers)
-        if not response.content:
-            return {}
-        return response.json()
+        """Send a request and decode its JSON body.
+
+        With ``revalidate`` a GET carries the validators of the last response
+        for the same URL and a ``304`` is answered from the locally kept body.
+        With ``compress`` a JSON body above the configured size is sent with
+        ``Content-Encoding`` when request compression is enabled. ``endpoint``
+        names the circuit breaker the request counts against and defaults to
+        the method and path; it also labels the request's latency metric.
+        """
+        with time_request(endpoint or method), _client_span(method, path, endpoint) as span:
+            response = self._request_response(
+                method,
+                path,
+                json=json,
+                params=params,
+                headers=inject_traceparent(headers),
+                timeout=timeout,
+                revalidate=revalidate,
+                compress=compress,
+                endpoint=endpoint,
+            )
+            _set_status_code(span, response)
+        return _decode_json(response, self.codec)
 
     def request_bytes(
         self,
@@ -66,10 +119,106 @@ class RunnerHttpClient:
         json: dict[str, Any] | None = None,
         params: dict[str, Any] | None = None,
         headers: dict[str, str] | None = None,
+        timeout: float | None = None,
+        revalidate: bool = False,
+        endpoint: str | None = None,
     ) -> bytes:
-        response = self._request_response(method, path, json=json, params=params, headers=headers)
+        with time_request(endpoint or method), _client_span(method, path, endpoint) as span:
+            response = self._request_response(
+                method,
+                path,
+                json=json,
+                params=params,
+                headers=inject_traceparent(headers),
+                timeout=timeout,
+                revalidate=revalidate,
+                endpoint=endpoint,
+            )
+            _set_status_code(span, response)
         return response.content
 
+    def download_to_file(
+        self,
+        path: str,
+        destination: Path,
+        *,
+        headers: dict[str, str] | None = None,
+        chunk_size: int = _DOWNLOAD_CHUNK_BYTES,
+        sha256: str | None = None,
+        revalidate: bool = False,
+        endpoint: str | None = None,
+    ) -> int:
+        """Stream a GET response into ``destination`` and return the number of bytes written.
+
+        Chunks are written to a temp file next to ``destination`` as they
+        arrive; the file is fsynced and atomically renamed into place once the
+        transfer completes, so a partial artifact is never visible. A retry
+        after an interrupted transfer resumes with a ``Range`` request, and
+        when ``sha256`` is given the body is verified before the rename. With
+        ``revalidate`` a ``304`` reuses the file a previous download of the
+        same URL left behind, provided it is still intact.
+        """
+        key = _validator_key(self._client, path) if revalidate else None
+        reusable = _reusable_download(self._validators, key)
+        handle, tmp_path = _open_download(destination)
+        try:
+            with handle:
+                download = _ResumableDownload(handle, sha256, reusable=reusable)
+                with time_request(endpoint or "GET"), _client_span("GET", path, endpoint):
+                    written = self._stream_to(
+                        path,
+                        download,
+                        headers=inject_traceparent(headers),
+                        chunk_size=chunk_size,
+                        endpoint=endpoint,
+                    )
+                with time_phase("write"):
+                    _sync_download(handle)
+            os.replace(tmp_path, destination)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        self._validators.remember_download(key, download, destination)
+        return written
+
+    def _stream_to(
+        self,
+        path: str,
+        download: "_ResumableDownload",
+        *,
+        headers: dict[str, str] | None,
+        chunk_size: int,
+        endpoint: str | None,
+    ) -> int:
+        last_error: Exception | None = None
+        with _begin_attempts(self._retry_policy, endpoint or f"GET {path}") as attempts:
+            while True:
+                retry_after: float | None = None
+                try:
+                    with self._client.stream(
+                        "GET", path, headers=download.request_headers(headers)
+                    ) as response:
+                        if not _is_retryable(response):
+                            attempts.succeeded()
+                            download.begin(response, path)
+                            for chunk in response.iter_bytes(chunk_size):
+                                download.write(chunk)
+                            download.verify(path)
+                            return download.written
+                        last_error = _server_error(response, "GET", path)
+                        retry_after = _retry_after_seconds(response)
+                except (httpx.RequestError, DownloadIntegrityError) as exc:
+                    last_error = exc
+
+                delay = attempts.failed(retry_after=retry_after)
+                if delay is None:
+                    break
+                self._sleep(delay)
+
+        if isinstance(last_error, DownloadIntegrityError):
+            raise last_error
+        raise _retries_exhausted(last_error) from last_error
+
     def _request_response(
         self,
         method: str,
@@ -78,37 +227,695 @@ class RunnerHttpClient:
         json: dict[str, Any] | None = None,
         params: dict[str, Any] | None = None,
         headers: dict[str, str] | None = None,
+        timeout: float | None = None,
+        revalidate: bool = False,
+        compress: bool = False,
+        endpoint: str | None = None,
     ) -> httpx.Response:
         last_error: Exception | None = None
+        request_timeout = httpx.USE_CLIENT_DEFAULT if timeout is None else timeout
+        key = None
+        if revalidate and method == "GET":
+            key = _validator_key(self._client, path, params)
+        cached = self._validators.get(key)
+        body = _encode_body(json, self._compressor if compress else None, self.codec)
+        request_headers = headers
+        if cached is not None:
+            request_headers = {**(request_headers or {}), **cached.conditional_headers()}
+        if body.headers:
+            request_headers = {**(request_headers or {}), **body.headers}
+
+        with _begin_attempts(self._retry_policy, endpoint or f"{method} {path}") as attempts:
+            while True:
+                retry_after: float | None = None
+                try:
+                    response = self._client.request(
+                        method,
+                        path,
+                        content=body.content,
+                        params=params,
+                        headers=request_headers,
+                        timeout=request_timeout,
+                    )
+                except httpx.RequestError as exc:
+                    last_error = exc
+                else:
+                    if not _is_retryable(response):
+                        attempts.succeeded()
+                        break
+                    last_error = _server_error(response, method, path)
+                    retry_after = _retry_after_seconds(response)
+
+                delay = attempts.failed(retry_after=retry_after)
+                if delay is None:
+                    raise _retries_exhausted(last_error) from last_error
+                self._sleep(delay)
+
+        if response.status_code == 415 and body.encoding is not None:
+            # The backend cannot decode compressed bodies; stop compressing for good.
+            self._compressor = None
+            return self._request_response(
+                method,
+                path,
+                json=json,
+                params=params,
+                headers=headers,
+                timeout=timeout,
+                endpoint=endpoint,
+            )
+        if response.status_code == 304 and cached is not None:
+            return cached.replay(response)
+        _raise_for_status(response)
+        self._validators.remember(key, response)
+        _record_transfer(body, response)
+        return response
+
+
+class AsyncRunnerHttpClient:
+    """Asyncio counterpart of :class:`RunnerHttpClient` built on ``httpx.AsyncClient``."""
+
+    def __init__(
+        self,
+        settings: RunnerSettings,
+        transport: httpx.AsyncBaseTransport | None = None,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        retry_policy: RetryPolicy | None = None,
+    ) -> None:
+        self._retry_policy = retry_policy or RetryPolicy.from_settings(settings)
+        self._sleep = sleep
+        self.timeout_seconds = settings.http_timeout_seconds
+        self._validators = _ValidatorCache(settings.http_validator_cache_entries)
+        self._compressor = _body_compressor(settings)
+        self.codec = json_codec(settings.json_codec)
+        self._client = httpx.AsyncClient(transport=transport, **_client_options(settings))
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
 
-        for attempt in range(self._retries + 1):
-            try:
-                response = self._client.request(method, path, json=json, params=params, headers=headers)
-            except httpx.RequestError as exc:
-                last_error = exc
-                if attempt == self._retries:
+    async def __aenter__(self) -> "AsyncRunnerHttpClient":
+        return self
+
+    async def __aexit__(self, *_: object) -> None:
+        await self.aclose()
+
+    async def request_json(
+        self,
+        method: str,
+        path: str,
+        *,
+        json: dict[str, Any] | None = None,
+        params: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+        timeout: float | None = None,
+        revalidate: bool = False,
+        compress: bool = False,
+        endpoint: str | None = None,
+    ) -> Any:
+        with time_request(endpoint or method), _client_span(method, path, endpoint) as span:
+            response = await self._request_response(
+                method,
+                path,
+                json=json,
+                params=params,
+                headers=inject_traceparent(headers),
+                timeout=timeout,
+                revalidate=revalidate,
+                compress=compress,
+                endpoint=endpoint,
+            )
+            _set_status_code(span, response)
+        return _decode_json(response, self.codec)
+
+    async def request_bytes(
+        self,
+        method: str,
+        path: str,
+        *,
+        json: dict[str, Any] | None = None,
+        params: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+        timeout: float | None = None,
+        revalidate: bool = False,
+        endpoint: str | None = None,
+    ) -> bytes:
+        with time_request(endpoint or method), _client_span(method, path, endpoint) as span:
+            response = await self._request_response(
+                method,
+                path,
+                json=json,
+                params=params,
+                headers=inject_traceparent(headers),
+                timeout=timeout,
+                revalidate=revalidate,
+                endpoint=endpoint,
+            )
+            _set_status_code(span, response)
+        return response.content
+
+    async def download_to_file(
+        self,
+        path: str,
+        destination: Path,
+        *,
+        headers: dict[str, str] | None = None,
+        chunk_size: int = _DOWNLOAD_CHUNK_BYTES,
+        sha256: str | None = None,
+        revalidate: bool = False,
+        endpoint: str | None = None,
+    ) -> int:
+        """Asyncio counterpart of :meth:`RunnerHttpClient.download_to_file`.
+
+        Chunk writes land in the page cache and stay on the event loop; only
+        opening, fsync, rename and the reuse check are pushed to the default
+        thread pool.
+        """
+        key = _validator_key(self._client, path) if revalidate else None
+        reusable = await asyncio.to_thread(_reusable_download, self._validators, key)
+        handle, tmp_path = await asyncio.to_thread(_open_download, destination)
+        try:
+            with handle:
+                download = _ResumableDownload(handle, sha256, reusable=reusable)
+                with time_request(endpoint or "GET"), _client_span("GET", path, endpoint):
+                    written = await self._stream_to(
+                        path,
+                        download,
+                        headers=inject_traceparent(headers),
+                        chunk_size=chunk_size,
+                        endpoint=endpoint,
+                    )
+                with time_phase("write"):
+                    await asyncio.to_thread(_sync_download, handle)
+            await asyncio.to_thread(os.replace, tmp_path, destination)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        self._validators.remember_download(key, download, destination)
+        return written
+
+    async def _stream_to(
+        self,
+        path: str,
+        download: "_ResumableDownload",
+        *,
+        headers: dict[str, str] | None,
+        chunk_size: int,
+        endpoint: str | None,
+    ) -> int:
+        last_error: Exception | None = None
+        with _begin_attempts(self._retry_policy, endpoint or f"GET {path}") as attempts:
+            while True:
+                retry_after: float | None = None
+                try:
+                    async with self._client.stream(
+                        "GET", path, headers=download.request_headers(headers)
+                    ) as response:
+                        if not _is_retryable(response):
+                            attempts.succeeded()
+                            download.begin(response, path)
+                            async for chunk in response.aiter_bytes(chunk_size):
+                                download.write(chunk)
+                            download.verify(path)
+                            return download.written
+                        last_error = _server_error(response, "GET", path)
+                        retry_after = _retry_after_seconds(response)
+                except (httpx.RequestError, DownloadIntegrityError) as exc:
+                    last_error = exc
+
+                delay = attempts.failed(retry_after=retry_after)
+                if delay is None:
                     break
-                self._sleep(_backoff_seconds(attempt))
-                continue
+                await self._sleep(delay)
+
+        if isinstance(last_error, DownloadIntegrityError):
+            raise last_error
+        raise _retries_exhausted(last_error) from last_error
+
+    async def _request_response(
+        self,
+        method: str,
+        path: str,
+        *,
+        json: dict[str, Any] | None = None,
+        params: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+        timeout: float | None = None,
+        revalidate: bool = False,
+        compress: bool = False,
+        endpoint: str | None = None,
+    ) -> httpx.Response:
+        last_error: Exception | None = None
+        request_timeout = httpx.USE_CLIENT_DEFAULT if timeout is None else timeout
+        key = None
+        if revalidate and method == "GET":
+            key = _validator_key(self._client, path, params)
+        cached = self._validators.get(key)
+        body = _encode_body(json, self._compressor if compress else None, self.codec)
+        request_headers = headers
+        if cached is not None:
+            request_headers = {**(request_headers or {}), **cached.conditional_headers()}
+        if body.headers:
+            request_headers = {**(request_headers or {}), **body.headers}
 
-            if response.status_code >= 500:
-                last_error = RunnerHttpError(
-                    f"Backend server error: {response.status_code} for {method.upper()} {path}"
+        with _begin_attempts(self._retry_policy, endpoint or f"{method} {path}") as attempts:
+            while True:
+                retry_after: float | None = None
+                try:
+                    response = await self._client.request(
+                        method,
+                        path,
+                        content=body.content,
+                        params=params,
+                        headers=request_headers,
+                        timeout=request_timeout,
+                    )
+                except httpx.RequestError as exc:
+                    last_error = exc
+                else:
+                    if not _is_retryable(response):
+                        attempts.succeeded()
+                        break
+                    last_error = _server_error(response, method, path)
+                    retry_after = _retry_after_seconds(response)
+
+                delay = attempts.failed(retry_after=retry_after)
+                if delay is None:
+                    raise _retries_exhausted(last_error) from last_error
+                await self._sleep(delay)
+
+        if response.status_code == 415 and body.encoding is not None:
+            # The backend cannot decode compressed bodies; stop compressing for good.
+            self._compressor = None
+            return await self._request_response(
+                method,
+                path,
+                json=json,
+                params=params,
+                headers=headers,
+                timeout=timeout,
+                endpoint=endpoint,
+            )
+        if response.status_code == 304 and cached is not None:
+            return cached.replay(response)
+        _raise_for_status(response)
+        self._validators.remember(key, response)
+        _record_transfer(body, response)
+        return response
+
+
+@dataclass(frozen=True)
+class _Validated:
+    """Validators of one GET response plus the local copy a ``304`` is served from."""
+
+    etag: str | None
+    last_modified: str | None
+    content: bytes = b""
+    headers: tuple[tuple[str, str], ...] = ()
+    file_path: Path | None = None
+    file_sha256: str | None = None
+
+    def conditional_headers(self) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def replay(self, not_modified: httpx.Response) -> httpx.Response:
+        return httpx.Response(
+            200,
+            headers=list(self.headers),
+            content=self.content,
+            request=not_modified.request,
+        )
+
+
+class _ValidatorCache:
+    """Bounded LRU of :class:`_Validated` entries keyed by absolute request URL."""
+
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, _Validated] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str | None) -> _Validated | None:
+        if key is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def remember(self, key: str | None, response: httpx.Response) -> None:
+        if key is None:
+            return
+        validated = _validated_from(response)
+        if validated is None:
+            self.discard(key)
+            return
+        headers = tuple(
+            (name, response.headers[name]) for name in _REPLAYED_HEADERS if name in response.headers
+        )
+        self._put(
+            key, _Validated(validated.etag, validated.last_modified, response.content, headers)
+        )
+
+    def remember_download(
+        self, key: str | None, download: "_ResumableDownload", destination: Path
+    ) -> None:
+        if key is None:
+            return
+        if download.validated is None:
+            self.discard(key)
+            return
+        self._put(
+            key,
+            _Validated(
+                download.validated.etag,
+                download.validated.last_modified,
+                file_path=destination,
+                file_sha256=download.sha256,
+            ),
+        )
+
+    def _put(self, key: str, entry: _Validated) -> None:
+        if self._max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+
+class _ResumableDownload:
+    """Track one download across attempts so a retry can resume where the last one stopped."""
+
+    def __init__(
+        self,
+        handle: BinaryIO,
+        expected_sha256: str | None,
+        *,
+        reusable: "_Validated | None" = None,
+    ) -> None:
+        self._handle = handle
+        self._expected_sha256 = expected_sha256.lower() if expected_sha256 else None
+        self._reusable_copy = reusable
+        self._digest = hashlib.sha256()
+        self._etag: str | None = None
+        self._resumable = False
+        self.written = 0
+        self.validated: _Validated | None = None
+
+    @property
+    def sha256(self) -> str:
+        return self._digest.hexdigest()
+
+    def request_headers(self, headers: dict[str, str] | None) -> dict[str, str] | None:
+        if not self.written and self._reusable_copy is not None:
+            return {**(headers or {}), **self._reusable_copy.conditional_headers()}
+        if not self.written or not self._resumable:
+            return headers
+        resume_headers = {**(headers or {}), "Range": f"bytes={self.written}-"}
+        if self._etag is not None:
+            # Ask for the full body instead if the artifact changed since the first attempt.
+            resume_headers["If-Range"] = self._etag
+        return resume_headers
+
+    def begin(self, response: httpx.Response, path: str) -> None:
+        if response.status_code == 206:
+            if _content_range_start(response) != self.written:
+                self._reset()
+                raise DownloadIntegrityError(
+                    f"Unexpected Content-Range for GET {path}", status_code=206
                 )
-                if attempt == self._retries:
-                    break
-                self._sleep(_backoff_seconds(attempt))
-                continue
+            return
+        if response.status_code == 416 and self.written:
+            self._reset()
+            raise DownloadIntegrityError(f"Cannot resume GET {path}", status_code=416)
+        reusable = self._reusable_copy
+        if response.status_code == 304 and reusable is not None and reusable.file_path:
+            self._reset()
+            self._restore(reusable.file_path)
+            self.validated = _validated_from(response, fallback=reusable)
+            return
+
+        _raise_for_status(response)
+        self._reset()
+        # Byte offsets only line up with the decoded body when it was sent uncompressed.
+        self._resumable = response.headers.get("Content-Encoding", "identity") == "identity"
+        etag = response.headers.get("ETag")
+        self._etag = etag if etag and not etag.startswith("W/") else None
+        self.validated = _validated_from(response)
+
+    def write(self, chunk: bytes) -> None:
+        self._handle.write(chunk)
+        self._digest.update(chunk)
+        self.written += len(chunk)
+
+    def verify(self, path: str) -> None:
+        if self._expected_sha256 is None:
+            return
+        actual = self._digest.hexdigest()
+        if actual != self._expected_sha256:
+            self._reset()
+            raise DownloadIntegrityError(
+                f"Checksum mismatch for GET {path}: expected sha256 "
+                f"{self._expected_sha256}, got {actual}"
+            )
+
+    def _restore(self, file_path: Path) -> None:
+        with file_path.open("rb") as source:
+            for chunk in iter(lambda: source.read(_DOWNLOAD_CHUNK_BYTES), b""):
+                self.write(chunk)
+        # The copy is complete; a failure after this point must not resume from it.
+        self._reusable_copy = None
+
+    def _reset(self) -> None:
+        self._handle.seek(0)
+        self._handle.truncate()
+        self._digest = hashlib.sha256()
+        self._etag = None
+        self._resumable = False
+        self.written = 0
+        self.validated = None
+
+
+def _validated_from(
+    response: httpx.Response, *, fallback: _Validated | None = None
+) -> _Validated | None:
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if fallback is not None:
+        etag = etag or fallback.etag
+        last_modified = last_modified or fallback.last_modified
+    if not etag and not last_modified:
+        return None
+    return _Validated(etag, last_modified)
+
+
+def _validator_key(
+    client: httpx.Client | httpx.AsyncClient,
+    path: str,
+    params: dict[str, Any] | None = None,
+) -> str:
+    return str(client.build_request("GET", path, params=params).url)
+
+
+def _reusable_download(cache: _ValidatorCache, key: str | None) -> _Validated | None:
+    """Return the cached download for ``key`` if its file is still on disk unmodified."""
+    entry = cache.get(key)
+    if entry is None or entry.file_path is None or key is None:
+        return None
+    try:
+        digest = hashlib.sha256()
+        with entry.file_path.open("rb") as handle:
+            for chunk in iter(lambda: handle.read(_DOWNLOAD_CHUNK_BYTES), b""):
+                digest.update(chunk)
+    except OSError:
+        cache.discard(key)
+        return None
+    if digest.hexdigest() != entry.file_sha256:
+        cache.discard(key)
+        return None
+    return entry
+
+
+def _content_range_start(response: httpx.Response) -> int | None:
+    # Content-Range: bytes <start>-<end>/<size>
+    unit, _, spec = response.headers.get("Content-Range", "").partition(" ")
+    start, _, _ = spec.partition("-")
+    if unit != "bytes" or not start.isdigit():
+        return None
+    return int(start)
+
+
+@dataclass(frozen=True)
+class _EncodedBody:
+    """A JSON request body, pre-encoded and compressed when worth it."""
+
+    content: bytes | None = None
+    raw_bytes: int = 0
+    headers: dict[str, str] | None = None
+    encoding: str | None = None
+
+
+class _BodyCompressor:
+    def __init__(self, encoding: str, min_bytes: int) -> None:
+        self.encoding = encoding
+        self._min_bytes = min_bytes
+        self._zstandard = importlib.import_module("zstandard") if encoding == "zstd" else None
+
+    def compress(self, data: bytes) -> bytes | None:
+        if len(data) < self._min_bytes:
+            return None
+        if self._zstandard is not None:
+            # Compressor objects are not thread-safe; they are cheap to create.
+            return self._zstandard.ZstdCompressor().compress(data)
+        return gzip.compress(data, compresslevel=6)
+
+
+def _body_compressor(settings: RunnerSettings) -> _BodyCompressor | None:
+    if settings.http_compression == "off":
+        return None
+    if settings.http_compression == "zstd" and importlib.util.find_spec("zstandard") is None:
+        raise RunnerHttpError(
+            "RUNNER_HTTP_COMPRESSION=zstd requires the 'zstandard' package: "
+            "pip install 'styleagent-runner[zstd]'"
+        )
+    return _BodyCompressor(settings.http_compression, settings.http_compression_min_bytes)
+
+
+def _encode_body(
+    json: dict[str, Any] | None, compressor: _BodyCompressor | None, codec: JsonCodec
+) -> _EncodedBody:
+    if json is None:
+        return _EncodedBody()
+    raw = codec.dumps(json)
+    compressed = compressor.compress(raw) if compressor is not None else None
+    if compressor is None or compressed is None:
+        return _EncodedBody(
+            content=raw, raw_bytes=len(raw), headers={"Content-Type": "application/json"}
+        )
+    return _EncodedBody(
+        content=compressed,
+        raw_bytes=len(raw),
+        headers={"Content-Type": "application/json", "Content-Encoding": compressor.encoding},
+        encoding=compressor.encoding,
+    )
+
+
+def _record_transfer(body: _EncodedBody, response: httpx.Response) -> None:
+    # Bytes saved by compression are the raw/sent and decoded/received differences.
+    if body.encoding is not None:
+        HTTP_BODY_BYTES.inc(body.raw_bytes, direction="request", stage="raw")
+        HTTP_BODY_BYTES.inc(len(body.content), direction="request", stage="sent")
+    HTTP_BODY_BYTES.inc(response.num_bytes_downloaded, direction="response", stage="received")
+    HTTP_BODY_BYTES.inc(len(response.content), direction="response", stage="decoded")
+
+
+def _client_options(settings: RunnerSettings) -> dict[str, Any]:
+    headers = {"User-Agent": "styleagent-runner/0.1.0"}
+    if settings.api_key:
+        headers["Authorization"] = f"Bearer {settings.api_key}"
+    if settings.http2 and importlib.util.find_spec("h2") is None:
+        raise RunnerHttpError(
+            "RUNNER_HTTP2 requires the 'h2' package: pip install 'styleagent-runner[http2]'"
+        )
+    return {
+        "base_url": settings.api_base_url,
+        "timeout": settings.http_timeout_seconds,
+        "headers": headers,
+        "limits": httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry_seconds,
+        ),
+        "http2": settings.http2,
+    }
+
+
+def _client_span(
+    method: str, path: str, endpoint: str | None
+) -> AbstractContextManager[Span | None]:
+    return start_span(
+        endpoint or method,
+        kind="client",
+        attributes={"http.request.method": method, "url.path": path},
+    )
+
+
+def _set_status_code(span: Span | None, response: httpx.Response) -> None:
+    if span is not None:
+        span.set_attribute("http.response.status_code", response.status_code)
+
+
+def _decode_json(response: httpx.Response, codec: JsonCodec) -> Any:
+    if not response.content:
+        return {}
+    return codec.loads(response.content)
+
+
+def _begin_attempts(policy: RetryPolicy, endpoint: str) -> RetryAttempts:
+    attempts = policy.begin(endpoint)
+    if attempts is None:
+        raise CircuitOpenError(f"Circuit breaker open for {endpoint}")
+    return attempts
+
+
+def _is_retryable(response: httpx.Response) -> bool:
+    return response.status_code >= 500 or response.status_code == 429
+
+
+def _retry_after_seconds(response: httpx.Response) -> float | None:
+    """Parse ``Retry-After`` given either as delay seconds or as an HTTP date."""
+    value = response.headers.get("Retry-After", "").strip()
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def _server_error(response: httpx.Response, method: str, path: str) -> RunnerHttpError:
+    kind = "throttled request" if response.status_code == 429 else "server error"
+    return RunnerHttpError(
+        f"Backend {kind}: {response.status_code} for {method.upper()} {path}",
+        status_code=response.status_code,
+    )
+
+
+def _retries_exhausted(last_error: Exception | None) -> RunnerHttpError:
+    status_code = last_error.status_code if isinstance(last_error, RunnerHttpError) else None
+    return RunnerHttpError("Backend request failed after retries", status_code=status_code)
+
+
+def _open_download(destination: Path) -> tuple[BinaryIO, Path]:
+    fd, tmp_name = tempfile.mkstemp(
+        dir=destination.parent, prefix=f".{destination.name}.", suffix=".part"
+    )
+    return os.fdopen(fd, "wb"), Path(tmp_name)
 
-            try:
-                response.raise_for_status()
-            except httpx.HTTPStatusError as exc:
-                raise RunnerHttpError(str(exc)) from exc
 
-            return response
+def _sync_download(handle: BinaryIO) -> None:
+    handle.flush()
+    os.fsync(handle.fileno())
 
-        raise RunnerHttpError("Backend request failed after retries") from last_error
 
+def _raise_for_status(response: httpx.Response) -> None:
+    try:
+        response.raise_for_status()
+    except httpx.HTTPStatusError as exc:
+        raise RunnerHttpError(str(exc), status_code=response.status_code) from exc
 
-def _backoff_seconds(attempt: int) -> float:
-    return 0.25 * (2**attempt)
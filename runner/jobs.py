@@ -2,98 +2,155 @@
 
 from __future__ import annotations
 
-from typing import Any
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any
 
-from runner.captureone.compile import run_compile_captureone
-from runner.captureone.host import HostIntegrationError
 from runner.config import RunnerSettings
-from runner.http import RunnerHttpClient
-from runner.types import Job, JobExecutionResult, JobLog, transition_status
+from runner.handlers import handler_for
+from runner.http import AsyncRunnerHttpClient, RunnerHttpClient
+from runner.metrics import JOBS_TOTAL, PhaseTimer
+from runner.types import (
+    Job,
+    JobExecutionError,
+    JobExecutionResult,
+    JobLog,
+    JobStatus,
+    LogLevel,
+    transition_status,
+)
+
+if TYPE_CHECKING:
+    # Only executors given a cache need it; the CLI imports it when one is configured.
+    from runner.cache import ArtifactCache
 
 
 class JobExecutor:
-    """Execute a single job at a time (MVP, no concurrency)."""
+    """Execute one job per call; safe to share across poller worker threads."""
 
-    def __init__(self, client: RunnerHttpClient, *, settings: RunnerSettings | None = None) -> None:
+    def __init__(
+        self,
+        client: RunnerHttpClient,
+        *,
+        settings: RunnerSettings | None = None,
+        artifact_cache: ArtifactCache | None = None,
+    ) -> None:
         self._client = client
         self._settings = settings
+        self._artifact_cache = artifact_cache
 
     def execute(self, job: Job) -> JobExecutionResult:
-        logs: list[JobLog] = []
-        current_status = job.status
-        result: dict[str, Any] | None = None
-        error: str | None = None
+        run = _JobRun(job)
+        try:
+            with run.timer.activate():
+                result = self._dispatch(job)
+        except Exception as exc:
+            run.failed(exc)
+        else:
+            run.succeeded(result)
+        return run.to_result()
 
-        logs.append(
-            JobLog.create(
-                level="info",
-                event="job_picked_up",
-                job_id=job.job_id,
-                status=current_status,
-                message=f"Picked up job type={job.job_type}",
-            )
+    def _dispatch(self, job: Job) -> dict[str, Any]:
+        return handler_for(job.job_type).execute(
+            self._client, job.payload, settings=self._settings, cache=self._artifact_cache
         )
 
-        current_status = transition_status(current_status, "running")
-        logs.append(
-            JobLog.create(
-                level="info",
-                event="job_running",
-                job_id=job.job_id,
-                status=current_status,
-                message="Job execution started",
-            )
-        )
 
+class AsyncJobExecutor:
+    """Asyncio counterpart of :class:`JobExecutor`."""
+
+    def __init__(
+        self,
+        client: AsyncRunnerHttpClient,
+        *,
+        settings: RunnerSettings | None = None,
+        artifact_cache: ArtifactCache | None = None,
+    ) -> None:
+        self._client = client
+        self._settings = settings
+        self._artifact_cache = artifact_cache
+
+    async def execute(self, job: Job) -> JobExecutionResult:
+        run = _JobRun(job)
         try:
-            if job.job_type == "compile_captureone":
-                result = run_compile_captureone(self._client, job.payload, settings=self._settings)
-            else:
-                raise ValueError(f"Unsupported job type: {job.job_type}")
-
-            current_status = transition_status(current_status, "succeeded")
-            logs.append(
-                JobLog.create(
-                    level="info",
-                    event="job_succeeded",
-                    job_id=job.job_id,
-                    status=current_status,
-                    message="Job execution completed",
-                    context={"result": result},
-                )
-            )
-        except HostIntegrationError as exc:
-            error = str(exc)
-            result = {"host_integration": exc.to_host_integration()}
-            current_status = transition_status(current_status, "failed")
-            logs.append(
-                JobLog.create(
-                    level="error",
-                    event="job_failed",
-                    job_id=job.job_id,
-                    status=current_status,
-                    message="Job execution failed",
-                    context={"error": error, "result": result},
-                )
-            )
+            with run.timer.activate():
+                result = await self._dispatch(job)
         except Exception as exc:
-            error = str(exc)
-            current_status = transition_status(current_status, "failed")
-            logs.append(
-                JobLog.create(
-                    level="error",
-                    event="job_failed",
-                    job_id=job.job_id,
-                    status=current_status,
-                    message="Job execution failed",
-                    context={"error": error},
-                )
-            )
+            run.failed(exc)
+        else:
+            run.succeeded(result)
+        return run.to_result()
+
+    async def _dispatch(self, job: Job) -> dict[str, Any]:
+        return await handler_for(job.job_type).execute_async(
+            self._client, job.payload, settings=self._settings, cache=self._artifact_cache
+        )
+
+
+class _JobRun:
+    """Status transitions and structured logs for one job execution."""
+
+    def __init__(self, job: Job) -> None:
+        self._job = job
+        self._status: JobStatus = job.status
+        self._result: dict[str, Any] | None = None
+        self._error: str | None = None
+        self._error_code = ""
+        self._logs: list[JobLog] = []
+        self.timer = PhaseTimer()
+        if job.created_at is not None:
+            # Wall-clock difference against the backend's clock; every other phase is monotonic.
+            queue_wait = (datetime.now(timezone.utc) - job.created_at).total_seconds()
+            self.timer.add("queue_wait", max(0.0, queue_wait))
+
+        self._log("info", "job_picked_up", f"Picked up job type={job.job_type}")
+        self._status = transition_status(self._status, "running")
+        self._log("info", "job_running", "Job execution started")
 
+    def succeeded(self, result: dict[str, Any]) -> None:
+        self._result = result
+        self._status = transition_status(self._status, "succeeded")
+        self._log("info", "job_succeeded", "Job execution completed", {"result": result})
+
+    def failed(self, exc: Exception) -> None:
+        self._error = str(exc)
+        context: dict[str, Any] = {"error": self._error}
+        # Handler errors carry a stable code; anything else is labelled by exception type.
+        self._error_code = type(exc).__name__
+        if isinstance(exc, JobExecutionError):
+            self._error_code = exc.code
+            self._result = exc.to_result()
+            if self._result is not None:
+                context["result"] = self._result
+        self._status = transition_status(self._status, "failed")
+        self._log("error", "job_failed", "Job execution failed", context)
+
+    def to_result(self) -> JobExecutionResult:
+        JOBS_TOTAL.inc(
+            job_type=self._job.job_type, status=self._status, error_code=self._error_code
+        )
         return JobExecutionResult(
-            job_id=job.job_id,
-            status=current_status,
-            result=result,
-            error=error,
-            logs=logs,
+            job_id=self._job.job_id,
+            status=self._status,
+            result=self._result,
+            error=self._error,
+            logs=self._logs,
+            timings=dict(self.timer.timings),
+        )
+
+    def _log(
+        self,
+        level: LogLevel,
+        event: str,
+        message: str,
+        context: dict[str, Any] | None = None,
+    ) -> None:
+        self._logs.append(
+            JobLog.create(
+                level=level,
+                event=event,
+                job_id=self._job.job_id,
+                status=self._status,
+                message=message,
+                context=context,
+            )
         )
@@ -0,0 +1,429 @@
+"""In-process metrics with Prometheus text exposition."""
+
+from __future__ import annotations
+
+from collections.abc import Hashable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+import math
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Literal, TypeVar
+
+if TYPE_CHECKING:
+    from http.server import BaseHTTPRequestHandler
+
+# Latency buckets in seconds, from fast API calls up to slow Capture One launches.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_LabelValues = tuple[str, ...]
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self._values: dict[_LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        if amount < 0:
+            raise ValueError("Counter can only increase")
+        key = _label_values(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(_label_values(self.labelnames, labels), 0.0)
+
+    def snapshot(self) -> MetricSnapshot:
+        with self._lock:
+            series = dict(self._values)
+        return MetricSnapshot("counter", self.name, self.help_text, self.labelnames, (), series)
+
+    def merge(self, series: dict[_LabelValues, Any]) -> None:
+        with self._lock:
+            for key, value in series.items():
+                self._values[key] = self._values.get(key, 0.0) + value
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for key, value in values:
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}{labels} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...] = (),
+        *,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self._buckets = tuple(sorted(buckets))
+        self._series: dict[_LabelValues, _HistogramSeries] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = _label_values(self.labelnames, labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _HistogramSeries(len(self._buckets))
+            series.observe(self._buckets, value)
+
+    def count(self, **labels: str) -> int:
+        with self._lock:
+            series = self._series.get(_label_values(self.labelnames, labels))
+            return series.count if series is not None else 0
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the wall-clock duration of the ``with`` block, even when it raises."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def snapshot(self) -> MetricSnapshot:
+        with self._lock:
+            series = {
+                key: (tuple(series.bucket_counts), series.total, series.count)
+                for key, series in self._series.items()
+            }
+        return MetricSnapshot(
+            "histogram", self.name, self.help_text, self.labelnames, self._buckets, series
+        )
+
+    def merge(self, series: dict[_LabelValues, Any]) -> None:
+        with self._lock:
+            for key, (bucket_counts, total, count) in series.items():
+                merged = self._series.get(key)
+                if merged is None:
+                    merged = self._series[key] = _HistogramSeries(len(self._buckets))
+                merged.add(bucket_counts, total, count)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            snapshot = sorted(
+                (key, list(series.bucket_counts), series.total, series.count)
+                for key, series in self._series.items()
+            )
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        bucket_labels = (*self.labelnames, "le")
+        for key, bucket_counts, total, count in snapshot:
+            cumulative = 0
+            for bound, bucket_count in zip(self._buckets, bucket_counts):
+                cumulative += bucket_count
+                le_labels = _format_labels(bucket_labels, (*key, _format_value(bound)))
+                lines.append(f"{self.name}_bucket{le_labels} {cumulative}")
+            inf_key = (*key, "+Inf")
+            lines.append(f"{self.name}_bucket{_format_labels(bucket_labels, inf_key)} {count}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class _HistogramSeries:
+    def __init__(self, bucket_count: int) -> None:
+        self.bucket_counts = [0] * bucket_count
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, buckets: tuple[float, ...], value: float) -> None:
+        for index, bound in enumerate(buckets):
+            if value <= bound:
+                self.bucket_counts[index] += 1
+                break
+        self.total += value
+        self.count += 1
+
+    def add(self, bucket_counts: tuple[int, ...], total: float, count: int) -> None:
+        for index, bucket_count in enumerate(bucket_counts):
+            self.bucket_counts[index] += bucket_count
+        self.total += total
+        self.count += count
+
+
+@dataclass(frozen=True)
+class MetricSnapshot:
+    """Picklable copy of one metric's series, for aggregating across processes."""
+
+    kind: Literal["counter", "histogram"]
+    name: str
+    help_text: str
+    labelnames: tuple[str, ...]
+    buckets: tuple[float, ...]
+    series: dict[_LabelValues, Any]
+
+
+_M = TypeVar("_M", Counter, Histogram)
+
+
+class MetricsRegistry:
+    """Named collection of metrics rendered together for a scrape."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Counter | Histogram] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...] = (),
+        *,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, help_text, labelnames, buckets=buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = [self._metrics[name] for name in sorted(self._metrics)]
+        lines: list[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> list[MetricSnapshot]:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return [metric.snapshot() for metric in metrics]
+
+    def merge(self, snapshots: list[MetricSnapshot]) -> None:
+        """Add the series of ``snapshots`` to this registry's metrics."""
+        for snapshot in snapshots:
+            metric: Counter | Histogram
+            if snapshot.kind == "counter":
+                metric = self.counter(snapshot.name, snapshot.help_text, snapshot.labelnames)
+            else:
+                metric = self.histogram(
+                    snapshot.name, snapshot.help_text, snapshot.labelnames, buckets=snapshot.buckets
+                )
+            metric.merge(snapshot.series)
+
+    def _register(self, metric: _M) -> _M:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Metric {metric.name} already registered differently")
+                return existing  # type: ignore[return-value]
+            self._metrics[metric.name] = metric
+            return metric
+
+
+class MergedMetrics:
+    """Sum of a local registry and the latest snapshots pushed by other processes.
+
+    Snapshots are cumulative per process, so each source replaces its previous
+    one. A retired source's last snapshot is folded into a running total,
+    which keeps counters monotonic across process restarts.
+    """
+
+    def __init__(self, local: MetricsRegistry) -> None:
+        self._local = local
+        self._retired = MetricsRegistry()
+        self._live: dict[Hashable, list[MetricSnapshot]] = {}
+        self._retired_sources: set[Hashable] = set()
+        self._lock = threading.Lock()
+
+    def update(self, source: Hashable, snapshots: list[MetricSnapshot]) -> None:
+        with self._lock:
+            if source not in self._retired_sources:
+                self._live[source] = snapshots
+
+    def retire(self, source: Hashable) -> None:
+        """Fold ``source`` into the totals; its later snapshots are ignored."""
+        with self._lock:
+            self._retired_sources.add(source)
+            snapshots = self._live.pop(source, None)
+            if snapshots is not None:
+                self._retired.merge(snapshots)
+
+    def render(self) -> str:
+        merged = MetricsRegistry()
+        merged.merge(self._local.snapshot())
+        with self._lock:
+            merged.merge(self._retired.snapshot())
+            for snapshots in self._live.values():
+                merged.merge(snapshots)
+        return merged.render()
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "runner_http_request_duration_seconds",
+    "Backend request latency including retries, by endpoint and outcome.",
+    ("endpoint", "outcome"),
+)
+PHASE_SECONDS = REGISTRY.histogram(
+    "runner_job_phase_duration_seconds",
+    "Time spent in each job execution phase.",
+    ("phase",),
+)
+JOBS_TOTAL = REGISTRY.counter(
+    "runner_jobs_total",
+    "Executed jobs by final status and error code.",
+    ("job_type", "status", "error_code"),
+)
+HTTP_BODY_BYTES = REGISTRY.counter(
+    "runner_http_body_bytes_total",
+    "Request and response body bytes before and after content encoding.",
+    ("direction", "stage"),
+)
+PROCESS_RESTARTS = REGISTRY.counter(
+    "runner_process_restarts_total",
+    "Poller processes restarted by the supervisor after exiting unexpectedly.",
+)
+
+
+@contextmanager
+def time_request(endpoint: str) -> Iterator[None]:
+    """Observe one backend request, retries included, labelled ``ok`` unless it raises."""
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - started, endpoint=endpoint, outcome=outcome
+        )
+
+
+class PhaseTimer:
+    """Per-job breakdown of :func:`time_phase` durations in seconds.
+
+    While activated, every phase timed in the current context (including
+    ``asyncio.to_thread`` calls, which copy it) is added to :attr:`timings`.
+    """
+
+    def __init__(self) -> None:
+        self.timings: dict[str, float] = {}
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.timings[phase] = self.timings.get(phase, 0.0) + seconds
+
+    @contextmanager
+    def activate(self) -> Iterator["PhaseTimer"]:
+        token = _active_timer.set(self)
+        try:
+            yield self
+        finally:
+            _active_timer.reset(token)
+
+
+_active_timer: ContextVar[PhaseTimer | None] = ContextVar("runner_phase_timer", default=None)
+
+
+@contextmanager
+def time_phase(phase: str) -> Iterator[None]:
+    """Time a job phase with the monotonic clock, even when it raises."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        PHASE_SECONDS.observe(elapsed, phase=phase)
+        timer = _active_timer.get()
+        if timer is not None:
+            timer.add(phase, elapsed)
+
+
+class MetricsServer:
+    """Serve ``GET /metrics`` for a registry from a daemon thread."""
+
+    def __init__(
+        self,
+        *,
+        host: str = "127.0.0.1",
+        port: int,
+        registry: MetricsRegistry | MergedMetrics = REGISTRY,
+    ) -> None:
+        # http.server is only loaded once a metrics port is configured.
+        from http.server import ThreadingHTTPServer
+
+        self._server = ThreadingHTTPServer((host, port), _metrics_handler(registry))
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="runner-metrics", daemon=True
+        )
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self) -> "MetricsServer":
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def _metrics_handler(registry: MetricsRegistry | MergedMetrics) -> type[BaseHTTPRequestHandler]:
+    from http.server import BaseHTTPRequestHandler
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: object) -> None:
+            # Keep scrapes out of the runner's JSON log stream.
+            return
+
+    return _Handler
+
+
+def _label_values(labelnames: tuple[str, ...], labels: dict[str, str]) -> _LabelValues:
+    if set(labels) != set(labelnames):
+        raise ValueError(f"Expected labels {labelnames}, got {tuple(labels)}")
+    return tuple(str(labels[name]) for name in labelnames)
+
+
+def _format_labels(labelnames: tuple[str, ...], values: _LabelValues) -> str:
+    if not labelnames:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape_label(value)}"' for name, value in zip(labelnames, values)
+    )
+    return "{" + pairs + "}"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value)) if abs(value) < 1e15 else repr(float(value))
+    return repr(float(value))
@@ -1,16 +1,98 @@
-"""Polling loop for one-job-at-a-time runner execution."""
+"""Polling loop for runner job execution."""
 
 from __future__ import annotations
 
-from collections.abc import Callable
-import json
+import asyncio
+from collections.abc import Awaitable, Callable
+from concurrent.futures import FIRST_COMPLETED, Future, InvalidStateError, ThreadPoolExecutor, wait
+from contextlib import suppress
+import contextvars
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+import random
+import threading
 import time
+from typing import Any, Protocol
 
-from runner.api import RunnerBackendApi
-from runner.jobs import JobExecutor
+from runner.api import AsyncRunnerBackendApi, RunnerBackendApi
+from runner.codec import JsonCodec, json_codec
+from runner.completions import AsyncCompletionBuffer, CompletionBuffer
+from runner.heartbeat import AsyncHeartbeatScheduler, HeartbeatScheduler
+from runner.jobs import AsyncJobExecutor, JobExecutor
+from runner.metrics import PhaseTimer, time_phase
+from runner.scheduler import LaneScheduler
+from runner.tracing import Span, start_span
 from runner.types import Job, JobExecutionResult
 
 
+class PollBackoff:
+    """Adaptive delay between polls.
+
+    Returns zero right after a pickup so a busy queue is drained back to back,
+    and backs off exponentially with jitter between ``min_seconds`` and
+    ``max_seconds`` while the queue stays empty.
+    """
+
+    def __init__(
+        self,
+        *,
+        min_seconds: float,
+        max_seconds: float,
+        jitter: Callable[[float, float], float] = random.uniform,
+    ) -> None:
+        if min_seconds <= 0:
+            raise ValueError("min_seconds must be > 0")
+        if max_seconds < min_seconds:
+            raise ValueError("max_seconds must be >= min_seconds")
+
+        self._min_seconds = min_seconds
+        self._max_seconds = max_seconds
+        self._jitter = jitter
+        self._ceiling = min_seconds
+
+    def next_delay(self, *, found_work: bool) -> float:
+        if found_work:
+            self._ceiling = self._min_seconds
+            return 0.0
+
+        self._ceiling = min(self._max_seconds, self._ceiling * 2)
+        return self._jitter(self._min_seconds, self._ceiling)
+
+
+class JobSlots(Protocol):
+    """Cap on the jobs held, running or prefetched, by several pollers together."""
+
+    def reserve(self, held: int, wanted: int) -> int:
+        """Record ``held`` jobs and grant up to ``wanted`` more, returning the grant."""
+        ...
+
+    def settle(self, held: int) -> None:
+        """Record that this poller now holds ``held`` jobs."""
+        ...
+
+
+@dataclass
+class ShutdownSummary:
+    """What a stopped poll loop did with the jobs it held."""
+
+    reason: str
+    drained: list[str] = field(default_factory=list)
+    released: list[str] = field(default_factory=list)
+    abandoned: list[str] = field(default_factory=list)
+    completions_flushed: int = 0
+    drain_seconds: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "reason": self.reason,
+            "drained_job_ids": self.drained,
+            "released_job_ids": self.released,
+            "abandoned_job_ids": self.abandoned,
+            "completions_flushed": self.completions_flushed,
+            "drain_seconds": round(self.drain_seconds, 3),
+        }
+
+
 class RunnerPoller:
     def __init__(
         self,
@@ -18,36 +100,762 @@ class RunnerPoller:
         executor: JobExecutor,
         *,
         poll_interval_seconds: float,
-        sleep: Callable[[float], None] = time.sleep,
+        max_poll_interval_seconds: float | None = None,
+        workers: int = 1,
+        heartbeat_interval_seconds: float = 0.0,
+        completion_batch_size: int = 1,
+        completion_flush_interval_seconds: float = 1.0,
+        prefetch_depth: int = 0,
+        shutdown_grace_seconds: float | None = None,
+        scheduler: LaneScheduler | None = None,
+        lookahead: int = 1,
+        slots: JobSlots | None = None,
+        sleep: Callable[[float], None] | None = None,
         emit: Callable[[str], None] = print,
+        codec: JsonCodec | None = None,
     ) -> None:
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        if prefetch_depth < 0:
+            raise ValueError("prefetch_depth must be >= 0")
+        if shutdown_grace_seconds is not None and shutdown_grace_seconds < 0:
+            raise ValueError("shutdown_grace_seconds must be >= 0")
+        if lookahead < 1:
+            raise ValueError("lookahead must be >= 1")
+
         self._api = api
+        self._codec = codec or json_codec()
         self._executor = executor
+        self._backoff = PollBackoff(
+            min_seconds=poll_interval_seconds,
+            max_seconds=max_poll_interval_seconds or poll_interval_seconds,
+        )
+        self._workers = workers
+        self._prefetch_depth = prefetch_depth
+        self._shutdown_grace_seconds = shutdown_grace_seconds
+        self._scheduler = scheduler or LaneScheduler()
+        self._lookahead = lookahead
+        self._slots = slots
         self._poll_interval_seconds = poll_interval_seconds
-        self._sleep = sleep
+        # Idle waits end early on stop() unless a sleep is injected.
+        self._sleep = sleep or self._stopped_wait
         self._emit = emit
+        self._emit_lock = threading.Lock()
+        self._stopped = threading.Event()
+        # Completed by stop() so a pool loop waiting on its jobs wakes up.
+        self._stop_signal: Future[None] = Future()
+        self._stopped_at = 0.0
+        self._abandoned: set[str] = set()
+        self.shutdown_summary: ShutdownSummary | None = None
+        # Set while pipelined: finished jobs are reported from these threads.
+        self._finisher: ThreadPoolExecutor | None = None
+        self._heartbeats: HeartbeatScheduler | None = None
+        if heartbeat_interval_seconds > 0:
+            self._heartbeats = HeartbeatScheduler(
+                api,
+                interval_seconds=heartbeat_interval_seconds,
+                on_error=lambda job_ids, exc: self._emit_failure("heartbeat_failed", job_ids, exc),
+            )
+        self._completions: CompletionBuffer | None = None
+        if completion_batch_size > 1:
+            self._completions = CompletionBuffer(
+                api,
+                max_batch_size=completion_batch_size,
+                flush_interval_seconds=completion_flush_interval_seconds,
+                on_error=lambda job_ids, exc: self._emit_failure("completion_failed", job_ids, exc),
+            )
+
+    def stop(self, reason: str = "stop") -> None:
+        """Make :meth:`poll_forever` return once the jobs already in flight finish.
+
+        Safe to call from any thread or signal handler; no new jobs are
+        acquired afterwards. With ``shutdown_grace_seconds`` the jobs still
+        running when it elapses are abandoned and their leases released.
+        """
+        if self.shutdown_summary is None:
+            self._stopped_at = time.monotonic()
+            self.shutdown_summary = ShutdownSummary(reason=reason)
+        self._stopped.set()
+        with suppress(InvalidStateError):
+            self._stop_signal.set_result(None)
+
+    def close(self) -> None:
+        """Stop background lease renewal and flush buffered completions.
+
+        After a :meth:`stop` this also emits the ``runner_stopped`` summary.
+        """
+        if self._heartbeats is not None:
+            self._heartbeats.close()
+        summary = self.shutdown_summary
+        if self._completions is not None:
+            if summary is not None:
+                summary.completions_flushed = len(self._completions.pending())
+            self._completions.close()
+        if summary is not None:
+            line = _summary_line(summary, self._codec)
+            with self._emit_lock:
+                self._emit(line)
 
     def poll_once(self) -> JobExecutionResult | None:
-        jobs = self._api.list_pending_jobs(limit=1)
+        jobs, claimed = self._acquire(limit=1)
+        jobs = self._pick(jobs, 1, claimed=claimed)
         if not jobs:
             return None
 
-        return self.execute_job(jobs[0])
+        return self.execute_job(jobs[0], claimed=claimed)
+
+    def poll_batch(self) -> list[JobExecutionResult]:
+        """Fetch up to ``workers`` pending jobs and execute them concurrently."""
+        jobs, claimed = self._acquire(limit=self._workers)
+        jobs = self._pick(jobs, self._workers, claimed=claimed)
+        if not jobs:
+            return []
+        if len(jobs) == 1:
+            return [self.execute_job(jobs[0], claimed=claimed)]
+
+        with ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="runner-job") as pool:
+            futures = [pool.submit(self.execute_job, job, claimed=claimed) for job in jobs]
+            return [future.result() for future in futures]
 
     def run_job_id(self, job_id: str) -> JobExecutionResult:
         job = self._api.get_job(job_id)
         return self.execute_job(job)
 
-    def execute_job(self, job: Job) -> JobExecutionResult:
-        self._api.claim_job(job.job_id)
-        self._api.heartbeat_job(job.job_id, status="running")
-        result = self._executor.execute(job)
-        self._api.complete_job(result)
-        for log in result.logs:
-            self._emit(json.dumps(log.to_dict(), sort_keys=True))
+    def execute_job(self, job: Job, *, claimed: bool = False) -> JobExecutionResult:
+        with start_span("job", attributes=_job_attributes(job)) as span:
+            result = self._run_job(job, claimed=claimed)
+            _end_job_span(span, result)
+        return result
+
+    def _run_job(self, job: Job, *, claimed: bool) -> JobExecutionResult:
+        timer = PhaseTimer()
+        if not claimed:
+            with timer.activate(), time_phase("claim"):
+                self._api.claim_job(job.job_id)
+        if self._heartbeats is not None:
+            self._heartbeats.track(job.job_id)
+        try:
+            self._api.heartbeat_job(job.job_id, status="running")
+        except Exception:
+            # The job never starts; hand its lease back rather than renew it.
+            self._release_one(job)
+            raise
+        try:
+            result = self._executor.execute(job)
+        finally:
+            if self._heartbeats is not None:
+                self._heartbeats.untrack(job.job_id)
+        result = _with_timings(result, timer.timings)
+        if job.job_id in self._abandoned:
+            # Its lease was released at the shutdown deadline; the backend owns it again.
+            return result
+        finisher = self._finisher
+        if finisher is not None:
+            # Report off the job's slot so the next job starts right away.
+            finisher.submit(contextvars.copy_context().run, self._finish_reporting_errors, result)
+        else:
+            self._finish(result)
         return result
 
+    def _finish(self, result: JobExecutionResult) -> None:
+        if self._completions is not None:
+            self._completions.submit(result)
+        else:
+            self._api.complete_job(result)
+        lines = _log_lines(result, self._codec)
+        with self._emit_lock:
+            for line in lines:
+                self._emit(line)
+
+    def _finish_reporting_errors(self, result: JobExecutionResult) -> None:
+        try:
+            self._finish(result)
+        except Exception as exc:
+            self._emit_failure("completion_failed", [result.job_id], exc)
+
     def poll_forever(self) -> None:
-        while True:
-            self.poll_once()
-            self._sleep(self._poll_interval_seconds)
+        # A shutdown deadline needs jobs off the polling thread to be enforceable.
+        if (
+            self._workers > 1
+            or self._prefetch_depth
+            or self._shutdown_grace_seconds is not None
+            or self._slots is not None
+        ):
+            self._poll_forever_pooled()
+            return
+
+        while not self._stopped.is_set():
+            result = self.poll_once()
+            if result is None and self._api.long_poll_active:
+                # The backend already held the request open; ask again right away.
+                continue
+            delay = self._backoff.next_delay(found_work=result is not None)
+            if delay:
+                self._sleep(delay)
+
+    def _poll_forever_pooled(self) -> None:
+        """Keep ``workers`` jobs running, and with prefetch ``prefetch_depth`` more ready.
+
+        Prefetched jobs are claimed ahead of time, so a freed slot starts its
+        next job without a round trip, and finished jobs are reported from a
+        separate thread. Prefetched jobs never started are released on stop.
+        """
+        in_flight: dict[Future[JobExecutionResult], Job] = {}
+        scheduler = self._scheduler
+        if self._prefetch_depth:
+            # One reporter per worker so completions never queue behind each other.
+            self._finisher = ThreadPoolExecutor(
+                max_workers=self._workers, thread_name_prefix="runner-finish"
+            )
+        pool = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="runner-job")
+        try:
+            while not self._stopped.is_set():
+                # Work found this round: jobs started or newly claimed. Listed
+                # jobs a full lane holds back do not count, or the loop would
+                # list them again without waiting.
+                found_work = self._start_queued(pool, in_flight) > 0
+                free_slots = self._workers - len(in_flight)
+                wanted = self._wanted(free_slots)
+                granted = self._reserve(len(in_flight) + scheduler.queued(), wanted)
+                if granted:
+                    # Only block in a long poll when no running job needs reaping.
+                    jobs, claimed = self._acquire(limit=granted, long_poll=not in_flight)
+                    if claimed:
+                        self._track(jobs)
+                        scheduler.offer(jobs)
+                        self._start_queued(pool, in_flight)
+                        found_work = found_work or bool(jobs)
+                    else:
+                        # Unclaimed jobs go stale in the queue; take only what runs now.
+                        for job in scheduler.select(jobs, min(free_slots, granted)):
+                            in_flight[pool.submit(self.execute_job, job, claimed=False)] = job
+                            found_work = True
+                if self._slots is not None:
+                    self._slots.settle(len(in_flight) + scheduler.queued())
+
+                # Refill as soon as a slot frees up. With idle slots or room to
+                # prefetch, poll again after the backoff delay even if no
+                # running job has finished; while other pollers hold the shared
+                # cap, check back at the base interval instead.
+                timeout = None
+                capped = granted < wanted
+                if capped:
+                    timeout = self._poll_interval_seconds
+                elif len(in_flight) < self._workers or scheduler.queued() < self._prefetch_depth:
+                    timeout = self._backoff.next_delay(found_work=found_work)
+                if not in_flight:
+                    if capped or not self._api.long_poll_active:
+                        self._sleep(timeout)
+                    continue
+
+                done, _ = wait(
+                    {*in_flight, self._stop_signal}, timeout=timeout, return_when=FIRST_COMPLETED
+                )
+                if self._stopped.is_set():
+                    # Leave finished jobs to _drain so the summary lists them.
+                    break
+                for future in done - {self._stop_signal}:
+                    job = in_flight.pop(future)
+                    scheduler.finished(job)
+                    self._reap(future, job)
+
+            self._release_queued()
+            self._drain(in_flight)
+        finally:
+            self._release_queued()
+            pool.shutdown(wait=not self._abandoned, cancel_futures=True)
+            if self._finisher is not None:
+                self._finisher.shutdown(wait=True)
+                self._finisher = None
+            if self._slots is not None:
+                self._slots.settle(0)
+
+    def _drain(self, in_flight: dict[Future[JobExecutionResult], Job]) -> None:
+        """Wait for the jobs in flight until the shutdown deadline, then abandon the rest."""
+        done, pending = wait(in_flight, timeout=self._grace_remaining())
+        for future in pending:
+            self._abandon(in_flight[future])
+        summary = self.shutdown_summary
+        if summary is not None:
+            summary.drained.extend(in_flight[future].job_id for future in done)
+            summary.drain_seconds = time.monotonic() - self._stopped_at
+        for future in done:
+            self._reap(future, in_flight[future])
+
+    def _reap(self, future: Future[JobExecutionResult], job: Job) -> None:
+        # A claim race or a failed heartbeat or completion call ends this job
+        # only; the other workers' jobs keep running.
+        try:
+            future.result()
+        except Exception as exc:
+            self._emit_failure("job_run_failed", [job.job_id], exc)
+
+    def _grace_remaining(self) -> float | None:
+        if self._shutdown_grace_seconds is None:
+            return None
+        elapsed = time.monotonic() - self._stopped_at
+        return max(0.0, self._shutdown_grace_seconds - elapsed)
+
+    def _reserve(self, held: int, wanted: int) -> int:
+        if self._slots is None or not wanted:
+            return wanted
+        return self._slots.reserve(held, wanted)
+
+    def _abandon(self, job: Job) -> None:
+        self._abandoned.add(job.job_id)
+        if self.shutdown_summary is not None:
+            self.shutdown_summary.abandoned.append(job.job_id)
+        self._release_one(job)
+
+    def _stopped_wait(self, seconds: float) -> None:
+        self._stopped.wait(seconds)
+
+    def _wanted(self, free_slots: int) -> int:
+        """Jobs to ask for: enough to fill free slots and the prefetch depth.
+
+        Queued jobs held back by a full lane do not count towards that, so
+        other lanes keep being served, but the queue never grows beyond
+        ``workers + prefetch_depth``.
+        """
+        scheduler = self._scheduler
+        capacity = self._workers + self._prefetch_depth - scheduler.queued()
+        return max(0, min(free_slots + self._prefetch_depth - scheduler.runnable(), capacity))
+
+    def _start_queued(
+        self, pool: ThreadPoolExecutor, in_flight: dict[Future[JobExecutionResult], Job]
+    ) -> int:
+        started = 0
+        while len(in_flight) < self._workers:
+            job = self._scheduler.next_job()
+            if job is None:
+                break
+            in_flight[pool.submit(self.execute_job, job, claimed=True)] = job
+            started += 1
+        return started
+
+    def _track(self, jobs: list[Job]) -> None:
+        # Claimed jobs may wait in the scheduler behind a full lane; keep
+        # their leases alive from the moment they are this runner's.
+        if self._heartbeats is not None:
+            for job in jobs:
+                self._heartbeats.track(job.job_id)
+
+    def _release_queued(self) -> None:
+        for job in self._scheduler.drain():
+            if self.shutdown_summary is not None:
+                self.shutdown_summary.released.append(job.job_id)
+            self._release_one(job)
+
+    def _release_one(self, job: Job) -> None:
+        if self._heartbeats is not None:
+            self._heartbeats.untrack(job.job_id)
+        try:
+            self._api.release_job(job.job_id)
+        except Exception as exc:
+            self._emit_failure("release_failed", [job.job_id], exc)
+
+    def _emit_failure(self, event: str, job_ids: list[str], exc: Exception) -> None:
+        line = _failure_line(event, job_ids, exc, self._codec)
+        with self._emit_lock:
+            self._emit(line)
+
+    def _pick(self, jobs: list[Job], limit: int, *, claimed: bool) -> list[Job]:
+        # Claimed jobs are already this runner's; listed ones are chosen by the scheduler.
+        return jobs if claimed else self._scheduler.select(jobs, limit, start=False)
+
+    def _acquire(self, *, limit: int, long_poll: bool = True) -> tuple[list[Job], bool]:
+        """Return jobs and whether the backend already claimed them.
+
+        Claimed jobs number at most ``limit``. Listed jobs number up to
+        ``limit * lookahead`` candidates for the scheduler to choose from.
+        """
+        jobs = self._api.claim_next_jobs(limit=limit, long_poll=long_poll)
+        if jobs is not None:
+            return jobs, True
+        candidates = limit * self._lookahead
+        return self._api.list_pending_jobs(limit=candidates, long_poll=long_poll), False
+
+
+class AsyncRunnerPoller:
+    """Asyncio counterpart of :class:`RunnerPoller`.
+
+    ``workers`` bounds the number of jobs in flight on the event loop; each job
+    is a task rather than a thread, so it can be set far higher than the
+    thread pool size.
+    """
+
+    def __init__(
+        self,
+        api: AsyncRunnerBackendApi,
+        executor: AsyncJobExecutor,
+        *,
+        poll_interval_seconds: float,
+        max_poll_interval_seconds: float | None = None,
+        workers: int = 1,
+        heartbeat_interval_seconds: float = 0.0,
+        completion_batch_size: int = 1,
+        completion_flush_interval_seconds: float = 1.0,
+        prefetch_depth: int = 0,
+        shutdown_grace_seconds: float | None = None,
+        scheduler: LaneScheduler | None = None,
+        lookahead: int = 1,
+        slots: JobSlots | None = None,
+        sleep: Callable[[float], Awaitable[None]] | None = None,
+        emit: Callable[[str], None] = print,
+        codec: JsonCodec | None = None,
+    ) -> None:
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        if prefetch_depth < 0:
+            raise ValueError("prefetch_depth must be >= 0")
+        if shutdown_grace_seconds is not None and shutdown_grace_seconds < 0:
+            raise ValueError("shutdown_grace_seconds must be >= 0")
+        if lookahead < 1:
+            raise ValueError("lookahead must be >= 1")
+
+        self._api = api
+        self._codec = codec or json_codec()
+        self._executor = executor
+        self._backoff = PollBackoff(
+            min_seconds=poll_interval_seconds,
+            max_seconds=max_poll_interval_seconds or poll_interval_seconds,
+        )
+        self._workers = workers
+        self._prefetch_depth = prefetch_depth
+        self._shutdown_grace_seconds = shutdown_grace_seconds
+        self._scheduler = scheduler or LaneScheduler()
+        self._lookahead = lookahead
+        self._slots = slots
+        self._poll_interval_seconds = poll_interval_seconds
+        # Idle waits end early on stop() unless a sleep is injected.
+        self._sleep = sleep or self._stopped_wait
+        self._emit = emit
+        self._stopped = False
+        # Created by poll_forever on its loop; set by stop() to wake it up.
+        self._stop_event: asyncio.Event | None = None
+        self._stopped_at = 0.0
+        self.shutdown_summary: ShutdownSummary | None = None
+        # Set while pipelined: tasks reporting finished jobs off the job's slot.
+        self._finishing: set[asyncio.Task[None]] | None = None
+        self._heartbeats: AsyncHeartbeatScheduler | None = None
+        if heartbeat_interval_seconds > 0:
+            self._heartbeats = AsyncHeartbeatScheduler(
+                api,
+                interval_seconds=heartbeat_interval_seconds,
+                on_error=lambda job_ids, exc: self._emit(
+                    _failure_line("heartbeat_failed", job_ids, exc, self._codec)
+                ),
+            )
+        self._completions: AsyncCompletionBuffer | None = None
+        if completion_batch_size > 1:
+            self._completions = AsyncCompletionBuffer(
+                api,
+                max_batch_size=completion_batch_size,
+                flush_interval_seconds=completion_flush_interval_seconds,
+                on_error=lambda job_ids, exc: self._emit(
+                    _failure_line("completion_failed", job_ids, exc, self._codec)
+                ),
+            )
+
+    def stop(self, reason: str = "stop") -> None:
+        """Make :meth:`poll_forever` return once the jobs already in flight finish.
+
+        Call it from the event loop's thread, e.g. through
+        ``loop.add_signal_handler``. With ``shutdown_grace_seconds`` the jobs
+        still running when it elapses are cancelled and their leases released.
+        """
+        if self.shutdown_summary is None:
+            self._stopped_at = time.monotonic()
+            self.shutdown_summary = ShutdownSummary(reason=reason)
+        self._stopped = True
+        if self._stop_event is not None:
+            self._stop_event.set()
+
+    async def aclose(self) -> None:
+        """Stop background lease renewal and flush buffered completions.
+
+        After a :meth:`stop` this also emits the ``runner_stopped`` summary.
+        """
+        if self._heartbeats is not None:
+            await self._heartbeats.aclose()
+        summary = self.shutdown_summary
+        if self._completions is not None:
+            if summary is not None:
+                summary.completions_flushed = len(self._completions.pending())
+            await self._completions.aclose()
+        if summary is not None:
+            self._emit(_summary_line(summary, self._codec))
+
+    async def poll_once(self) -> JobExecutionResult | None:
+        jobs, claimed = await self._acquire(limit=1)
+        jobs = self._pick(jobs, 1, claimed=claimed)
+        if not jobs:
+            return None
+
+        return await self.execute_job(jobs[0], claimed=claimed)
+
+    async def poll_batch(self) -> list[JobExecutionResult]:
+        """Fetch up to ``workers`` pending jobs and execute them concurrently."""
+        jobs, claimed = await self._acquire(limit=self._workers)
+        jobs = self._pick(jobs, self._workers, claimed=claimed)
+        return list(
+            await asyncio.gather(*(self.execute_job(job, claimed=claimed) for job in jobs))
+        )
+
+    async def run_job_id(self, job_id: str) -> JobExecutionResult:
+        job = await self._api.get_job(job_id)
+        return await self.execute_job(job)
+
+    async def execute_job(self, job: Job, *, claimed: bool = False) -> JobExecutionResult:
+        with start_span("job", attributes=_job_attributes(job)) as span:
+            result = await self._run_job(job, claimed=claimed)
+            _end_job_span(span, result)
+        return result
+
+    async def _run_job(self, job: Job, *, claimed: bool) -> JobExecutionResult:
+        timer = PhaseTimer()
+        if not claimed:
+            with timer.activate(), time_phase("claim"):
+                await self._api.claim_job(job.job_id)
+        if self._heartbeats is not None:
+            self._heartbeats.track(job.job_id)
+        try:
+            await self._api.heartbeat_job(job.job_id, status="running")
+        except Exception:
+            await self._release_one(job)
+            raise
+        try:
+            result = await self._executor.execute(job)
+        finally:
+            if self._heartbeats is not None:
+                self._heartbeats.untrack(job.job_id)
+        result = _with_timings(result, timer.timings)
+        if self._finishing is not None:
+            # Report off the job's slot so the next job starts right away.
+            task = asyncio.create_task(self._finish_reporting_errors(result))
+            self._finishing.add(task)
+            task.add_done_callback(self._finishing.discard)
+        else:
+            await self._finish(result)
+        return result
+
+    async def _finish(self, result: JobExecutionResult) -> None:
+        if self._completions is not None:
+            await self._completions.submit(result)
+        else:
+            await self._api.complete_job(result)
+        for line in _log_lines(result, self._codec):
+            self._emit(line)
+
+    async def _finish_reporting_errors(self, result: JobExecutionResult) -> None:
+        try:
+            await self._finish(result)
+        except Exception as exc:
+            self._emit(_failure_line("completion_failed", [result.job_id], exc, self._codec))
+
+    async def poll_forever(self) -> None:
+        in_flight: dict[asyncio.Task[JobExecutionResult], Job] = {}
+        scheduler = self._scheduler
+        finishing: set[asyncio.Task[None]] = set()
+        if self._prefetch_depth:
+            self._finishing = finishing
+        self._stop_event = asyncio.Event()
+        if self._stopped:
+            self._stop_event.set()
+        stop_waiter = asyncio.create_task(self._stop_event.wait())
+        try:
+            while not self._stopped:
+                found_work = self._start_queued(in_flight) > 0
+                free_slots = self._workers - len(in_flight)
+                wanted = self._wanted(free_slots)
+                granted = self._reserve(len(in_flight) + scheduler.queued(), wanted)
+                if granted:
+                    jobs, claimed = await self._acquire(limit=granted, long_poll=not in_flight)
+                    if claimed:
+                        self._track(jobs)
+                        scheduler.offer(jobs)
+                        self._start_queued(in_flight)
+                        found_work = found_work or bool(jobs)
+                    else:
+                        for job in scheduler.select(jobs, min(free_slots, granted)):
+                            task = asyncio.create_task(self.execute_job(job, claimed=False))
+                            in_flight[task] = job
+                            found_work = True
+                if self._slots is not None:
+                    self._slots.settle(len(in_flight) + scheduler.queued())
+
+                timeout = None
+                capped = granted < wanted
+                if capped:
+                    timeout = self._poll_interval_seconds
+                elif len(in_flight) < self._workers or scheduler.queued() < self._prefetch_depth:
+                    timeout = self._backoff.next_delay(found_work=found_work)
+                if not in_flight:
+                    if capped or not self._api.long_poll_active:
+                        await self._sleep(timeout)
+                    continue
+
+                done, _ = await asyncio.wait(
+                    {*in_flight, stop_waiter}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if self._stopped:
+                    break
+                for task in done - {stop_waiter}:
+                    job = in_flight.pop(task)
+                    scheduler.finished(job)
+                    self._reap(task, job)
+
+            await self._release_queued()
+            await self._drain(in_flight)
+        finally:
+            stop_waiter.cancel()
+            self._stop_event = None
+            await self._release_queued()
+            if finishing:
+                await asyncio.wait(set(finishing))
+            self._finishing = None
+            if self._slots is not None:
+                self._slots.settle(0)
+
+    async def _drain(self, in_flight: dict[asyncio.Task[JobExecutionResult], Job]) -> None:
+        """Wait for the jobs in flight until the shutdown deadline, then cancel the rest."""
+        done: set[asyncio.Task[JobExecutionResult]] = set()
+        pending: set[asyncio.Task[JobExecutionResult]] = set()
+        if in_flight:
+            done, pending = await asyncio.wait(in_flight, timeout=self._grace_remaining())
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending)
+        summary = self.shutdown_summary
+        for task in pending:
+            job = in_flight[task]
+            if summary is not None:
+                summary.abandoned.append(job.job_id)
+            await self._release_one(job)
+        if summary is not None:
+            summary.drained.extend(in_flight[task].job_id for task in done)
+            summary.drain_seconds = time.monotonic() - self._stopped_at
+        for task in done:
+            self._reap(task, in_flight[task])
+
+    def _reap(self, task: asyncio.Task[JobExecutionResult], job: Job) -> None:
+        try:
+            task.result()
+        except Exception as exc:
+            self._emit(_failure_line("job_run_failed", [job.job_id], exc, self._codec))
+
+    def _grace_remaining(self) -> float | None:
+        if self._shutdown_grace_seconds is None:
+            return None
+        elapsed = time.monotonic() - self._stopped_at
+        return max(0.0, self._shutdown_grace_seconds - elapsed)
+
+    def _reserve(self, held: int, wanted: int) -> int:
+        if self._slots is None or not wanted:
+            return wanted
+        return self._slots.reserve(held, wanted)
+
+    async def _stopped_wait(self, seconds: float) -> None:
+        if self._stop_event is None:
+            await asyncio.sleep(seconds)
+            return
+        with suppress(TimeoutError):
+            await asyncio.wait_for(self._stop_event.wait(), seconds)
+
+    def _wanted(self, free_slots: int) -> int:
+        scheduler = self._scheduler
+        capacity = self._workers + self._prefetch_depth - scheduler.queued()
+        return max(0, min(free_slots + self._prefetch_depth - scheduler.runnable(), capacity))
+
+    def _start_queued(self, in_flight: dict[asyncio.Task[JobExecutionResult], Job]) -> int:
+        started = 0
+        while len(in_flight) < self._workers:
+            job = self._scheduler.next_job()
+            if job is None:
+                break
+            in_flight[asyncio.create_task(self.execute_job(job, claimed=True))] = job
+            started += 1
+        return started
+
+    def _track(self, jobs: list[Job]) -> None:
+        if self._heartbeats is not None:
+            for job in jobs:
+                self._heartbeats.track(job.job_id)
+
+    async def _release_queued(self) -> None:
+        for job in self._scheduler.drain():
+            if self.shutdown_summary is not None:
+                self.shutdown_summary.released.append(job.job_id)
+            await self._release_one(job)
+
+    async def _release_one(self, job: Job) -> None:
+        if self._heartbeats is not None:
+            self._heartbeats.untrack(job.job_id)
+        try:
+            await self._api.release_job(job.job_id)
+        except Exception as exc:
+            self._emit(_failure_line("release_failed", [job.job_id], exc, self._codec))
+
+    def _pick(self, jobs: list[Job], limit: int, *, claimed: bool) -> list[Job]:
+        return jobs if claimed else self._scheduler.select(jobs, limit, start=False)
+
+    async def _acquire(self, *, limit: int, long_poll: bool = True) -> tuple[list[Job], bool]:
+        jobs = await self._api.claim_next_jobs(limit=limit, long_poll=long_poll)
+        if jobs is not None:
+            return jobs, True
+        candidates = limit * self._lookahead
+        return await self._api.list_pending_jobs(limit=candidates, long_poll=long_poll), False
+
+
+def _with_timings(result: JobExecutionResult, timings: dict[str, float]) -> JobExecutionResult:
+    if not timings:
+        return result
+    return replace(result, timings={**timings, **result.timings})
+
+
+def _job_attributes(job: Job) -> dict[str, str]:
+    return {"runner.job.id": job.job_id, "runner.job.type": job.job_type}
+
+
+def _end_job_span(span: Span | None, result: JobExecutionResult) -> None:
+    if span is None:
+        return
+    span.set_attribute("runner.job.status", result.status)
+    if result.status == "failed":
+        span.status = "error"
+        span.status_message = result.error or ""
+
+
+def _log_lines(result: JobExecutionResult, codec: JsonCodec) -> list[str]:
+    return [codec.dumps_str(log.to_dict(), sort_keys=True) for log in result.logs]
+
+
+def _failure_line(event: str, job_ids: list[str], exc: Exception, codec: JsonCodec) -> str:
+    return codec.dumps_str(
+        {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "level": "error",
+            "event": event,
+            "job_ids": job_ids,
+            "message": str(exc),
+        },
+        sort_keys=True,
+    )
+
+
+def _summary_line(summary: ShutdownSummary, codec: JsonCodec) -> str:
+    if summary.abandoned:
+        level, message = "error", "Shutdown deadline passed; abandoned jobs were released"
+    else:
+        level, message = "info", "Stopped after draining in-flight jobs"
+    return codec.dumps_str(
+        {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "level": level,
+            "event": "runner_stopped",
+            "message": message,
+            **summary.to_dict(),
+        },
+        sort_keys=True,
+    )
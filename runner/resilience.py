@@ -0,0 +1,280 @@
+"""Retry pacing, retry budget and circuit breakers for backend requests."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import random
+import threading
+import time
+from types import TracebackType
+from typing import Literal
+
+from runner.config import RunnerSettings
+
+BreakerState = Literal["closed", "open", "half_open"]
+# How a breaker let a call through: as a normal call or as the half-open probe.
+Admission = Literal["call", "probe"]
+
+
+class CircuitBreaker:
+    """Fail fast on an endpoint after ``failure_threshold`` consecutive failures.
+
+    An open breaker rejects calls for ``reset_timeout_seconds``, then lets a
+    single probe through (half-open); the probe's outcome closes or re-opens it.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int,
+        reset_timeout_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be >= 1")
+        if reset_timeout_seconds <= 0:
+            raise ValueError("reset_timeout_seconds must be > 0")
+
+        self._failure_threshold = failure_threshold
+        self._reset_timeout_seconds = reset_timeout_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state: BreakerState = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> BreakerState:
+        with self._lock:
+            return self._current_state()
+
+    def allow(self) -> bool:
+        return self.admit() is not None
+
+    def admit(self) -> Admission | None:
+        """Let a call through, saying whether it is the probe, or return None."""
+        with self._lock:
+            state = self._current_state()
+            if state == "closed":
+                return "call"
+            if state == "half_open" and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return "probe"
+            return None
+
+    def abandon_probe(self) -> None:
+        """Free the probe slot of a probe that ended without an outcome, e.g. cancelled."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = "closed"
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._probe_in_flight or self._failures >= self._failure_threshold:
+                self._state = "open"
+                self._opened_at = self._clock()
+            self._probe_in_flight = False
+
+    def _current_state(self) -> BreakerState:
+        if self._state == "open" and self._clock() - self._opened_at >= self._reset_timeout_seconds:
+            self._state = "half_open"
+        return self._state
+
+
+class RetryBudget:
+    """Token bucket capping retries at ``ratio`` of first attempts.
+
+    Every first attempt deposits ``ratio`` tokens and every retry withdraws
+    one. The bucket starts with, and never holds more than, ``reserve``
+    tokens, so short bursts can retry while sustained retries stay bounded.
+    """
+
+    def __init__(self, *, ratio: float, reserve: int) -> None:
+        if ratio < 0:
+            raise ValueError("ratio must be >= 0")
+        if reserve < 0:
+            raise ValueError("reserve must be >= 0")
+
+        self._ratio = ratio
+        self._reserve = float(reserve)
+        self._tokens = float(reserve)
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._tokens = min(self._reserve, self._tokens + self._ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class RetryPolicy:
+    """Decide whether and when a failed request is retried.
+
+    Combines the per-client retry count with decorrelated-jitter backoff,
+    ``Retry-After`` hints, a shared :class:`RetryBudget` and one
+    :class:`CircuitBreaker` per endpoint.
+    """
+
+    def __init__(
+        self,
+        *,
+        retries: int,
+        backoff_base_seconds: float = 0.25,
+        backoff_max_seconds: float = 10.0,
+        breaker_failure_threshold: int = 5,
+        breaker_reset_seconds: float = 30.0,
+        budget: RetryBudget | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        jitter: Callable[[float, float], float] = random.uniform,
+    ) -> None:
+        self._retries = retries
+        self._backoff_base_seconds = backoff_base_seconds
+        self._backoff_max_seconds = backoff_max_seconds
+        self._breaker_failure_threshold = breaker_failure_threshold
+        self._breaker_reset_seconds = breaker_reset_seconds
+        self._budget = budget
+        self._clock = clock
+        self._jitter = jitter
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: RunnerSettings) -> "RetryPolicy":
+        budget = None
+        if settings.http_retry_budget_ratio > 0:
+            budget = RetryBudget(
+                ratio=settings.http_retry_budget_ratio,
+                reserve=settings.http_retry_budget_reserve,
+            )
+        return cls(
+            retries=settings.http_retries,
+            backoff_max_seconds=settings.http_backoff_max_seconds,
+            breaker_failure_threshold=settings.http_breaker_failure_threshold,
+            breaker_reset_seconds=settings.http_breaker_reset_seconds,
+            budget=budget,
+        )
+
+    def breaker(self, endpoint: str) -> CircuitBreaker | None:
+        if self._breaker_failure_threshold <= 0:
+            return None
+        with self._lock:
+            breaker = self._breakers.get(endpoint)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    failure_threshold=self._breaker_failure_threshold,
+                    reset_timeout_seconds=self._breaker_reset_seconds,
+                    clock=self._clock,
+                )
+                self._breakers[endpoint] = breaker
+            return breaker
+
+    def begin(self, endpoint: str) -> "RetryAttempts | None":
+        """Start a request, or return None when the endpoint's breaker is open."""
+        breaker = self.breaker(endpoint)
+        admission = breaker.admit() if breaker is not None else "call"
+        if admission is None:
+            return None
+        if self._budget is not None:
+            self._budget.deposit()
+        return RetryAttempts(
+            retries=self._retries,
+            first_delay=self._backoff_base_seconds,
+            max_delay=self._backoff_max_seconds,
+            next_delay=self._next_delay,
+            breaker=breaker,
+            budget=self._budget,
+            probe=admission == "probe",
+        )
+
+    def _next_delay(self, previous: float) -> float:
+        # Decorrelated jitter: spreads retries of many clients instead of
+        # having them fire at the same exponential steps.
+        upper = max(self._backoff_base_seconds, previous * 3)
+        return min(self._backoff_max_seconds, self._jitter(self._backoff_base_seconds, upper))
+
+
+class RetryAttempts:
+    """Retry bookkeeping for one logical request.
+
+    The circuit breaker sees one outcome per request, not per attempt: its
+    success, or its failure once no retry is left. A half-open probe gets a
+    single attempt. Use it as a context manager so a request that ends
+    without an outcome, e.g. when cancelled, frees the probe slot it holds.
+    """
+
+    def __init__(
+        self,
+        *,
+        retries: int,
+        first_delay: float,
+        max_delay: float,
+        next_delay: Callable[[float], float],
+        breaker: CircuitBreaker | None,
+        budget: RetryBudget | None,
+        probe: bool = False,
+    ) -> None:
+        self._retries_left = retries
+        self._delay = first_delay
+        self._max_delay = max_delay
+        self._next_delay = next_delay
+        self._breaker = breaker
+        self._budget = budget
+        self._probe = probe
+        self._settled = False
+
+    def __enter__(self) -> "RetryAttempts":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if self._probe and not self._settled and self._breaker is not None:
+            self._breaker.abandon_probe()
+
+    def succeeded(self) -> None:
+        if self._breaker is not None and not self._settled:
+            self._breaker.record_success()
+        self._settled = True
+
+    def failed(self, *, retry_after: float | None = None) -> float | None:
+        """Record a failed attempt; return the delay before retrying, or None to give up."""
+        delay = self._retry_delay(retry_after)
+        if delay is None and not self._settled:
+            if self._breaker is not None:
+                self._breaker.record_failure()
+            self._settled = True
+        return delay
+
+    def _retry_delay(self, retry_after: float | None) -> float | None:
+        if self._probe:
+            return None
+        if self._breaker is not None and self._breaker.state == "open":
+            # Other requests tripped the breaker meanwhile; stop hammering it.
+            return None
+        if self._retries_left <= 0:
+            return None
+        if retry_after is not None and retry_after > self._max_delay:
+            return None
+        if self._budget is not None and not self._budget.withdraw():
+            return None
+
+        self._retries_left -= 1
+        self._delay = self._next_delay(self._delay)
+        if retry_after is not None:
+            return max(self._delay, retry_after)
+        return self._delay
@@ -0,0 +1,142 @@
+"""Lane scheduler: per-lane concurrency caps, priority classes and fair queuing."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+import heapq
+import itertools
+
+from runner.config import RunnerSettings
+from runner.types import PRIORITY_CLASSES, ExecutionMode, Job
+
+# Lower rank runs first.
+_PRIORITY_RANK = {name: rank for rank, name in enumerate(PRIORITY_CLASSES)}
+
+
+def job_lane(job: Job, default_execution_mode: ExecutionMode = "api") -> str:
+    """Return ``<job_type>:<execution mode>``, the key lane limits are configured by.
+
+    An ``api`` payload follows ``RUNNER_EXECUTION_MODE``, as execution does;
+    payloads without an execution mode count as ``api``.
+    """
+    mode = getattr(job.payload, "execution_mode", "api")
+    if mode == "api":
+        mode = default_execution_mode
+    return f"{job.job_type}:{mode}"
+
+
+class LaneScheduler:
+    """Order jobs by priority class and share slots fairly between lanes.
+
+    Jobs run highest priority class first. Within a class, lanes take turns
+    (round-robin), so a lane of slow jobs cannot starve a lane of fast ones,
+    and each lane keeps its jobs in arrival order. A lane listed in
+    ``limits`` never has more than that many jobs running; other lanes are
+    bounded only by the poller's workers.
+
+    Not thread-safe: only the polling loop calls it.
+    """
+
+    def __init__(
+        self,
+        limits: Mapping[str, int] | None = None,
+        *,
+        default_execution_mode: ExecutionMode = "api",
+    ) -> None:
+        limits = dict(limits or {})
+        for lane, limit in limits.items():
+            if limit < 1:
+                raise ValueError(f"Lane limit for {lane} must be >= 1")
+        self._limits = limits
+        self._default_execution_mode = default_execution_mode
+        self._queues: dict[str, list[tuple[int, int, Job]]] = {}
+        self._running: dict[str, int] = {}
+        # Lanes in turn order; the lane that last started a job moves to the back.
+        self._turns: list[str] = []
+        self._sequence = itertools.count()
+
+    @classmethod
+    def from_settings(cls, settings: RunnerSettings) -> "LaneScheduler":
+        return cls(settings.lane_limits, default_execution_mode=settings.execution_mode)
+
+    def lane(self, job: Job) -> str:
+        return job_lane(job, self._default_execution_mode)
+
+    def queued(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def runnable(self) -> int:
+        """Number of queued jobs that could start now, lane limits permitting."""
+        total = 0
+        for lane, queue in self._queues.items():
+            limit = self._limits.get(lane)
+            room = len(queue) if limit is None else max(0, limit - self.running(lane))
+            total += min(len(queue), room)
+        return total
+
+    def running(self, lane: str) -> int:
+        return self._running.get(lane, 0)
+
+    def offer(self, jobs: Iterable[Job]) -> None:
+        """Queue jobs until :meth:`next_job` starts them."""
+        for job in jobs:
+            lane = self.lane(job)
+            if lane not in self._turns:
+                self._turns.append(lane)
+            rank = _PRIORITY_RANK[job.priority]
+            heapq.heappush(self._queues.setdefault(lane, []), (rank, next(self._sequence), job))
+
+    def next_job(self) -> Job | None:
+        """Start and return the next queued job whose lane has room, if any."""
+        best_lane: str | None = None
+        best_rank = len(PRIORITY_CLASSES)
+        for lane in self._turns:
+            queue = self._queues.get(lane)
+            if queue and queue[0][0] < best_rank and self._has_room(lane):
+                best_lane, best_rank = lane, queue[0][0]
+        if best_lane is None:
+            return None
+
+        _, _, job = heapq.heappop(self._queues[best_lane])
+        self._turns.remove(best_lane)
+        self._turns.append(best_lane)
+        self._running[best_lane] = self.running(best_lane) + 1
+        return job
+
+    def select(self, candidates: Iterable[Job], limit: int, *, start: bool = True) -> list[Job]:
+        """Pick up to ``limit`` of ``candidates`` and leave the others unqueued.
+
+        Used for listed jobs that are not claimed yet: the ones not picked
+        stay in the backend queue for the next poll. With ``start=False`` the
+        picked jobs are not counted as running, for one-off batches.
+        """
+        queued = self._queues
+        running = dict(self._running)
+        self._queues = {}
+        try:
+            self.offer(candidates)
+            picked: list[Job] = []
+            while len(picked) < limit:
+                job = self.next_job()
+                if job is None:
+                    break
+                picked.append(job)
+            return picked
+        finally:
+            self._queues = queued
+            if not start:
+                self._running = running
+
+    def finished(self, job: Job) -> None:
+        lane = self.lane(job)
+        self._running[lane] = max(0, self.running(lane) - 1)
+
+    def drain(self) -> list[Job]:
+        """Remove and return every queued job, highest priority first."""
+        entries = sorted(entry for queue in self._queues.values() for entry in queue)
+        self._queues.clear()
+        return [job for _, _, job in entries]
+
+    def _has_room(self, lane: str) -> bool:
+        limit = self._limits.get(lane)
+        return limit is None or self.running(lane) < limit
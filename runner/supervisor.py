@@ -0,0 +1,304 @@
+"""Supervisor keeping several poller processes running on one host."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import json
+import multiprocessing
+from multiprocessing.context import BaseContext
+from multiprocessing.process import BaseProcess
+import os
+import queue
+import threading
+import time
+from typing import Any
+
+from runner.metrics import PROCESS_RESTARTS, REGISTRY, MergedMetrics, MetricSnapshot
+
+# Entry point run in each child: (process index, its share of the cap, metrics queue).
+ChildTarget = Callable[[int, "ProcessJobSlots | None", Any], None]
+
+# How often the supervisor checks its children and reads metric snapshots.
+_TICK_SECONDS = 0.2
+
+
+class SharedJobSlots:
+    """Cap on the jobs held, running or prefetched, by all supervised processes.
+
+    Each process records how many jobs it holds in its own cell of a shared
+    array, so the supervisor can zero the cell of a process that crashed
+    instead of leaking its share of the cap.
+    """
+
+    def __init__(self, limit: int, processes: int, context: BaseContext) -> None:
+        if limit < 1:
+            raise ValueError("limit must be >= 1")
+        self._limit = limit
+        self._held = context.Array("i", processes)
+
+    def for_process(self, index: int) -> ProcessJobSlots:
+        return ProcessJobSlots(self._limit, self._held, index)
+
+    def reset(self, index: int) -> None:
+        with self._held.get_lock():
+            self._held[index] = 0
+
+    def held(self) -> int:
+        with self._held.get_lock():
+            return sum(self._held)
+
+
+class ProcessJobSlots:
+    """One process's view of :class:`SharedJobSlots`, passed to its poller."""
+
+    def __init__(self, limit: int, held: Any, index: int) -> None:
+        self._limit = limit
+        self._held = held
+        self._index = index
+
+    def reserve(self, held: int, wanted: int) -> int:
+        with self._held.get_lock():
+            others = sum(self._held) - self._held[self._index]
+            granted = max(0, min(wanted, self._limit - others - held))
+            self._held[self._index] = held + granted
+        return granted
+
+    def settle(self, held: int) -> None:
+        with self._held.get_lock():
+            self._held[self._index] = held
+
+
+@contextmanager
+def push_metrics(
+    metrics_queue: Any, index: int, *, interval_seconds: float = 1.0
+) -> Iterator[None]:
+    """Send this process's metric snapshot to the supervisor while the block runs.
+
+    A last snapshot is sent when the block exits, so a clean shutdown loses
+    nothing; a crash loses at most ``interval_seconds`` of observations.
+    """
+    stopped = threading.Event()
+    source = (index, os.getpid())
+
+    def push() -> None:
+        metrics_queue.put((source, REGISTRY.snapshot()))
+
+    def loop() -> None:
+        while not stopped.wait(interval_seconds):
+            push()
+
+    thread = threading.Thread(target=loop, name="runner-metrics-push", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stopped.set()
+        thread.join()
+        push()
+        # Flush the queue now; the process may leave through os._exit.
+        metrics_queue.close()
+        metrics_queue.join_thread()
+
+
+@dataclass
+class _Child:
+    index: int
+    process: BaseProcess | None = None
+    started_at: float = 0.0
+    restart_at: float | None = None
+    restart_delay: float = 0.0
+
+
+class Supervisor:
+    """Run ``target`` in ``processes`` child processes and restart the ones that exit.
+
+    A child exiting before :meth:`stop` is restarted after an exponential
+    backoff, reset once a child stays up for ``stable_after_seconds``.
+    ``stop`` sends ``SIGTERM`` to every child so each drains its own jobs, and
+    kills those still running ``kill_after_seconds`` later.
+    """
+
+    def __init__(
+        self,
+        target: ChildTarget,
+        *,
+        processes: int,
+        max_in_flight: int | None = None,
+        restart_backoff_seconds: float = 1.0,
+        max_restart_backoff_seconds: float = 60.0,
+        stable_after_seconds: float = 60.0,
+        kill_after_seconds: float | None = None,
+        metrics: MergedMetrics | None = None,
+        emit: Callable[[str], None] = print,
+        context: BaseContext | None = None,
+    ) -> None:
+        if processes < 1:
+            raise ValueError("processes must be >= 1")
+        if restart_backoff_seconds <= 0:
+            raise ValueError("restart_backoff_seconds must be > 0")
+        if max_restart_backoff_seconds < restart_backoff_seconds:
+            raise ValueError("max_restart_backoff_seconds must be >= restart_backoff_seconds")
+
+        self._target = target
+        self._context = context or multiprocessing.get_context("spawn")
+        self._slots = (
+            SharedJobSlots(max_in_flight, processes, self._context)
+            if max_in_flight is not None
+            else None
+        )
+        self._restart_backoff_seconds = restart_backoff_seconds
+        self._max_restart_backoff_seconds = max_restart_backoff_seconds
+        self._stable_after_seconds = stable_after_seconds
+        self._kill_after_seconds = kill_after_seconds
+        self._metrics = metrics
+        self._emit = emit
+        self._metrics_queue = self._context.Queue()
+        self._children = [_Child(index) for index in range(processes)]
+        self._stopped = threading.Event()
+        self._stopped_at = 0.0
+        self._stop_reason = "stop"
+        self._failed_on_stop = False
+
+    def stop(self, reason: str = "stop") -> None:
+        """Stop restarting children and ask the running ones to drain; signal-safe."""
+        if not self._stopped.is_set():
+            self._stopped_at = time.monotonic()
+            self._stop_reason = reason
+            self._stopped.set()
+
+    def run(self) -> int:
+        """Supervise until stopped and every child has exited.
+
+        Returns ``1`` when a child failed during shutdown, e.g. because it
+        abandoned jobs at its deadline, and ``0`` otherwise.
+        """
+        for child in self._children:
+            self._start(child)
+        terminated = False
+        try:
+            while any(
+                child.process is not None or child.restart_at is not None
+                for child in self._children
+            ):
+                self._read_metrics(timeout=_TICK_SECONDS)
+                now = time.monotonic()
+                for child in self._children:
+                    self._check(child, now)
+                if self._stopped.is_set():
+                    if not terminated:
+                        self._emit_event(
+                            "supervisor_stopping",
+                            "info",
+                            "Asking poller processes to drain",
+                            reason=self._stop_reason,
+                        )
+                        self._signal_children("terminate")
+                        terminated = True
+                    if (
+                        self._kill_after_seconds is not None
+                        and now - self._stopped_at > self._kill_after_seconds
+                    ):
+                        self._signal_children("kill")
+        finally:
+            self._signal_children("kill")
+            self._read_metrics(timeout=0)
+        return 1 if self._failed_on_stop else 0
+
+    def _check(self, child: _Child, now: float) -> None:
+        process = child.process
+        if process is None:
+            if self._stopped.is_set():
+                child.restart_at = None
+            elif child.restart_at is not None and now >= child.restart_at:
+                PROCESS_RESTARTS.inc()
+                self._start(child)
+            return
+        if process.is_alive():
+            return
+
+        process.join()
+        # Take its final snapshot before folding the process into the totals.
+        self._read_metrics(timeout=0)
+        if self._metrics is not None:
+            self._metrics.retire((child.index, process.pid))
+        if self._slots is not None:
+            self._slots.reset(child.index)
+        child.process = None
+        exitcode = process.exitcode
+        restart_in: float | None = None
+        if self._stopped.is_set():
+            self._failed_on_stop = self._failed_on_stop or exitcode != 0
+        else:
+            if now - child.started_at >= self._stable_after_seconds:
+                child.restart_delay = 0.0
+            child.restart_delay = min(
+                self._max_restart_backoff_seconds,
+                child.restart_delay * 2 or self._restart_backoff_seconds,
+            )
+            restart_in = child.restart_delay
+            child.restart_at = now + restart_in
+        self._emit_event(
+            "process_exited",
+            "error" if exitcode != 0 or restart_in is not None else "info",
+            "Poller process exited",
+            index=child.index,
+            pid=process.pid,
+            exitcode=exitcode,
+            restart_in_seconds=restart_in,
+        )
+
+    def _start(self, child: _Child) -> None:
+        slots = self._slots.for_process(child.index) if self._slots is not None else None
+        process = self._context.Process(
+            target=self._target,
+            args=(child.index, slots, self._metrics_queue),
+            name=f"runner-poller-{child.index}",
+        )
+        process.start()
+        child.process = process
+        child.started_at = time.monotonic()
+        child.restart_at = None
+        self._emit_event(
+            "process_started",
+            "info",
+            "Poller process started",
+            index=child.index,
+            pid=process.pid,
+        )
+
+    def _signal_children(self, action: str) -> None:
+        for child in self._children:
+            process = child.process
+            if process is not None and process.is_alive():
+                getattr(process, action)()
+
+    def _read_metrics(self, *, timeout: float) -> None:
+        try:
+            item = self._metrics_queue.get(timeout=timeout) if timeout else None
+            while True:
+                if item is not None:
+                    self._store_snapshot(*item)
+                item = self._metrics_queue.get_nowait()
+        except queue.Empty:
+            return
+
+    def _store_snapshot(self, source: tuple[int, int], snapshots: list[MetricSnapshot]) -> None:
+        if self._metrics is not None:
+            self._metrics.update(source, snapshots)
+
+    def _emit_event(self, event: str, level: str, message: str, **fields: Any) -> None:
+        self._emit(
+            json.dumps(
+                {
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "level": level,
+                    "event": event,
+                    "message": message,
+                    **fields,
+                },
+                sort_keys=True,
+            )
+        )
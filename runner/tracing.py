@@ -0,0 +1,163 @@
+"""OpenTelemetry-compatible spans with W3C trace context propagation."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+import json
+from pathlib import Path
+import secrets
+import threading
+import time
+from typing import Any, Literal, Protocol
+
+SpanKind = Literal["internal", "client"]
+
+# OTLP enum values for SpanKind and StatusCode.
+_OTLP_KINDS = {"internal": 1, "client": 3}
+_OTLP_STATUS = {"unset": 0, "ok": 1, "error": 2}
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_span_id: str | None
+    kind: SpanKind = "internal"
+    start_time_unix_nano: int = 0
+    end_time_unix_nano: int = 0
+    attributes: dict[str, Any] = field(default_factory=dict)
+    status: Literal["unset", "ok", "error"] = "unset"
+    status_message: str = ""
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def to_otlp(self) -> dict[str, Any]:
+        span: dict[str, Any] = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": _OTLP_KINDS[self.kind],
+            "startTimeUnixNano": str(self.start_time_unix_nano),
+            "endTimeUnixNano": str(self.end_time_unix_nano),
+            "attributes": [_otlp_attribute(key, value) for key, value in self.attributes.items()],
+            "status": {"code": _OTLP_STATUS[self.status]},
+        }
+        if self.parent_span_id is not None:
+            span["parentSpanId"] = self.parent_span_id
+        if self.status_message:
+            span["status"]["message"] = self.status_message
+        return span
+
+
+class SpanExporter(Protocol):
+    def export(self, span: Span) -> None: ...
+
+
+class JsonLinesSpanExporter:
+    """Append each finished span to ``path`` as one OTLP/JSON ``resourceSpans`` line.
+
+    The format is what the OpenTelemetry Collector's ``otlpjsonfile`` receiver
+    reads, so the file can be replayed into any OTLP backend.
+    """
+
+    def __init__(self, path: str | Path, *, service_name: str = "styleagent-runner") -> None:
+        self._path = Path(path).expanduser()
+        self._resource = {
+            "attributes": [_otlp_attribute("service.name", service_name)],
+        }
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(
+            {
+                "resourceSpans": [
+                    {
+                        "resource": self._resource,
+                        "scopeSpans": [
+                            {"scope": {"name": "runner"}, "spans": [span.to_otlp()]}
+                        ],
+                    }
+                ]
+            },
+            sort_keys=True,
+        )
+        with self._lock, self._path.open("a", encoding="utf-8") as handle:
+            handle.write(line + "\n")
+
+
+_exporter: SpanExporter | None = None
+_current_span: ContextVar[Span | None] = ContextVar("runner_current_span", default=None)
+
+
+def configure_tracing(exporter: SpanExporter | None) -> None:
+    """Install the process-wide exporter; ``None`` turns tracing off."""
+    global _exporter
+    _exporter = exporter
+
+
+def current_span() -> Span | None:
+    return _current_span.get()
+
+
+@contextmanager
+def start_span(
+    name: str, *, kind: SpanKind = "internal", attributes: dict[str, Any] | None = None
+) -> Iterator[Span | None]:
+    """Run the block in a child of the current span, or a new trace at the top level.
+
+    Yields ``None`` and records nothing while tracing is off. A span whose
+    block raises is marked as an error before it is exported.
+    """
+    exporter = _exporter
+    if exporter is None:
+        yield None
+        return
+
+    parent = _current_span.get()
+    span = Span(
+        name=name,
+        trace_id=parent.trace_id if parent is not None else secrets.token_hex(16),
+        span_id=secrets.token_hex(8),
+        parent_span_id=parent.span_id if parent is not None else None,
+        kind=kind,
+        start_time_unix_nano=time.time_ns(),
+        attributes=dict(attributes or {}),
+    )
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as exc:
+        span.status = "error"
+        span.status_message = str(exc) or type(exc).__name__
+        raise
+    finally:
+        _current_span.reset(token)
+        span.end_time_unix_nano = time.time_ns()
+        exporter.export(span)
+
+
+def inject_traceparent(headers: dict[str, str] | None) -> dict[str, str] | None:
+    """Return ``headers`` plus the W3C ``traceparent`` of the current span, if any."""
+    span = _current_span.get()
+    if span is None:
+        return headers
+    return {**(headers or {}), "traceparent": span.traceparent}
+
+
+def _otlp_attribute(key: str, value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
@@ -6,10 +6,17 @@ from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any, Literal
 
-JobType = Literal["compile_captureone"]
+from runner.handlers import handler_for
+
+# Any job type with a handler in runner.handlers.
+JobType = str
 JobStatus = Literal["picked_up", "running", "succeeded", "failed"]
 LogLevel = Literal["info", "error"]
 ExecutionMode = Literal["api", "host"]
+Priority = Literal["high", "normal", "low"]
+
+# Scheduling order of the payload ``priority`` classes, highest first.
+PRIORITY_CLASSES: tuple[Priority, ...] = ("high", "normal", "low")
 
 _ALLOWED_TRANSITIONS: dict[JobStatus, set[JobStatus]] = {
     "picked_up": {"running"},
@@ -30,8 +37,11 @@ class CompileCaptureOnePayload:
 class Job:
     job_id: str
     job_type: JobType
-    payload: CompileCaptureOnePayload
+    # Parsed by the job type's handler, e.g. CompileCaptureOnePayload.
+    payload: Any
     status: JobStatus = "picked_up"
+    created_at: datetime | None = None
+    priority: Priority = "normal"
 
 
 @dataclass(frozen=True)
@@ -84,6 +94,16 @@ class JobExecutionResult:
     result: dict[str, Any] | None
     error: str | None
     logs: list[JobLog]
+    timings: dict[str, float] = field(default_factory=dict)
+
+
+class JobExecutionError(RuntimeError):
+    """Job failure with a stable ``code`` and an optional result sent to the backend."""
+
+    code = ""
+
+    def to_result(self) -> dict[str, Any] | None:
+        return None
 
 
 def transition_status(current: JobStatus, target: JobStatus) -> JobStatus:
@@ -94,37 +114,59 @@ def transition_status(current: JobStatus, target: JobStatus) -> JobStatus:
 
 
 def job_from_dict(data: dict[str, Any]) -> Job:
-    job_id = data.get("job_id")
-    job_type = data.get("job_type")
-    payload_raw = data.get("payload")
+    return job_from_fields(
+        job_id=data.get("job_id"),
+        job_type=data.get("job_type"),
+        payload=data.get("payload"),
+        status=data.get("status"),
+        created_at=data.get("created_at"),
+    )
+
 
+def job_from_fields(
+    *,
+    job_id: Any,
+    job_type: Any,
+    payload: Any,
+    status: Any = None,
+    created_at: Any = None,
+) -> Job:
+    """Validate already-decoded job fields, as :func:`job_from_dict` does for a dict."""
     if not isinstance(job_id, str) or not job_id:
         raise ValueError("Invalid job payload: missing job_id")
-    if job_type != "compile_captureone":
+    if not isinstance(job_type, str):
         raise ValueError(f"Unsupported job type: {job_type}")
-    if not isinstance(payload_raw, dict):
+    handler = handler_for(job_type)
+    if not isinstance(payload, dict):
         raise ValueError("Invalid job payload: missing payload object")
+    # Priority only orders scheduling: an unknown class must not fail the
+    # listing or claim batch the job arrived in, so it runs as normal.
+    priority = payload.get("priority", "normal")
+    if priority not in PRIORITY_CLASSES:
+        priority = "normal"
 
-    style_id = payload_raw.get("style_id")
-    version = payload_raw.get("version")
-    if not isinstance(style_id, str) or not isinstance(version, str):
-        raise ValueError("Invalid compile_captureone payload")
-    execution_mode_raw = payload_raw.get("execution_mode", "api")
-    if execution_mode_raw not in {"api", "host"}:
-        raise ValueError("Invalid compile_captureone payload")
-
-    status_raw = data.get("status")
-    status: JobStatus = "picked_up"
-    if status_raw in {"picked_up", "running", "succeeded", "failed"}:
-        status = status_raw
+    job_status: JobStatus = "picked_up"
+    if status in {"picked_up", "running", "succeeded", "failed"}:
+        job_status = status
 
     return Job(
         job_id=job_id,
-        job_type="compile_captureone",
-        payload=CompileCaptureOnePayload(
-            style_id=style_id,
-            version=version,
-            execution_mode=execution_mode_raw,
-        ),
-        status=status,
+        job_type=job_type,
+        payload=handler.parse_payload(payload),
+        status=job_status,
+        created_at=_parse_timestamp(created_at),
+        priority=priority,
     )
+
+
+def _parse_timestamp(value: Any) -> datetime | None:
+    """Parse an ISO 8601 backend timestamp; naive values are taken as UTC."""
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
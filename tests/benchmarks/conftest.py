@@ -0,0 +1,97 @@
+"""Opt-in microbenchmarks compared against stored per-call baselines.
+
+Run with ``RUNNER_BENCH=1``. A benchmark fails when its best per-call time
+exceeds the stored baseline by more than ``RUNNER_BENCH_THRESHOLD`` (a
+ratio, default 1.5). ``RUNNER_BENCH_UPDATE=1`` rewrites the baselines from
+the current run instead of comparing.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+import json
+import os
+from pathlib import Path
+import time
+from typing import Any
+
+import pytest
+
+BASELINES_PATH = Path(__file__).with_name("baselines.json")
+_MIN_RUN_SECONDS = 0.05
+_REPEATS = 7
+_RESULTS: dict[str, float] = {}
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    if os.getenv("RUNNER_BENCH") == "1":
+        return
+    skip = pytest.mark.skip(reason="Set RUNNER_BENCH=1 to run microbenchmarks")
+    for item in items:
+        if BASELINES_PATH.parent in Path(str(item.fspath)).parents:
+            item.add_marker(skip)
+
+
+def pytest_terminal_summary(terminalreporter: Any) -> None:
+    if not _RESULTS:
+        return
+    terminalreporter.section("microbenchmarks (best per call)")
+    for name, seconds in sorted(_RESULTS.items()):
+        terminalreporter.write_line(f"{name:<40} {seconds * 1e6:>10.2f}us")
+
+
+class PerfRecorder:
+    def __init__(self, baselines: dict[str, float], threshold: float, update: bool) -> None:
+        self.baselines = baselines
+        self.threshold = threshold
+        self.update = update
+        self.results: dict[str, float] = {}
+
+    def __call__(self, name: str, func: Callable[[], Any]) -> float:
+        """Return the best per-call seconds of ``func`` and check it against the baseline."""
+        number = _calibrate(func)
+        best = min(_timed(func, number) for _ in range(_REPEATS)) / number
+        self.results[name] = best
+
+        baseline = self.baselines.get(name)
+        if not self.update and baseline is not None and best > baseline * self.threshold:
+            pytest.fail(
+                f"{name}: {best * 1e6:.2f}us per call is more than {self.threshold}x "
+                f"the {baseline * 1e6:.2f}us baseline"
+            )
+        return best
+
+
+@pytest.fixture(scope="session")
+def _perf_session() -> Iterator[PerfRecorder]:
+    baselines = json.loads(BASELINES_PATH.read_text(encoding="utf-8"))
+    recorder = PerfRecorder(
+        baselines,
+        threshold=float(os.getenv("RUNNER_BENCH_THRESHOLD", "1.5")),
+        update=os.getenv("RUNNER_BENCH_UPDATE") == "1",
+    )
+    yield recorder
+    _RESULTS.update(recorder.results)
+    if recorder.update and recorder.results:
+        merged = {**baselines, **recorder.results}
+        rounded = {name: float(f"{seconds:.3g}") for name, seconds in sorted(merged.items())}
+        BASELINES_PATH.write_text(json.dumps(rounded, indent=2) + "\n", encoding="utf-8")
+
+
+@pytest.fixture
+def perf(_perf_session: PerfRecorder) -> PerfRecorder:
+    return _perf_session
+
+
+def _calibrate(func: Callable[[], Any]) -> int:
+    number = 1
+    while _timed(func, number) < _MIN_RUN_SECONDS:
+        number *= 2
+    return number
+
+
+def _timed(func: Callable[[], Any], number: int) -> float:
+    started = time.perf_counter()
+    for _ in range(number):
+        func()
+    return time.perf_counter() - started
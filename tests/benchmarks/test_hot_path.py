@@ -0,0 +1,82 @@
+import json
+
+import httpx
+import pytest
+
+from runner.codec import json_codec
+from runner.config import RunnerSettings
+from runner.http import RunnerHttpClient
+from runner.types import JobLog, job_from_dict, transition_status
+
+_JOB = {
+    "job_id": "job_1",
+    "job_type": "compile_captureone",
+    "payload": {"style_id": "style_1", "version": "v3", "execution_mode": "host"},
+    "status": "pending",
+    "created_at": "2026-01-02T03:04:05Z",
+}
+
+
+def _log() -> JobLog:
+    return JobLog.create(
+        level="info",
+        event="job_succeeded",
+        job_id="job_1",
+        status="succeeded",
+        message="Job execution completed",
+        context={"result": {"artifact_id": "artifact_1", "download_url": "/artifacts/artifact_1"}},
+    )
+
+
+def test_job_from_dict(perf) -> None:
+    perf("job_from_dict", lambda: job_from_dict(_JOB))
+
+
+def test_transition_status(perf) -> None:
+    perf("transition_status", lambda: transition_status("running", "succeeded"))
+
+
+def test_job_log_create(perf) -> None:
+    perf("JobLog.create", _log)
+
+
+def test_job_log_to_dict(perf) -> None:
+    log = _log()
+    perf("JobLog.to_dict", log.to_dict)
+
+
+def test_job_log_line(perf) -> None:
+    # What the poller prints for every log entry of every job, with the codec it
+    # picks; keyed by backend since that depends on what is installed.
+    codec = json_codec()
+    log = _log()
+    perf(
+        f"json_codec().dumps_str(JobLog.to_dict)[{codec.name}]",
+        lambda: codec.dumps_str(log.to_dict(), sort_keys=True),
+    )
+
+
+def test_request_json_mock_transport(perf) -> None:
+    body = json.dumps({"items": [_JOB] * 5}).encode("utf-8")
+
+    def handler(_: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=body, headers={"Content-Type": "application/json"})
+
+    settings = RunnerSettings(http_retries=0)
+    with RunnerHttpClient(settings, transport=httpx.MockTransport(handler)) as client:
+        perf(
+            "RunnerHttpClient.request_json",
+            lambda: client.request_json("GET", "/runner/jobs", endpoint="list-pending"),
+        )
+
+
+@pytest.mark.parametrize("name", ["stdlib", "orjson", "msgspec"])
+def test_codec_log_line_and_job_listing(perf, name: str) -> None:
+    if name != "stdlib":
+        pytest.importorskip(name)
+    codec = json_codec(name)
+    log = _log()
+    listing = json.dumps({"items": [_JOB] * 5}).encode("utf-8")
+
+    perf(f"codec[{name}].log_line", lambda: codec.dumps_str(log.to_dict(), sort_keys=True))
+    perf(f"codec[{name}].decode_job_listing", lambda: codec.decode_job_listing(listing))
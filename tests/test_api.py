@@ -1,9 +1,12 @@
+import asyncio
 import httpx
 import json
 
-from runner.api import RunnerBackendApi
+import pytest
+
+from runner.api import AsyncRunnerBackendApi, RunnerBackendApi
 from runner.config import RunnerSettings
-from runner.http import RunnerHttpClient
+from runner.http import AsyncRunnerHttpClient, RunnerHttpClient
 from runner.types import JobExecutionResult, JobLog
 
 
@@ -87,12 +90,14 @@ def test_api_complete_job_posts_result_payload() -> None:
                         message="done",
                     )
                 ],
+                timings={"compile": 0.12345678},
             )
         )
 
     assert seen_payload["status"] == "succeeded"
     assert seen_payload["result"] == {"artifact_id": "artifact_1"}
     assert isinstance(seen_payload["logs"], list)
+    assert seen_payload["timings"] == {"compile": 0.123457}
 
 
 def test_api_job_calls_include_trace_headers() -> None:
@@ -149,3 +154,287 @@ def test_api_job_calls_include_trace_headers() -> None:
     assert isinstance(complete_req_id, str)
     assert complete_req_id.startswith("runner-complete-job_42-")
     assert complete_job_header == "job_42"
+
+
+def test_async_api_lists_claims_and_completes_jobs() -> None:
+    seen: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(f"{request.method} {request.url.path}")
+        if request.method == "GET" and request.url.path == "/runner/jobs":
+            return httpx.Response(
+                200,
+                json=[
+                    {
+                        "job_id": "job_7",
+                        "job_type": "compile_captureone",
+                        "payload": {"style_id": "style_7", "version": "v7"},
+                    }
+                ],
+            )
+        return httpx.Response(200, json={})
+
+    async def run() -> list[str]:
+        settings = RunnerSettings(api_base_url="http://localhost:8000")
+        transport = httpx.MockTransport(handler)
+        async with AsyncRunnerHttpClient(settings, transport=transport) as client:
+            api = AsyncRunnerBackendApi(client)
+            jobs = await api.list_pending_jobs(limit=1)
+            await api.claim_job(jobs[0].job_id)
+            await api.heartbeat_job(jobs[0].job_id, status="running")
+            await api.complete_job(
+                JobExecutionResult(
+                    job_id=jobs[0].job_id,
+                    status="succeeded",
+                    result={},
+                    error=None,
+                    logs=[],
+                )
+            )
+            return [job.job_id for job in jobs]
+
+    assert asyncio.run(run()) == ["job_7"]
+    assert seen == [
+        "GET /runner/jobs",
+        "POST /runner/jobs/job_7/claim",
+        "POST /runner/jobs/job_7/heartbeat",
+        "POST /runner/jobs/job_7/complete",
+    ]
+
+
+def test_api_long_poll_sends_wait_and_extends_timeout() -> None:
+    seen: list[tuple[str | None, object]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append((request.url.params.get("wait"), request.extensions["timeout"]["read"]))
+        return httpx.Response(200, json={"items": [], "wait": 20})
+
+    transport = httpx.MockTransport(handler)
+    settings = RunnerSettings(api_base_url="http://localhost:8000", http_timeout_seconds=10.0)
+    with RunnerHttpClient(settings, transport=transport, sleep=lambda _: None) as client:
+        api = RunnerBackendApi(client, long_poll_seconds=20.0)
+        assert api.list_pending_jobs() == []
+        assert api.list_pending_jobs() == []
+        assert api.long_poll_active is True
+
+    assert seen == [("20.0", 30.0), ("20.0", 30.0)]
+
+
+@pytest.mark.parametrize("status_code", [400, 422])
+def test_api_long_poll_falls_back_when_backend_rejects_wait(status_code: int) -> None:
+    seen_wait: list[str | None] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        wait = request.url.params.get("wait")
+        seen_wait.append(wait)
+        if wait is not None:
+            return httpx.Response(status_code, json={"detail": "unknown parameter"})
+        return httpx.Response(200, json=[])
+
+    transport = httpx.MockTransport(handler)
+    settings = RunnerSettings(api_base_url="http://localhost:8000")
+    with RunnerHttpClient(settings, transport=transport, sleep=lambda _: None) as client:
+        api = RunnerBackendApi(client, long_poll_seconds=20.0)
+        assert api.list_pending_jobs() == []
+        assert api.list_pending_jobs() == []
+        assert api.long_poll_active is False
+
+    assert seen_wait == ["20.0", None, None]
+
+
+def test_api_long_poll_falls_back_when_backend_ignores_wait() -> None:
+    seen_wait: list[str | None] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_wait.append(request.url.params.get("wait"))
+        return httpx.Response(200, json={"items": []})
+
+    transport = httpx.MockTransport(handler)
+    settings = RunnerSettings(api_base_url="http://localhost:8000")
+    with RunnerHttpClient(settings, transport=transport, sleep=lambda _: None) as client:
+        api = RunnerBackendApi(client, long_poll_seconds=20.0)
+        api.list_pending_jobs()
+        api.list_pending_jobs()
+        assert api.long_poll_active is False
+
+    assert seen_wait == ["20.0", None]
+
+
+def test_api_claim_next_returns_claimed_jobs() -> None:
+    seen_body: dict[str, object] = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.method == "POST"
+        assert request.url.path == "/runner/jobs/claim-next"
+        assert request.headers["X-Request-ID"].startswith("runner-claim-next-")
+        seen_body.update(json.loads(request.read().decode("utf-8")))
+        return httpx.Response(
+            200,
+            json={
+                "items": [
+                    {
+                        "job_id": "job_1",
+                        "job_type": "compile_captureone",
+                        "status": "running",
+                        "payload": {"style_id": "style_1", "version": "v1"},
+                    }
+                ]
+            },
+        )
+
+    transport = httpx.MockTransport(handler)
+    settings = RunnerSettings(api_base_url="http://localhost:8000")
+    with RunnerHttpClient(settings, transport=transport, sleep=lambda _: None) as client:
+        jobs = RunnerBackendApi(client).claim_next_jobs(limit=3)
+
+    assert seen_body == {"limit": 3}
+    assert jobs is not None
+    assert [(job.job_id, job.status) for job in jobs] == [("job_1", "picked_up")]
+
+
+def test_api_claim_next_unsupported_returns_none_and_is_remembered() -> None:
+    calls = {"count": 0}
+
+    def handler(_: httpx.Request) -> httpx.Response:
+        calls["count"] += 1
+        return httpx.Response(404, json={"detail": "not found"})
+
+    transport = httpx.MockTransport(handler)
+    settings = RunnerSettings(api_base_url="http://localhost:8000")
+    with RunnerHttpClient(settings, transport=transport, sleep=lambda _: None) as client:
+        api = RunnerBackendApi(client)
+        assert api.claim_next_jobs(limit=2) is None
+        assert api.claim_next_jobs(limit=2) is None
+
+    assert calls["count"] == 1
+
+
+def test_api_heartbeat_jobs_batches_into_one_request() -> None:
+    seen: list[tuple[str, object]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append((request.url.path, json.loads(request.read().decode("utf-8"))))
+        return httpx.Response(200, json={})
+
+    transport = httpx.MockTransport(handler)
+    settings = RunnerSettings(api_base_url="http://localhost:8000")
+    with RunnerHttpClient(settings, transport=transport, sleep=lambda _: None) as client:
+        RunnerBackendApi(client).heartbeat_jobs(["job_1", "job_2"], status="running")
+
+    assert seen == [
+        ("/runner/jobs/heartbeat", {"job_ids": ["job_1", "job_2"], "status": "running"})
+    ]
+
+
+def test_api_heartbeat_jobs_falls_back_to_single_heartbeats() -> None:
+    seen: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.path)
+        if request.url.path == "/runner/jobs/heartbeat":
+            return httpx.Response(405, json={"detail": "method not allowed"})
+        return httpx.Response(200, json={})
+
+    transport = httpx.MockTransport(handler)
+    settings = RunnerSettings(api_base_url="http://localhost:8000")
+    with RunnerHttpClient(settings, transport=transport, sleep=lambda _: None) as client:
+        api = RunnerBackendApi(client)
+        api.heartbeat_jobs(["job_1", "job_2"], status="running")
+        api.heartbeat_jobs(["job_3"], status="running")
+
+    assert seen == [
+        "/runner/jobs/heartbeat",
+        "/runner/jobs/job_1/heartbeat",
+        "/runner/jobs/job_2/heartbeat",
+        "/runner/jobs/job_3/heartbeat",
+    ]
+
+
+def test_api_complete_jobs_returns_unacknowledged_results() -> None:
+    seen: list[object] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/runner/jobs/complete"
+        seen.append(json.loads(request.read().decode("utf-8")))
+        return httpx.Response(
+            200,
+            json={
+                "items": [
+                    {"job_id": "job_1", "ok": True},
+                    {"job_id": "job_2", "ok": False, "error": "lease expired"},
+                ]
+            },
+        )
+
+    results = [
+        JobExecutionResult(
+            job_id="job_1", status="succeeded", result={"artifact_id": "a1"}, error=None, logs=[]
+        ),
+        JobExecutionResult(job_id="job_2", status="failed", result=None, error="boom", logs=[]),
+    ]
+    transport = httpx.MockTransport(handler)
+    settings = RunnerSettings(api_base_url="http://localhost:8000")
+    with RunnerHttpClient(settings, transport=transport, sleep=lambda _: None) as client:
+        rejected = RunnerBackendApi(client).complete_jobs(results)
+
+    assert [result.job_id for result in rejected] == ["job_2"]
+    assert seen == [
+        {
+            "items": [
+                {
+                    "job_id": "job_1",
+                    "status": "succeeded",
+                    "result": {"artifact_id": "a1"},
+                    "error": None,
+                    "logs": [],
+                },
+                {
+                    "job_id": "job_2",
+                    "status": "failed",
+                    "result": None,
+                    "error": "boom",
+                    "logs": [],
+                },
+            ]
+        }
+    ]
+
+
+def test_api_complete_jobs_unsupported_returns_everything_and_is_remembered() -> None:
+    calls = {"count": 0}
+
+    def handler(_: httpx.Request) -> httpx.Response:
+        calls["count"] += 1
+        return httpx.Response(404, json={"detail": "not found"})
+
+    results = [
+        JobExecutionResult(job_id="job_1", status="succeeded", result=None, error=None, logs=[])
+    ]
+    transport = httpx.MockTransport(handler)
+    settings = RunnerSettings(api_base_url="http://localhost:8000")
+    with RunnerHttpClient(settings, transport=transport, sleep=lambda _: None) as client:
+        api = RunnerBackendApi(client)
+        assert api.complete_jobs(results) == results
+        assert api.complete_jobs(results) == results
+
+    assert calls["count"] == 1
+
+
+def test_api_release_job_posts_release_and_remembers_unsupported() -> None:
+    seen: list[tuple[str, str]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append((request.method, request.url.path))
+        if request.url.path == "/runner/jobs/job_2/release":
+            return httpx.Response(404, json={"detail": "not found"})
+        return httpx.Response(200, json={})
+
+    transport = httpx.MockTransport(handler)
+    settings = RunnerSettings(api_base_url="http://localhost:8000")
+    with RunnerHttpClient(settings, transport=transport, sleep=lambda _: None) as client:
+        api = RunnerBackendApi(client)
+        assert api.release_job("job_1") is True
+        assert api.release_job("job_2") is False
+        assert api.release_job("job_3") is False
+
+    assert seen == [("POST", "/runner/jobs/job_1/release"), ("POST", "/runner/jobs/job_2/release")]
@@ -0,0 +1,43 @@
+import pytest
+
+from runner.bench import BenchConfig, percentile, run_bench, run_scenario
+
+
+def test_percentile_uses_nearest_rank() -> None:
+    values = [0.4, 0.1, 0.3, 0.2]
+    assert percentile(values, 50) == 0.2
+    assert percentile(values, 99) == 0.4
+    with pytest.raises(ValueError):
+        percentile([], 50)
+
+
+def test_bench_config_validates_error_rate() -> None:
+    with pytest.raises(ValueError, match="error_rate"):
+        BenchConfig(error_rate=1.5)
+
+
+def test_sync_api_scenario_completes_every_job() -> None:
+    report = run_scenario(BenchConfig(jobs=12, workers=3), "sync", "api")
+
+    assert report["engine"] == "sync"
+    assert report["jobs_completed"] == 12
+    assert report["jobs_failed"] == 0
+    assert report["jobs_per_second"] > 0
+    assert {"job", "compile", "queue_wait"} <= set(report["phases"])
+    assert report["phases"]["compile"]["count"] == 12
+
+
+def test_run_bench_counts_injected_failures_as_failed_jobs() -> None:
+    config = BenchConfig(jobs=10, workers=4, error_rate=1.0, artifact_bytes=1024)
+    (report,) = run_bench(config, engines=("async",), execution_modes=("host",), isolate=False)
+
+    assert report["execution_mode"] == "host"
+    assert report["jobs_completed"] == 10
+    assert report["jobs_failed"] == 10
+
+
+def test_async_host_scenario_downloads_and_imports_artifacts() -> None:
+    report = run_scenario(BenchConfig(jobs=6, workers=2, artifact_bytes=4096), "async", "host")
+
+    assert report["jobs_failed"] == 0
+    assert {"download", "write", "host_import"} <= set(report["phases"])
@@ -0,0 +1,100 @@
+import os
+
+import pytest
+
+from runner.cache import ArtifactCache
+from runner.config import RunnerSettings
+
+
+def test_cache_round_trips_compile_result_and_artifact(tmp_path) -> None:
+    cache = ArtifactCache(tmp_path / "cache", max_bytes=1024 * 1024)
+    artifact = tmp_path / "artifact.costyle"
+    artifact.write_bytes(b"<SL Engine='13'>")
+
+    assert cache.get("style_1", "v1", "captureone") is None
+    digest = cache.put_artifact("style_1", "v1", "captureone", {"artifact_id": "a1"}, artifact)
+    cached = cache.get("style_1", "v1", "captureone")
+
+    assert cached is not None
+    assert cached.compile_result == {"artifact_id": "a1"}
+    assert cached.artifact_sha256 == digest
+    destination = tmp_path / "imports" / "a1.costyle"
+    destination.parent.mkdir()
+    cache.materialize(cached, destination)
+    assert destination.read_bytes() == b"<SL Engine='13'>"
+    assert cache.get("style_1", "v2", "captureone") is None
+
+
+def test_cache_stores_result_without_artifact(tmp_path) -> None:
+    cache = ArtifactCache(tmp_path / "cache", max_bytes=1024 * 1024)
+
+    cache.put_result("style_1", "v1", "captureone", {"artifact_id": "a1"})
+    cached = cache.get("style_1", "v1", "captureone")
+
+    assert cached is not None
+    assert cached.artifact_path is None
+    with pytest.raises(ValueError):
+        cache.materialize(cached, tmp_path / "out.costyle")
+
+
+def test_cache_deduplicates_identical_artifacts(tmp_path) -> None:
+    cache = ArtifactCache(tmp_path / "cache", max_bytes=1024 * 1024)
+    artifact = tmp_path / "artifact.costyle"
+    artifact.write_bytes(b"same-bytes")
+
+    first = cache.put_artifact("style_1", "v1", "captureone", {}, artifact)
+    second = cache.put_artifact("style_2", "v1", "captureone", {}, artifact)
+
+    assert first == second
+    assert len(list((tmp_path / "cache" / "blobs").iterdir())) == 1
+
+
+def test_cache_evicts_least_recently_used_files(tmp_path) -> None:
+    cache = ArtifactCache(tmp_path / "cache", max_bytes=2500)
+    for index in range(3):
+        artifact = tmp_path / f"artifact_{index}.costyle"
+        artifact.write_bytes(bytes([index]) * 1000)
+        cache.put_artifact(f"style_{index}", "v1", "captureone", {}, artifact)
+        for path in (tmp_path / "cache").rglob("*"):
+            if path.is_file():
+                os.utime(path, (index, index))
+
+    assert cache.get("style_0", "v1", "captureone") is None
+    newest = cache.get("style_2", "v1", "captureone")
+    assert newest is not None
+    assert newest.artifact_path is not None
+
+
+def test_cache_from_settings_disabled_by_default(tmp_path) -> None:
+    assert ArtifactCache.from_settings(RunnerSettings()) is None
+    cache = ArtifactCache.from_settings(RunnerSettings(artifact_cache_dir=str(tmp_path)))
+    assert isinstance(cache, ArtifactCache)
+
+
+def test_cache_materialize_rejects_and_drops_a_corrupted_blob(tmp_path) -> None:
+    cache = ArtifactCache(tmp_path / "cache", max_bytes=1024 * 1024)
+    artifact = tmp_path / "artifact.costyle"
+    artifact.write_bytes(b"<SL Engine='13'>")
+    cache.put_artifact("style_1", "v1", "captureone", {"artifact_id": "a1"}, artifact)
+    cached = cache.get("style_1", "v1", "captureone")
+    assert cached is not None and cached.artifact_path is not None
+    cached.artifact_path.write_bytes(b"<SL Engine='1")
+
+    destination = tmp_path / "out.costyle"
+    with pytest.raises(ValueError, match="sha256"):
+        cache.materialize(cached, destination)
+
+    assert not destination.exists()
+    assert list(tmp_path.glob(".out.costyle.*")) == []
+    refreshed = cache.get("style_1", "v1", "captureone")
+    assert refreshed is not None and refreshed.artifact_path is None
+
+
+def test_cache_invalidate_drops_the_entry(tmp_path) -> None:
+    cache = ArtifactCache(tmp_path / "cache", max_bytes=1024 * 1024)
+    cache.put_result("style_1", "v1", "captureone", {"artifact_id": "a1"})
+
+    cache.invalidate("style_1", "v1", "captureone")
+    cache.invalidate("style_1", "v1", "captureone")
+
+    assert cache.get("style_1", "v1", "captureone") is None
@@ -35,3 +35,24 @@ def test_parser_supports_doctor_command() -> None:
     parser = build_parser()
     args = parser.parse_args(["doctor"])
     assert args.command == "doctor"
+
+
+def test_parser_supports_poll_workers() -> None:
+    parser = build_parser()
+    args = parser.parse_args(["poll", "--workers", "4"])
+    assert args.workers == 4
+
+
+def test_parser_rejects_non_positive_poll_workers() -> None:
+    parser = build_parser()
+    with pytest.raises(SystemExit):
+        parser.parse_args(["poll", "--workers", "0"])
+
+
+def test_parser_supports_supervise_command() -> None:
+    parser = build_parser()
+    args = parser.parse_args(["supervise", "--processes", "4", "--max-in-flight", "10"])
+    assert args.command == "supervise"
+    assert args.processes == 4
+    assert args.max_in_flight == 10
+    assert args.workers is None
@@ -0,0 +1,116 @@
+import json
+
+import httpx
+import pytest
+
+from runner.api import RunnerBackendApi
+from runner.codec import JsonCodec, json_codec
+from runner.config import RunnerSettings
+from runner.http import RunnerHttpClient
+
+_JOB = {
+    "job_id": "job_1",
+    "job_type": "compile_captureone",
+    "status": "pending",
+    "created_at": "2026-01-01T00:00:00Z",
+    "payload": {"style_id": "style_1", "version": "v1", "execution_mode": "host"},
+}
+
+
+@pytest.fixture(params=["stdlib", "orjson", "msgspec"])
+def codec(request: pytest.FixtureRequest) -> JsonCodec:
+    if request.param != "stdlib":
+        pytest.importorskip(request.param)
+    return json_codec(request.param)
+
+
+def test_codec_dumps_compact_utf8_and_sorts_on_request(codec: JsonCodec) -> None:
+    assert codec.dumps({"b": 1, "a": "é"}, sort_keys=True) == '{"a":"é","b":1}'.encode()
+    line = codec.dumps_str({"b": [1, None], "a": True}, sort_keys=True)
+    assert json.loads(line) == {"a": True, "b": [1, None]}
+    assert line.index('"a"') < line.index('"b"')
+    assert json.loads(codec.dumps({"b": 1, "a": 2})) == {"b": 1, "a": 2}
+
+
+def test_stdlib_codec_keeps_the_json_dumps_log_line_format() -> None:
+    entry = {"message": "Job é", "context": {"b": [1, None], "a": True}}
+
+    assert json_codec("stdlib").dumps_str(entry, sort_keys=True) == json.dumps(
+        entry, sort_keys=True
+    )
+
+
+def test_codec_loads_bytes_and_raises_value_error(codec: JsonCodec) -> None:
+    assert codec.loads(b'{"items":[1,2.5,"x"]}') == {"items": [1, 2.5, "x"]}
+    with pytest.raises(ValueError):
+        codec.loads(b"{not json")
+
+
+def test_codec_decodes_job_listings_into_jobs(codec: JsonCodec) -> None:
+    bare = codec.decode_job_listing(json.dumps([_JOB]).encode())
+    envelope = codec.decode_job_listing(json.dumps({"items": [_JOB], "wait": 20}).encode())
+
+    assert [job.job_id for job in bare.jobs] == ["job_1"]
+    assert bare.jobs[0].payload.execution_mode == "host"
+    assert bare.jobs[0].status == "picked_up"
+    assert bare.jobs[0].created_at is not None
+    assert bare.echoes_wait is False
+    assert envelope.jobs == bare.jobs
+    assert envelope.echoes_wait is True
+    assert codec.decode_job_listing(b'{"items":[]}').echoes_wait is False
+
+
+def test_codec_rejects_invalid_job_payloads(codec: JsonCodec) -> None:
+    assert codec.decode_job(json.dumps(_JOB).encode()).job_id == "job_1"
+
+    with pytest.raises(ValueError, match="Invalid jobs payload"):
+        codec.decode_job_listing(b'{"jobs":[]}')
+    with pytest.raises(ValueError, match="Invalid job payload"):
+        codec.decode_job(b"")
+    with pytest.raises(ValueError, match="Unsupported job type"):
+        codec.decode_job_listing(json.dumps([{**_JOB, "job_type": "other"}]).encode())
+
+
+def test_codec_skips_listing_items_that_are_not_objects(codec: JsonCodec) -> None:
+    bare = codec.decode_job_listing(json.dumps([_JOB, None, "job_2", 3]).encode())
+    envelope = codec.decode_job_listing(json.dumps({"items": [[], _JOB], "wait": 5}).encode())
+
+    assert [job.job_id for job in bare.jobs] == ["job_1"]
+    assert [job.job_id for job in envelope.jobs] == ["job_1"]
+    assert envelope.echoes_wait is True
+
+
+def test_json_codec_auto_falls_back_to_stdlib(monkeypatch) -> None:
+    def missing(name: str) -> None:
+        raise ImportError(name)
+
+    monkeypatch.setattr("runner.codec.importlib.import_module", missing)
+
+    assert json_codec("auto").name == "stdlib"
+
+
+def test_json_codec_named_backend_requires_package(monkeypatch) -> None:
+    monkeypatch.setattr("runner.codec.importlib.util.find_spec", lambda _: None)
+
+    with pytest.raises(ValueError, match=r"styleagent-runner\[orjson\]"):
+        json_codec("orjson")
+
+
+def test_http_client_encodes_and_decodes_with_configured_codec() -> None:
+    seen: list[tuple[str, bytes]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append((request.headers.get("Content-Type", ""), request.content))
+        if request.url.path == "/runner/jobs":
+            return httpx.Response(200, json={"items": [_JOB]})
+        return httpx.Response(200, json={"ok": True})
+
+    settings = RunnerSettings(json_codec="stdlib")
+    with RunnerHttpClient(settings, transport=httpx.MockTransport(handler)) as client:
+        response = client.request_json("POST", "/runner/jobs/job_1/heartbeat", json={"s": "é"})
+        jobs = RunnerBackendApi(client).list_pending_jobs()
+
+    assert client.codec.name == "stdlib"
+    assert response == {"ok": True}
+    assert seen[0] == ("application/json", '{"s":"é"}'.encode())
+    assert [job.job_id for job in jobs] == ["job_1"]
@@ -0,0 +1,173 @@
+import asyncio
+import threading
+
+from runner.completions import AsyncCompletionBuffer, CompletionBuffer
+from runner.types import JobExecutionResult
+
+
+def _result(job_id: str) -> JobExecutionResult:
+    return JobExecutionResult(job_id=job_id, status="succeeded", result={}, error=None, logs=[])
+
+
+class FakeCompletionApi:
+    def __init__(self, *, rejected: set[str] | None = None) -> None:
+        self.batches: list[list[str]] = []
+        self.singles: list[str] = []
+        self.rejected = rejected or set()
+        self.sent = threading.Event()
+
+    def complete_jobs(self, results: list[JobExecutionResult]) -> list[JobExecutionResult]:
+        self.batches.append([result.job_id for result in results])
+        self.sent.set()
+        return [result for result in results if result.job_id in self.rejected]
+
+    def complete_job(self, result: JobExecutionResult) -> None:
+        self.singles.append(result.job_id)
+
+
+def test_completion_buffer_flushes_full_batches_and_on_close() -> None:
+    api = FakeCompletionApi()
+    buffer = CompletionBuffer(api, max_batch_size=2, flush_interval_seconds=60)
+
+    for job_id in ("job_1", "job_2", "job_3"):
+        buffer.submit(_result(job_id))
+    assert api.batches == [["job_1", "job_2"]]
+    assert buffer.pending() == ["job_3"]
+
+    buffer.close()
+
+    assert api.batches == [["job_1", "job_2"], ["job_3"]]
+    assert buffer.pending() == []
+
+
+def test_completion_buffer_flushes_on_interval() -> None:
+    api = FakeCompletionApi()
+    buffer = CompletionBuffer(api, max_batch_size=100, flush_interval_seconds=0.01)
+    buffer.submit(_result("job_1"))
+
+    assert api.sent.wait(timeout=5)
+    buffer.close()
+
+    assert api.batches == [["job_1"]]
+
+
+def test_completion_buffer_completes_unacknowledged_results_one_by_one() -> None:
+    api = FakeCompletionApi(rejected={"job_2"})
+    buffer = CompletionBuffer(api, max_batch_size=2, flush_interval_seconds=60)
+
+    buffer.submit(_result("job_1"))
+    buffer.submit(_result("job_2"))
+    buffer.close()
+
+    assert api.batches == [["job_1", "job_2"]]
+    assert api.singles == ["job_2"]
+
+
+def test_completion_buffer_completes_one_by_one_when_the_bulk_request_fails() -> None:
+    class FailingApi(FakeCompletionApi):
+        def complete_jobs(self, results: list[JobExecutionResult]) -> list[JobExecutionResult]:
+            raise RuntimeError("backend busy")
+
+        def complete_job(self, result: JobExecutionResult) -> None:
+            if result.job_id == "job_2":
+                raise RuntimeError("backend down")
+            super().complete_job(result)
+
+    api = FailingApi()
+    errors: list[tuple[list[str], str]] = []
+    buffer = CompletionBuffer(
+        api,
+        max_batch_size=10,
+        flush_interval_seconds=60,
+        on_error=lambda job_ids, exc: errors.append((job_ids, str(exc))),
+    )
+    buffer.submit(_result("job_1"))
+    buffer.submit(_result("job_2"))
+    buffer.close()
+
+    assert api.singles == ["job_1"]
+    assert errors == [(["job_2"], "backend down")]
+
+
+def test_completion_buffer_close_waits_for_the_batch_being_sent() -> None:
+    sending = threading.Event()
+    release = threading.Event()
+
+    class SlowApi(FakeCompletionApi):
+        def complete_jobs(self, results: list[JobExecutionResult]) -> list[JobExecutionResult]:
+            sending.set()
+            release.wait(timeout=5)
+            return super().complete_jobs(results)
+
+    api = SlowApi()
+    buffer = CompletionBuffer(api, max_batch_size=100, flush_interval_seconds=0.01)
+    buffer.submit(_result("job_1"))
+    assert sending.wait(timeout=5)
+    assert buffer.pending() == ["job_1"]
+
+    threading.Timer(0.05, release.set).start()
+    buffer.close()
+
+    assert api.batches == [["job_1"]]
+    assert buffer.pending() == []
+
+
+def test_async_completion_buffer_batches_and_flushes_on_close() -> None:
+    class FakeAsyncCompletionApi:
+        def __init__(self) -> None:
+            self.batches: list[list[str]] = []
+            self.singles: list[str] = []
+
+        async def complete_jobs(
+            self, results: list[JobExecutionResult]
+        ) -> list[JobExecutionResult]:
+            self.batches.append([result.job_id for result in results])
+            return [result for result in results if result.job_id == "job_3"]
+
+        async def complete_job(self, result: JobExecutionResult) -> None:
+            self.singles.append(result.job_id)
+
+    api = FakeAsyncCompletionApi()
+
+    async def run() -> None:
+        buffer = AsyncCompletionBuffer(api, max_batch_size=2, flush_interval_seconds=60)
+        for job_id in ("job_1", "job_2", "job_3"):
+            await buffer.submit(_result(job_id))
+        await buffer.aclose()
+
+    asyncio.run(run())
+
+    assert api.batches == [["job_1", "job_2"], ["job_3"]]
+    assert api.singles == ["job_3"]
+
+
+def test_async_completion_buffer_aclose_finishes_the_batch_being_sent() -> None:
+    class SlowAsyncCompletionApi:
+        def __init__(self) -> None:
+            self.completed: list[str] = []
+            self.sending = asyncio.Event()
+
+        async def complete_jobs(
+            self, results: list[JobExecutionResult]
+        ) -> list[JobExecutionResult]:
+            self.sending.set()
+            await asyncio.sleep(0.05)
+            self.completed.extend(result.job_id for result in results)
+            return []
+
+        async def complete_job(self, result: JobExecutionResult) -> None:
+            self.completed.append(result.job_id)
+
+    api = SlowAsyncCompletionApi()
+
+    async def run() -> list[str]:
+        buffer = AsyncCompletionBuffer(api, max_batch_size=100, flush_interval_seconds=0.01)
+        await buffer.submit(_result("job_1"))
+        await api.sending.wait()
+        in_flight = buffer.pending()
+        await buffer.aclose()
+        assert buffer.pending() == []
+        return in_flight
+
+    assert asyncio.run(run()) == ["job_1"]
+    assert api.completed == ["job_1"]
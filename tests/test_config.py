@@ -7,6 +7,11 @@ def test_settings_defaults() -> None:
     settings = RunnerSettings.from_env({})
     assert settings.api_base_url == "http://localhost:8000"
     assert settings.poll_interval_seconds == 5.0
+    assert settings.poll_max_interval_seconds == 60.0
+    assert settings.poll_workers == 1
+    assert settings.long_poll_seconds == 0.0
+    assert settings.heartbeat_interval_seconds == 30.0
+    assert settings.engine == "sync"
     assert settings.api_key is None
     assert settings.http_timeout_seconds == 10.0
     assert settings.http_retries == 2
@@ -15,6 +20,8 @@ def test_settings_defaults() -> None:
     assert settings.captureone_auto_open is True
     assert settings.captureone_launch_mode == "auto"
     assert settings.captureone_cli_command == ""
+    assert settings.artifact_cache_dir == ""
+    assert settings.artifact_cache_max_bytes == 256 * 1024 * 1024
 
 
 def test_settings_from_env_custom_values() -> None:
@@ -22,6 +29,11 @@ def test_settings_from_env_custom_values() -> None:
         {
             "RUNNER_API_BASE_URL": "https://api.styleagent.local/",
             "RUNNER_POLL_INTERVAL": "2.5",
+            "RUNNER_POLL_MAX_INTERVAL": "30",
+            "RUNNER_POLL_WORKERS": "4",
+            "RUNNER_LONG_POLL_SECONDS": "25",
+            "RUNNER_HEARTBEAT_INTERVAL_SECONDS": "0",
+            "RUNNER_ENGINE": "async",
             "RUNNER_API_KEY": "secret-token",
             "RUNNER_HTTP_TIMEOUT_SECONDS": "4.5",
             "RUNNER_HTTP_RETRIES": "5",
@@ -32,10 +44,17 @@ def test_settings_from_env_custom_values() -> None:
             "RUNNER_CAPTUREONE_AUTO_OPEN": "false",
             "RUNNER_CAPTUREONE_LAUNCH_MODE": "cli",
             "RUNNER_CAPTUREONE_CLI_COMMAND": "captureone-cli --import {costyle_path}",
+            "RUNNER_ARTIFACT_CACHE_DIR": "/tmp/runner-cache",
+            "RUNNER_ARTIFACT_CACHE_MAX_BYTES": "1048576",
         }
     )
     assert settings.api_base_url == "https://api.styleagent.local"
     assert settings.poll_interval_seconds == 2.5
+    assert settings.poll_max_interval_seconds == 30.0
+    assert settings.poll_workers == 4
+    assert settings.long_poll_seconds == 25.0
+    assert settings.heartbeat_interval_seconds == 0.0
+    assert settings.engine == "async"
     assert settings.api_key == "secret-token"
     assert settings.http_timeout_seconds == 4.5
     assert settings.http_retries == 5
@@ -46,6 +65,8 @@ def test_settings_from_env_custom_values() -> None:
     assert settings.captureone_auto_open is False
     assert settings.captureone_launch_mode == "cli"
     assert settings.captureone_cli_command == "captureone-cli --import {costyle_path}"
+    assert settings.artifact_cache_dir == "/tmp/runner-cache"
+    assert settings.artifact_cache_max_bytes == 1048576
 
 
 def test_settings_invalid_retry_raises() -> None:
@@ -58,6 +79,34 @@ def test_settings_invalid_poll_interval_raises() -> None:
         RunnerSettings.from_env({"RUNNER_POLL_INTERVAL": "0"})
 
 
+def test_settings_poll_max_interval_must_cover_poll_interval() -> None:
+    with pytest.raises(ValueError, match="RUNNER_POLL_MAX_INTERVAL"):
+        RunnerSettings.from_env({"RUNNER_POLL_INTERVAL": "10", "RUNNER_POLL_MAX_INTERVAL": "5"})
+
+    settings = RunnerSettings.from_env({"RUNNER_POLL_INTERVAL": "120"})
+    assert settings.poll_max_interval_seconds == 120.0
+
+
+def test_settings_invalid_poll_workers_raises() -> None:
+    with pytest.raises(ValueError, match="RUNNER_POLL_WORKERS"):
+        RunnerSettings.from_env({"RUNNER_POLL_WORKERS": "0"})
+
+
+def test_settings_invalid_long_poll_raises() -> None:
+    with pytest.raises(ValueError, match="RUNNER_LONG_POLL_SECONDS"):
+        RunnerSettings.from_env({"RUNNER_LONG_POLL_SECONDS": "-1"})
+
+
+def test_settings_invalid_heartbeat_interval_raises() -> None:
+    with pytest.raises(ValueError, match="RUNNER_HEARTBEAT_INTERVAL_SECONDS"):
+        RunnerSettings.from_env({"RUNNER_HEARTBEAT_INTERVAL_SECONDS": "-5"})
+
+
+def test_settings_invalid_engine_raises() -> None:
+    with pytest.raises(ValueError, match="RUNNER_ENGINE"):
+        RunnerSettings.from_env({"RUNNER_ENGINE": "threads"})
+
+
 def test_settings_invalid_execution_mode_raises() -> None:
     with pytest.raises(ValueError, match="RUNNER_EXECUTION_MODE"):
         RunnerSettings.from_env({"RUNNER_EXECUTION_MODE": "desktop"})
@@ -66,3 +115,171 @@ def test_settings_invalid_execution_mode_raises() -> None:
 def test_settings_invalid_captureone_launch_mode_raises() -> None:
     with pytest.raises(ValueError, match="RUNNER_CAPTUREONE_LAUNCH_MODE"):
         RunnerSettings.from_env({"RUNNER_CAPTUREONE_LAUNCH_MODE": "desktop"})
+
+
+def test_settings_invalid_artifact_cache_max_bytes_raises() -> None:
+    with pytest.raises(ValueError, match="RUNNER_ARTIFACT_CACHE_MAX_BYTES"):
+        RunnerSettings.from_env({"RUNNER_ARTIFACT_CACHE_MAX_BYTES": "0"})
+
+
+def test_settings_http_validator_cache_entries() -> None:
+    assert RunnerSettings.from_env({}).http_validator_cache_entries == 256
+    settings = RunnerSettings.from_env({"RUNNER_HTTP_VALIDATOR_CACHE_ENTRIES": "0"})
+    assert settings.http_validator_cache_entries == 0
+    with pytest.raises(ValueError, match="RUNNER_HTTP_VALIDATOR_CACHE_ENTRIES"):
+        RunnerSettings.from_env({"RUNNER_HTTP_VALIDATOR_CACHE_ENTRIES": "-1"})
+
+
+def test_settings_http_pool_and_http2() -> None:
+    defaults = RunnerSettings.from_env({})
+    assert defaults.http_max_connections == 100
+    assert defaults.http_max_keepalive_connections == 50
+    assert defaults.http_keepalive_expiry_seconds == 5.0
+    assert defaults.http2 is False
+
+    settings = RunnerSettings.from_env(
+        {
+            "RUNNER_HTTP_MAX_CONNECTIONS": "10",
+            "RUNNER_HTTP_KEEPALIVE_EXPIRY_SECONDS": "30",
+            "RUNNER_HTTP2": "true",
+        }
+    )
+    assert settings.http_max_connections == 10
+    assert settings.http_max_keepalive_connections == 10
+    assert settings.http_keepalive_expiry_seconds == 30.0
+    assert settings.http2 is True
+
+
+def test_settings_invalid_keepalive_connections_raises() -> None:
+    with pytest.raises(ValueError, match="RUNNER_HTTP_MAX_KEEPALIVE_CONNECTIONS"):
+        RunnerSettings.from_env(
+            {"RUNNER_HTTP_MAX_CONNECTIONS": "4", "RUNNER_HTTP_MAX_KEEPALIVE_CONNECTIONS": "5"}
+        )
+
+
+def test_settings_completion_batching() -> None:
+    defaults = RunnerSettings.from_env({})
+    assert defaults.completion_batch_size == 1
+    assert defaults.completion_flush_interval_seconds == 1.0
+
+    settings = RunnerSettings.from_env(
+        {
+            "RUNNER_COMPLETION_BATCH_SIZE": "25",
+            "RUNNER_COMPLETION_FLUSH_INTERVAL_SECONDS": "0.5",
+        }
+    )
+    assert settings.completion_batch_size == 25
+    assert settings.completion_flush_interval_seconds == 0.5
+
+    with pytest.raises(ValueError, match="RUNNER_COMPLETION_BATCH_SIZE"):
+        RunnerSettings.from_env({"RUNNER_COMPLETION_BATCH_SIZE": "0"})
+
+
+def test_settings_prefetch_depth() -> None:
+    assert RunnerSettings.from_env({}).prefetch_depth == 0
+    assert RunnerSettings.from_env({"RUNNER_PREFETCH_DEPTH": "4"}).prefetch_depth == 4
+
+    with pytest.raises(ValueError, match="RUNNER_PREFETCH_DEPTH"):
+        RunnerSettings.from_env({"RUNNER_PREFETCH_DEPTH": "-1"})
+
+
+def test_settings_shutdown_grace() -> None:
+    assert RunnerSettings.from_env({}).shutdown_grace_seconds == 30.0
+    settings = RunnerSettings.from_env({"RUNNER_SHUTDOWN_GRACE_SECONDS": "0"})
+    assert settings.shutdown_grace_seconds == 0.0
+
+    with pytest.raises(ValueError, match="RUNNER_SHUTDOWN_GRACE_SECONDS"):
+        RunnerSettings.from_env({"RUNNER_SHUTDOWN_GRACE_SECONDS": "-1"})
+
+
+def test_settings_lane_scheduling() -> None:
+    defaults = RunnerSettings.from_env({})
+    assert defaults.lane_limits == {}
+    assert defaults.scheduler_lookahead == 1
+
+    settings = RunnerSettings.from_env(
+        {
+            "RUNNER_LANE_LIMITS": "compile_captureone:host=1, compile_captureone:api=8",
+            "RUNNER_SCHEDULER_LOOKAHEAD": "4",
+        }
+    )
+    assert settings.lane_limits == {"compile_captureone:host": 1, "compile_captureone:api": 8}
+    assert settings.scheduler_lookahead == 4
+
+    with pytest.raises(ValueError, match="RUNNER_LANE_LIMITS"):
+        RunnerSettings.from_env({"RUNNER_LANE_LIMITS": "compile_captureone:host=0"})
+    with pytest.raises(ValueError, match="RUNNER_LANE_LIMITS"):
+        RunnerSettings.from_env({"RUNNER_LANE_LIMITS": "compile_captureone:host"})
+    with pytest.raises(ValueError, match="RUNNER_SCHEDULER_LOOKAHEAD"):
+        RunnerSettings.from_env({"RUNNER_SCHEDULER_LOOKAHEAD": "0"})
+
+
+def test_settings_http_compression() -> None:
+    defaults = RunnerSettings.from_env({})
+    assert defaults.http_compression == "off"
+    assert defaults.http_compression_min_bytes == 1024
+
+    settings = RunnerSettings.from_env(
+        {"RUNNER_HTTP_COMPRESSION": "GZIP", "RUNNER_HTTP_COMPRESSION_MIN_BYTES": "0"}
+    )
+    assert settings.http_compression == "gzip"
+    assert settings.http_compression_min_bytes == 0
+
+    with pytest.raises(ValueError, match="RUNNER_HTTP_COMPRESSION"):
+        RunnerSettings.from_env({"RUNNER_HTTP_COMPRESSION": "brotli"})
+
+
+def test_settings_json_codec() -> None:
+    assert RunnerSettings.from_env({}).json_codec == "auto"
+    assert RunnerSettings.from_env({"RUNNER_JSON_CODEC": "ORJSON"}).json_codec == "orjson"
+
+    with pytest.raises(ValueError, match="RUNNER_JSON_CODEC"):
+        RunnerSettings.from_env({"RUNNER_JSON_CODEC": "ujson"})
+
+
+def test_settings_http_resilience() -> None:
+    defaults = RunnerSettings.from_env({})
+    assert defaults.http_backoff_max_seconds == 10.0
+    assert defaults.http_retry_budget_ratio == 0.2
+    assert defaults.http_retry_budget_reserve == 10
+    assert defaults.http_breaker_failure_threshold == 5
+    assert defaults.http_breaker_reset_seconds == 30.0
+
+    settings = RunnerSettings.from_env(
+        {
+            "RUNNER_HTTP_BACKOFF_MAX_SECONDS": "5",
+            "RUNNER_HTTP_RETRY_BUDGET_RATIO": "0",
+            "RUNNER_HTTP_RETRY_BUDGET_RESERVE": "3",
+            "RUNNER_HTTP_BREAKER_FAILURE_THRESHOLD": "0",
+            "RUNNER_HTTP_BREAKER_RESET_SECONDS": "2.5",
+        }
+    )
+    assert settings.http_backoff_max_seconds == 5.0
+    assert settings.http_retry_budget_ratio == 0.0
+    assert settings.http_retry_budget_reserve == 3
+    assert settings.http_breaker_failure_threshold == 0
+    assert settings.http_breaker_reset_seconds == 2.5
+
+    with pytest.raises(ValueError, match="RUNNER_HTTP_BREAKER_RESET_SECONDS"):
+        RunnerSettings.from_env({"RUNNER_HTTP_BREAKER_RESET_SECONDS": "0"})
+
+
+def test_settings_metrics_endpoint() -> None:
+    defaults = RunnerSettings.from_env({})
+    assert defaults.metrics_port == 0
+    assert defaults.metrics_host == "127.0.0.1"
+
+    settings = RunnerSettings.from_env(
+        {"RUNNER_METRICS_PORT": "9464", "RUNNER_METRICS_HOST": "0.0.0.0"}
+    )
+    assert settings.metrics_port == 9464
+    assert settings.metrics_host == "0.0.0.0"
+
+    with pytest.raises(ValueError, match="RUNNER_METRICS_PORT"):
+        RunnerSettings.from_env({"RUNNER_METRICS_PORT": "70000"})
+
+
+def test_settings_trace_file() -> None:
+    assert RunnerSettings.from_env({}).trace_file == ""
+    settings = RunnerSettings.from_env({"RUNNER_TRACE_FILE": " /tmp/spans.jsonl "})
+    assert settings.trace_file == "/tmp/spans.jsonl"
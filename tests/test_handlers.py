@@ -0,0 +1,108 @@
+from importlib.metadata import EntryPoint
+import sys
+from typing import Any
+
+import pytest
+
+from runner.handlers import HandlerRegistry, JobHandler
+from runner.jobs import JobExecutor
+from runner.types import JobExecutionError, job_from_dict
+
+
+class EchoError(JobExecutionError):
+    code = "ECHO_FAILED"
+
+    def to_result(self) -> dict[str, Any]:
+        return {"echo": "failed"}
+
+
+def _parse(payload: dict[str, Any]) -> dict[str, Any]:
+    if "text" not in payload:
+        raise ValueError("Invalid echo payload")
+    return payload
+
+
+def _execute(client: Any, payload: dict[str, Any], **_: Any) -> dict[str, Any]:
+    if payload["text"] == "fail":
+        raise EchoError("echo failed")
+    return {"echo": payload["text"]}
+
+
+async def _execute_async(client: Any, payload: dict[str, Any], **kwargs: Any) -> dict[str, Any]:
+    return _execute(client, payload, **kwargs)
+
+
+ECHO = JobHandler(parse_payload=_parse, execute=_execute, execute_async=_execute_async)
+
+
+@pytest.fixture
+def plugin_module(tmp_path, monkeypatch) -> str:
+    name = "echo_plugin_handler"
+    (tmp_path / f"{name}.py").write_text(
+        "from runner.handlers import JobHandler\n"
+        "HANDLER = JobHandler(parse_payload=dict, execute=print, execute_async=print)\n"
+        "NOT_A_HANDLER = 1\n",
+        encoding="utf-8",
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, name, raising=False)
+    return name
+
+
+def test_registry_imports_handlers_on_first_use(plugin_module: str) -> None:
+    registry = HandlerRegistry({"echo": f"{plugin_module}:HANDLER"}, group=None)
+
+    assert registry.job_types() == ["echo"]
+    assert registry.loaded() == []
+    assert plugin_module not in sys.modules
+    assert isinstance(registry.get("echo"), JobHandler)
+    assert registry.loaded() == ["echo"]
+    with pytest.raises(ValueError, match="Unsupported job type: other"):
+        registry.get("other")
+
+
+def test_registry_discovers_entry_points_only_for_unknown_types(
+    plugin_module: str, monkeypatch
+) -> None:
+    calls: list[str] = []
+
+    def fake_entry_points(*, group: str) -> list[EntryPoint]:
+        calls.append(group)
+        return [
+            EntryPoint("echo", f"{plugin_module}:HANDLER", group),
+            EntryPoint("broken", f"{plugin_module}:NOT_A_HANDLER", group),
+        ]
+
+    monkeypatch.setattr("runner.handlers.entry_points", fake_entry_points)
+    registry = HandlerRegistry({}, group="plugins")
+    registry.register("builtin", ECHO)
+
+    assert registry.get("builtin") is ECHO
+    assert calls == []
+    assert isinstance(registry.get("echo"), JobHandler)
+    assert calls == ["plugins"]
+    with pytest.raises(TypeError, match="not a JobHandler"):
+        registry.get("broken")
+
+
+def test_executor_runs_registered_job_types(monkeypatch) -> None:
+    registry = HandlerRegistry({}, group=None)
+    registry.register("echo", ECHO)
+    monkeypatch.setattr("runner.handlers.HANDLERS", registry)
+    executor = JobExecutor(client=None)  # type: ignore[arg-type]
+
+    ok = executor.execute(
+        job_from_dict({"job_id": "job_1", "job_type": "echo", "payload": {"text": "hi"}})
+    )
+    failed = executor.execute(
+        job_from_dict({"job_id": "job_2", "job_type": "echo", "payload": {"text": "fail"}})
+    )
+
+    assert ok.status == "succeeded"
+    assert ok.result == {"echo": "hi"}
+    assert failed.status == "failed"
+    assert failed.result == {"echo": "failed"}
+    with pytest.raises(ValueError, match="Invalid echo payload"):
+        job_from_dict({"job_id": "job_3", "job_type": "echo", "payload": {}})
+    with pytest.raises(ValueError, match="Unsupported job type: compile_captureone"):
+        job_from_dict({"job_id": "job_4", "job_type": "compile_captureone", "payload": {}})
@@ -0,0 +1,89 @@
+import asyncio
+import threading
+
+from runner.heartbeat import AsyncHeartbeatScheduler, HeartbeatScheduler
+
+
+class FakeHeartbeatApi:
+    def __init__(self) -> None:
+        self.batches: list[tuple[list[str], str]] = []
+        self.sent = threading.Event()
+
+    def heartbeat_jobs(self, job_ids: list[str], status: str) -> None:
+        self.batches.append((job_ids, status))
+        self.sent.set()
+
+
+def test_heartbeat_scheduler_batches_tracked_jobs() -> None:
+    api = FakeHeartbeatApi()
+    scheduler = HeartbeatScheduler(api, interval_seconds=60)
+    scheduler.track("job_1")
+    scheduler.track("job_2")
+    scheduler.untrack("job_1")
+    scheduler.track("job_3")
+
+    scheduler.beat()
+    scheduler.close()
+
+    assert api.batches == [(["job_2", "job_3"], "running")]
+
+
+def test_heartbeat_scheduler_thread_renews_leases() -> None:
+    api = FakeHeartbeatApi()
+    scheduler = HeartbeatScheduler(api, interval_seconds=0.01)
+    scheduler.track("job_1")
+
+    assert api.sent.wait(timeout=5)
+    scheduler.close()
+
+    assert api.batches[0] == (["job_1"], "running")
+
+
+def test_heartbeat_scheduler_reports_errors_and_keeps_running() -> None:
+    class FailingApi:
+        def heartbeat_jobs(self, job_ids: list[str], status: str) -> None:
+            raise RuntimeError("backend down")
+
+    errors: list[tuple[list[str], str]] = []
+    scheduler = HeartbeatScheduler(
+        FailingApi(),
+        interval_seconds=60,
+        on_error=lambda job_ids, exc: errors.append((job_ids, str(exc))),
+    )
+    scheduler.track("job_1")
+
+    scheduler.beat()
+    scheduler.beat()
+    scheduler.close()
+
+    assert errors == [(["job_1"], "backend down"), (["job_1"], "backend down")]
+
+
+def test_heartbeat_scheduler_skips_empty_rounds() -> None:
+    api = FakeHeartbeatApi()
+    scheduler = HeartbeatScheduler(api, interval_seconds=60)
+
+    scheduler.beat()
+
+    assert api.batches == []
+
+
+def test_async_heartbeat_scheduler_renews_leases() -> None:
+    batches: list[list[str]] = []
+
+    class FakeAsyncApi:
+        async def heartbeat_jobs(self, job_ids: list[str], status: str) -> None:
+            batches.append(job_ids)
+
+    async def run() -> None:
+        scheduler = AsyncHeartbeatScheduler(FakeAsyncApi(), interval_seconds=0.01)
+        scheduler.track("job_1")
+        for _ in range(100):
+            if batches:
+                break
+            await asyncio.sleep(0.01)
+        await scheduler.aclose()
+
+    asyncio.run(run())
+
+    assert batches[0] == ["job_1"]
@@ -1,8 +1,21 @@
+import asyncio
+import gzip
+import hashlib
+import json
+
 import httpx
 import pytest
 
 from runner.config import RunnerSettings
-from runner.http import RunnerHttpClient, RunnerHttpError
+from runner.http import (
+    AsyncRunnerHttpClient,
+    CircuitOpenError,
+    DownloadIntegrityError,
+    RunnerHttpClient,
+    RunnerHttpError,
+)
+from runner.metrics import HTTP_BODY_BYTES
+from runner.resilience import RetryPolicy
 
 
 def test_http_client_retries_on_5xx_then_succeeds() -> None:
@@ -114,3 +127,456 @@ def test_http_client_sends_custom_headers() -> None:
 
     assert seen_headers["x-request-id"] == "runner-test-abc"
     assert seen_headers["x-runner-job-id"] == "job_123"
+
+
+def test_async_http_client_retries_on_5xx_then_succeeds() -> None:
+    calls = {"count": 0}
+
+    def handler(_: httpx.Request) -> httpx.Response:
+        calls["count"] += 1
+        if calls["count"] == 1:
+            return httpx.Response(503, json={"message": "temporary"})
+        return httpx.Response(200, json={"ok": True})
+
+    async def no_sleep(_: float) -> None:
+        return None
+
+    async def run() -> object:
+        settings = RunnerSettings(api_base_url="http://localhost:8000", http_retries=2)
+        transport = httpx.MockTransport(handler)
+        async with AsyncRunnerHttpClient(settings, transport=transport, sleep=no_sleep) as client:
+            return await client.request_json("GET", "/health")
+
+    assert asyncio.run(run()) == {"ok": True}
+    assert calls["count"] == 2
+
+
+def test_async_http_client_4xx_raises_without_retry() -> None:
+    calls = {"count": 0}
+
+    def handler(_: httpx.Request) -> httpx.Response:
+        calls["count"] += 1
+        return httpx.Response(404, json={"detail": "not found"})
+
+    async def run() -> None:
+        settings = RunnerSettings(api_base_url="http://localhost:8000", http_retries=5)
+        transport = httpx.MockTransport(handler)
+        async with AsyncRunnerHttpClient(settings, transport=transport) as client:
+            await client.request_bytes("GET", "/missing")
+
+    with pytest.raises(RunnerHttpError):
+        asyncio.run(run())
+    assert calls["count"] == 1
+
+
+def test_http_client_download_to_file_streams_into_place(tmp_path) -> None:
+    def handler(_: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=b"artifact-bytes" * 1000)
+
+    settings = RunnerSettings(api_base_url="http://localhost:8000", http_retries=0)
+    destination = tmp_path / "a1.costyle"
+    with RunnerHttpClient(settings, transport=httpx.MockTransport(handler)) as client:
+        written = client.download_to_file("/artifacts/a1", destination, chunk_size=1024)
+
+    assert written == 14000
+    assert destination.read_bytes() == b"artifact-bytes" * 1000
+    assert list(tmp_path.iterdir()) == [destination]
+
+
+def test_http_client_download_to_file_restarts_after_interrupted_stream(tmp_path) -> None:
+    calls = {"count": 0}
+
+    def interrupted():
+        yield b"partial-"
+        raise httpx.ReadError("connection reset")
+
+    def handler(_: httpx.Request) -> httpx.Response:
+        calls["count"] += 1
+        if calls["count"] == 1:
+            return httpx.Response(200, content=interrupted())
+        return httpx.Response(200, content=b"complete-artifact")
+
+    settings = RunnerSettings(api_base_url="http://localhost:8000", http_retries=1)
+    destination = tmp_path / "a1.costyle"
+    transport = httpx.MockTransport(handler)
+    with RunnerHttpClient(settings, transport=transport, sleep=lambda _: None) as client:
+        client.download_to_file("/artifacts/a1", destination)
+
+    assert calls["count"] == 2
+    assert destination.read_bytes() == b"complete-artifact"
+
+
+def test_http_client_download_to_file_leaves_nothing_on_failure(tmp_path) -> None:
+    def handler(_: httpx.Request) -> httpx.Response:
+        return httpx.Response(404, json={"detail": "not found"})
+
+    settings = RunnerSettings(api_base_url="http://localhost:8000", http_retries=3)
+    with RunnerHttpClient(settings, transport=httpx.MockTransport(handler)) as client:
+        with pytest.raises(RunnerHttpError) as exc_info:
+            client.download_to_file("/artifacts/missing", tmp_path / "missing.costyle")
+
+    assert exc_info.value.status_code == 404
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_async_http_client_download_to_file(tmp_path) -> None:
+    def handler(_: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=b"artifact-bytes")
+
+    async def run() -> int:
+        settings = RunnerSettings(api_base_url="http://localhost:8000", http_retries=0)
+        transport = httpx.MockTransport(handler)
+        async with AsyncRunnerHttpClient(settings, transport=transport) as client:
+            return await client.download_to_file("/artifacts/a1", tmp_path / "a1.costyle")
+
+    assert asyncio.run(run()) == len(b"artifact-bytes")
+    assert (tmp_path / "a1.costyle").read_bytes() == b"artifact-bytes"
+
+
+def test_http_client_download_to_file_resumes_with_range_request(tmp_path) -> None:
+    body = b"0123456789" * 10
+    seen_ranges: list[str | None] = []
+
+    def interrupted():
+        yield body[:40]
+        raise httpx.ReadError("connection reset")
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_ranges.append(request.headers.get("Range"))
+        if len(seen_ranges) == 1:
+            return httpx.Response(200, headers={"ETag": '"v1"'}, content=interrupted())
+        assert request.headers.get("If-Range") == '"v1"'
+        return httpx.Response(
+            206,
+            headers={"Content-Range": f"bytes 40-{len(body) - 1}/{len(body)}"},
+            content=body[40:],
+        )
+
+    settings = RunnerSettings(api_base_url="http://localhost:8000", http_retries=1)
+    destination = tmp_path / "a1.costyle"
+    transport = httpx.MockTransport(handler)
+    with RunnerHttpClient(settings, transport=transport, sleep=lambda _: None) as client:
+        written = client.download_to_file(
+            "/artifacts/a1",
+            destination,
+            chunk_size=10,
+            sha256=hashlib.sha256(body).hexdigest(),
+        )
+
+    assert seen_ranges == [None, "bytes=40-"]
+    assert written == len(body)
+    assert destination.read_bytes() == body
+
+
+def test_http_client_download_to_file_restarts_when_range_is_ignored(tmp_path) -> None:
+    calls = {"count": 0}
+
+    def interrupted():
+        yield b"stale-"
+        raise httpx.ReadError("connection reset")
+
+    def handler(_: httpx.Request) -> httpx.Response:
+        calls["count"] += 1
+        if calls["count"] == 1:
+            return httpx.Response(200, content=interrupted())
+        return httpx.Response(200, content=b"fresh-artifact")
+
+    settings = RunnerSettings(api_base_url="http://localhost:8000", http_retries=1)
+    destination = tmp_path / "a1.costyle"
+    transport = httpx.MockTransport(handler)
+    with RunnerHttpClient(settings, transport=transport, sleep=lambda _: None) as client:
+        client.download_to_file("/artifacts/a1", destination)
+
+    assert destination.read_bytes() == b"fresh-artifact"
+
+
+def test_http_client_download_to_file_rejects_checksum_mismatch(tmp_path) -> None:
+    calls = {"count": 0}
+
+    def handler(_: httpx.Request) -> httpx.Response:
+        calls["count"] += 1
+        return httpx.Response(200, content=b"corrupted")
+
+    settings = RunnerSettings(api_base_url="http://localhost:8000", http_retries=1)
+    transport = httpx.MockTransport(handler)
+    with RunnerHttpClient(settings, transport=transport, sleep=lambda _: None) as client:
+        with pytest.raises(DownloadIntegrityError, match="Checksum mismatch"):
+            client.download_to_file(
+                "/artifacts/a1",
+                tmp_path / "a1.costyle",
+                sha256=hashlib.sha256(b"expected").hexdigest(),
+            )
+
+    assert calls["count"] == 2
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_http_client_revalidates_get_with_etag_and_serves_304_from_cache() -> None:
+    seen: list[tuple[str | None, str | None]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(
+            (request.headers.get("If-None-Match"), request.headers.get("If-Modified-Since"))
+        )
+        if request.headers.get("If-None-Match") == '"job-v1"':
+            return httpx.Response(304, headers={"ETag": '"job-v1"'})
+        return httpx.Response(
+            200,
+            headers={"ETag": '"job-v1"', "Last-Modified": "Tue, 01 Sep 2026 10:00:00 GMT"},
+            json={"id": "job_1"},
+        )
+
+    settings = RunnerSettings(api_base_url="http://localhost:8000", http_retries=0)
+    with RunnerHttpClient(settings, transport=httpx.MockTransport(handler)) as client:
+        first = client.request_json("GET", "/runner/jobs/job_1", revalidate=True)
+        second = client.request_json("GET", "/runner/jobs/job_1", revalidate=True)
+        unconditional = client.request_json("GET", "/runner/jobs/job_1")
+
+    assert first == second == unconditional == {"id": "job_1"}
+    assert seen == [
+        (None, None),
+        ('"job-v1"', "Tue, 01 Sep 2026 10:00:00 GMT"),
+        (None, None),
+    ]
+
+
+def test_http_client_validator_cache_can_be_disabled() -> None:
+    seen: list[str | None] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers.get("If-None-Match"))
+        return httpx.Response(200, headers={"ETag": '"job-v1"'}, json={"id": "job_1"})
+
+    settings = RunnerSettings(
+        api_base_url="http://localhost:8000", http_retries=0, http_validator_cache_entries=0
+    )
+    with RunnerHttpClient(settings, transport=httpx.MockTransport(handler)) as client:
+        client.request_json("GET", "/runner/jobs/job_1", revalidate=True)
+        client.request_json("GET", "/runner/jobs/job_1", revalidate=True)
+
+    assert seen == [None, None]
+
+
+def test_http_client_download_revalidates_against_previous_file(tmp_path) -> None:
+    seen: list[str | None] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"a1"':
+            return httpx.Response(304)
+        return httpx.Response(200, headers={"ETag": '"a1"'}, content=b"artifact-bytes")
+
+    settings = RunnerSettings(api_base_url="http://localhost:8000", http_retries=0)
+    first = tmp_path / "first.costyle"
+    second = tmp_path / "second.costyle"
+    third = tmp_path / "third.costyle"
+    with RunnerHttpClient(settings, transport=httpx.MockTransport(handler)) as client:
+        client.download_to_file("/artifacts/a1", first, revalidate=True)
+        written = client.download_to_file(
+            "/artifacts/a1",
+            second,
+            sha256=hashlib.sha256(b"artifact-bytes").hexdigest(),
+            revalidate=True,
+        )
+        second.write_bytes(b"edited")
+        client.download_to_file("/artifacts/a1", third, revalidate=True)
+
+    assert seen == [None, '"a1"', None]
+    assert written == len(b"artifact-bytes")
+    assert second.read_bytes() == b"edited"
+    assert third.read_bytes() == b"artifact-bytes"
+
+
+def test_http_client_applies_pool_limits_and_http2_flag(monkeypatch) -> None:
+    captured: dict[str, object] = {}
+
+    def recording_client(**kwargs: object) -> object:
+        captured.update(kwargs)
+        return object()
+
+    monkeypatch.setattr("runner.http.importlib.util.find_spec", lambda _: object())
+    monkeypatch.setattr("runner.http.httpx.Client", recording_client)
+    settings = RunnerSettings(
+        http_max_connections=8,
+        http_max_keepalive_connections=4,
+        http_keepalive_expiry_seconds=30.0,
+        http2=True,
+    )
+
+    RunnerHttpClient(settings)
+
+    assert captured["limits"] == httpx.Limits(
+        max_connections=8, max_keepalive_connections=4, keepalive_expiry=30.0
+    )
+    assert captured["http2"] is True
+
+
+def test_http_client_http2_requires_h2_package(monkeypatch) -> None:
+    monkeypatch.setattr("runner.http.importlib.util.find_spec", lambda _: None)
+
+    with pytest.raises(RunnerHttpError, match="h2"):
+        RunnerHttpClient(RunnerSettings(http2=True))
+
+
+def test_http_client_gzips_large_request_bodies_and_counts_savings() -> None:
+    seen: list[tuple[str | None, object]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        encoding = request.headers.get("Content-Encoding")
+        raw = request.read()
+        body = gzip.decompress(raw) if encoding == "gzip" else raw
+        seen.append((encoding, json.loads(body)))
+        return httpx.Response(200, json={"ok": True})
+
+    settings = RunnerSettings(
+        api_base_url="http://localhost:8000",
+        http_retries=0,
+        http_compression="gzip",
+        http_compression_min_bytes=256,
+    )
+    large = {"logs": ["job_running"] * 100}
+    raw_before = HTTP_BODY_BYTES.value(direction="request", stage="raw")
+    sent_before = HTTP_BODY_BYTES.value(direction="request", stage="sent")
+    with RunnerHttpClient(settings, transport=httpx.MockTransport(handler)) as client:
+        client.request_json("POST", "/runner/jobs/job_1/complete", json=large, compress=True)
+        client.request_json("POST", "/runner/jobs/job_2/complete", json={"a": 1}, compress=True)
+        client.request_json("POST", "/runner/jobs/job_3/heartbeat", json=large)
+
+    raw = HTTP_BODY_BYTES.value(direction="request", stage="raw") - raw_before
+    sent = HTTP_BODY_BYTES.value(direction="request", stage="sent") - sent_before
+    assert seen == [("gzip", large), (None, {"a": 1}), (None, large)]
+    assert raw > sent > 0
+
+
+def test_http_client_stops_compressing_after_415() -> None:
+    encodings: list[str | None] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        encodings.append(request.headers.get("Content-Encoding"))
+        if request.headers.get("Content-Encoding"):
+            return httpx.Response(415, json={"detail": "unsupported encoding"})
+        return httpx.Response(200, json={"ok": True})
+
+    settings = RunnerSettings(
+        api_base_url="http://localhost:8000",
+        http_retries=0,
+        http_compression="gzip",
+        http_compression_min_bytes=0,
+    )
+    with RunnerHttpClient(settings, transport=httpx.MockTransport(handler)) as client:
+        first = client.request_json(
+            "POST", "/runner/jobs/job_1/complete", json={"a": 1}, compress=True
+        )
+        client.request_json("POST", "/runner/jobs/job_2/complete", json={"a": 1}, compress=True)
+
+    assert first == {"ok": True}
+    assert encodings == ["gzip", None, None]
+
+
+def test_http_client_zstd_compression_requires_zstandard(monkeypatch) -> None:
+    monkeypatch.setattr("runner.http.importlib.util.find_spec", lambda _: None)
+
+    with pytest.raises(RunnerHttpError, match="zstandard"):
+        RunnerHttpClient(RunnerSettings(http_compression="zstd"))
+
+
+def test_http_client_retries_429_after_retry_after_delay() -> None:
+    calls = {"count": 0}
+    sleeps: list[float] = []
+
+    def handler(_: httpx.Request) -> httpx.Response:
+        calls["count"] += 1
+        if calls["count"] == 1:
+            return httpx.Response(429, headers={"Retry-After": "3"}, json={"detail": "slow down"})
+        return httpx.Response(200, json={"ok": True})
+
+    settings = RunnerSettings(api_base_url="http://localhost:8000", http_retries=2)
+    transport = httpx.MockTransport(handler)
+    with RunnerHttpClient(settings, transport=transport, sleep=sleeps.append) as client:
+        payload = client.request_json("GET", "/runner/jobs")
+
+    assert payload == {"ok": True}
+    assert calls["count"] == 2
+    assert sleeps[0] >= 3.0
+
+
+def test_http_client_circuit_breaker_fails_fast_per_endpoint() -> None:
+    calls: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if request.url.path == "/runner/jobs":
+            return httpx.Response(503, json={"detail": "down"})
+        return httpx.Response(200, json={"ok": True})
+
+    settings = RunnerSettings(
+        api_base_url="http://localhost:8000",
+        http_retries=0,
+        http_breaker_failure_threshold=2,
+    )
+    transport = httpx.MockTransport(handler)
+    with RunnerHttpClient(settings, transport=transport, sleep=lambda _: None) as client:
+        for _ in range(2):
+            with pytest.raises(RunnerHttpError):
+                client.request_json("GET", "/runner/jobs", endpoint="list-pending")
+        with pytest.raises(CircuitOpenError):
+            client.request_json("GET", "/runner/jobs", endpoint="list-pending")
+        assert client.request_json("GET", "/health") == {"ok": True}
+
+    assert calls == ["/runner/jobs", "/runner/jobs", "/health"]
+
+
+def test_http_client_retry_budget_caps_retries() -> None:
+    calls = {"count": 0}
+
+    def handler(_: httpx.Request) -> httpx.Response:
+        calls["count"] += 1
+        return httpx.Response(500, json={"detail": "boom"})
+
+    settings = RunnerSettings(
+        api_base_url="http://localhost:8000",
+        http_retries=5,
+        http_retry_budget_ratio=0.1,
+        http_retry_budget_reserve=2,
+        http_breaker_failure_threshold=0,
+    )
+    transport = httpx.MockTransport(handler)
+    with RunnerHttpClient(settings, transport=transport, sleep=lambda _: None) as client:
+        with pytest.raises(RunnerHttpError):
+            client.request_json("GET", "/runner/jobs")
+
+    assert calls["count"] == 3
+
+
+def test_async_http_client_cancelled_probe_does_not_wedge_the_breaker() -> None:
+    now = [0.0]
+    responses = ["fail", "hang", "ok"]
+
+    async def handler(_: httpx.Request) -> httpx.Response:
+        outcome = responses.pop(0)
+        if outcome == "hang":
+            await asyncio.Event().wait()
+        return httpx.Response(503 if outcome == "fail" else 200, json={"ok": True})
+
+    policy = RetryPolicy(
+        retries=0, breaker_failure_threshold=1, breaker_reset_seconds=5.0, clock=lambda: now[0]
+    )
+    settings = RunnerSettings(api_base_url="http://localhost:8000")
+
+    async def run() -> object:
+        async with AsyncRunnerHttpClient(
+            settings, transport=httpx.MockTransport(handler), retry_policy=policy
+        ) as client:
+            with pytest.raises(RunnerHttpError):
+                await client.request_json("GET", "/runner/jobs", endpoint="list-pending")
+            now[0] = 5.0
+            probe = asyncio.create_task(
+                client.request_json("GET", "/runner/jobs", endpoint="list-pending")
+            )
+            await asyncio.sleep(0.01)
+            probe.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await probe
+            return await client.request_json("GET", "/runner/jobs", endpoint="list-pending")
+
+    assert asyncio.run(run()) == {"ok": True}
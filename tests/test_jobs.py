@@ -1,9 +1,13 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+import hashlib
 import httpx
 import subprocess
 
+from runner.cache import ArtifactCache
 from runner.config import RunnerSettings
-from runner.http import RunnerHttpClient
-from runner.jobs import JobExecutor
+from runner.http import AsyncRunnerHttpClient, RunnerHttpClient
+from runner.jobs import AsyncJobExecutor, JobExecutor
 from runner.types import CompileCaptureOnePayload, Job
 
 
@@ -107,11 +111,15 @@ def test_job_executor_host_mode_opens_artifact_in_captureone(tmp_path, monkeypat
             job_id="job_3",
             job_type="compile_captureone",
             payload=CompileCaptureOnePayload(style_id="style_1", version="v1"),
+            created_at=datetime.now(timezone.utc) - timedelta(seconds=5),
         )
         result = executor.execute(job)
 
     assert result.status == "succeeded"
     assert result.error is None
+    assert set(result.timings) == {"queue_wait", "compile", "download", "write", "host_import"}
+    assert result.timings["queue_wait"] >= 5
+    assert result.timings["download"] >= result.timings["write"]
     assert result.result is not None
     host_info = result.result.get("host_integration")
     assert isinstance(host_info, dict)
@@ -459,3 +467,307 @@ def test_job_executor_host_mode_auto_falls_back_to_open_when_cli_fails(tmp_path,
     assert len(calls) == 2
     assert calls[0][0] == "captureone-cli"
     assert calls[1][:2] == ["open", "-a"]
+
+
+def test_async_job_executor_host_mode_imports_artifact(tmp_path, monkeypatch) -> None:
+    opened = {"cmd": None}
+
+    def fake_run(cmd: list[str], check: bool, timeout: float) -> subprocess.CompletedProcess[str]:
+        opened["cmd"] = cmd
+        return subprocess.CompletedProcess(cmd, 0)
+
+    monkeypatch.setattr("runner.captureone.host.subprocess.run", fake_run)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "POST" and request.url.path == "/styles/style_1/versions/v1/compile":
+            return httpx.Response(
+                200,
+                json={"artifact_id": "artifact_async", "download_url": "/artifacts/artifact_async"},
+            )
+        if request.method == "GET" and request.url.path == "/artifacts/artifact_async":
+            return httpx.Response(200, content=b"<SL Engine='13'>")
+        return httpx.Response(404, json={"detail": "not found"})
+
+    app_dir = tmp_path / "Capture One.app"
+    app_dir.mkdir()
+    import_dir = tmp_path / "imports"
+    settings = RunnerSettings(
+        api_base_url="http://localhost:8000",
+        http_retries=0,
+        execution_mode="host",
+        captureone_app_path=str(app_dir),
+        captureone_import_dir=str(import_dir),
+    )
+    job = Job(
+        job_id="job_async",
+        job_type="compile_captureone",
+        payload=CompileCaptureOnePayload(style_id="style_1", version="v1"),
+    )
+
+    async def run():
+        transport = httpx.MockTransport(handler)
+        async with AsyncRunnerHttpClient(settings, transport=transport) as client:
+            return await AsyncJobExecutor(client, settings=settings).execute(job)
+
+    result = asyncio.run(run())
+
+    assert result.status == "succeeded"
+    assert [log.event for log in result.logs] == ["job_picked_up", "job_running", "job_succeeded"]
+    assert result.result is not None
+    assert result.result["host_integration"]["launch_method"] == "open"
+    assert (import_dir / "artifact_async.costyle").read_bytes() == b"<SL Engine='13'>"
+    assert opened["cmd"] is not None
+
+
+def test_async_job_executor_reports_failure() -> None:
+    def handler(_: httpx.Request) -> httpx.Response:
+        return httpx.Response(500, json={"message": "backend down"})
+
+    settings = RunnerSettings(api_base_url="http://localhost:8000", http_retries=0)
+    job = Job(
+        job_id="job_async_fail",
+        job_type="compile_captureone",
+        payload=CompileCaptureOnePayload(style_id="style_1", version="v1"),
+    )
+
+    async def run():
+        transport = httpx.MockTransport(handler)
+        async with AsyncRunnerHttpClient(settings, transport=transport) as client:
+            return await AsyncJobExecutor(client).execute(job)
+
+    result = asyncio.run(run())
+
+    assert result.status == "failed"
+    assert result.error is not None
+    assert [log.event for log in result.logs] == ["job_picked_up", "job_running", "job_failed"]
+
+
+def test_job_executor_host_mode_reuses_cached_artifact(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(
+        "runner.captureone.host.subprocess.run",
+        lambda cmd, check, timeout: subprocess.CompletedProcess(cmd, 0),
+    )
+    calls: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(f"{request.method} {request.url.path}")
+        if request.method == "POST" and request.url.path == "/styles/style_1/versions/v1/compile":
+            return httpx.Response(
+                200,
+                json={"artifact_id": "artifact_c1", "download_url": "/artifacts/artifact_c1"},
+            )
+        if request.method == "GET" and request.url.path == "/artifacts/artifact_c1":
+            return httpx.Response(200, content=b"<SL Engine='13'>")
+        return httpx.Response(404, json={"detail": "not found"})
+
+    app_dir = tmp_path / "Capture One.app"
+    app_dir.mkdir()
+    import_dir = tmp_path / "imports"
+    settings = RunnerSettings(
+        api_base_url="http://localhost:8000",
+        http_retries=0,
+        execution_mode="host",
+        captureone_app_path=str(app_dir),
+        captureone_import_dir=str(import_dir),
+    )
+    cache = ArtifactCache(tmp_path / "cache", max_bytes=1024 * 1024)
+    with RunnerHttpClient(settings, transport=httpx.MockTransport(handler)) as client:
+        executor = JobExecutor(client, settings=settings, artifact_cache=cache)
+        results = []
+        for job_id in ("job_c1", "job_c2"):
+            job = Job(
+                job_id=job_id,
+                job_type="compile_captureone",
+                payload=CompileCaptureOnePayload(style_id="style_1", version="v1"),
+            )
+            (import_dir / "artifact_c1.costyle").unlink(missing_ok=True)
+            results.append(executor.execute(job))
+
+    assert [result.status for result in results] == ["succeeded", "succeeded"]
+    assert calls == ["POST /styles/style_1/versions/v1/compile", "GET /artifacts/artifact_c1"]
+    assert (import_dir / "artifact_c1.costyle").read_bytes() == b"<SL Engine='13'>"
+    assert results[1].result is not None
+    assert results[1].result["host_integration"]["launch_method"] == "open"
+
+
+def test_job_executor_api_mode_caches_compile_result(tmp_path) -> None:
+    calls = {"count": 0}
+
+    def handler(_: httpx.Request) -> httpx.Response:
+        calls["count"] += 1
+        return httpx.Response(200, json={"artifact_id": "artifact_c2"})
+
+    settings = RunnerSettings(api_base_url="http://localhost:8000", http_retries=0)
+    cache = ArtifactCache(tmp_path / "cache", max_bytes=1024 * 1024)
+    with RunnerHttpClient(settings, transport=httpx.MockTransport(handler)) as client:
+        executor = JobExecutor(client, settings=settings, artifact_cache=cache)
+        job = Job(
+            job_id="job_c3",
+            job_type="compile_captureone",
+            payload=CompileCaptureOnePayload(style_id="style_2", version="v1"),
+        )
+        first = executor.execute(job)
+        second = executor.execute(job)
+
+    assert calls["count"] == 1
+    assert first.result == second.result == {"artifact_id": "artifact_c2"}
+
+
+def test_job_executor_host_mode_rejects_artifact_with_bad_checksum(tmp_path) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "POST" and request.url.path == "/styles/style_1/versions/v1/compile":
+            return httpx.Response(
+                200,
+                json={
+                    "artifact_id": "artifact_400",
+                    "sha256": hashlib.sha256(b"<SL Engine='13'>").hexdigest(),
+                    "download_url": "/artifacts/artifact_400",
+                },
+            )
+        if request.method == "GET" and request.url.path == "/artifacts/artifact_400":
+            return httpx.Response(200, content=b"<SL Engine='13'")
+        return httpx.Response(404, json={"detail": "not found"})
+
+    app_dir = tmp_path / "Capture One.app"
+    app_dir.mkdir()
+    import_dir = tmp_path / "imports"
+    settings = RunnerSettings(
+        api_base_url="http://localhost:8000",
+        http_retries=0,
+        execution_mode="host",
+        captureone_app_path=str(app_dir),
+        captureone_import_dir=str(import_dir),
+    )
+    with RunnerHttpClient(settings, transport=httpx.MockTransport(handler)) as client:
+        executor = JobExecutor(client, settings=settings)
+        job = Job(
+            job_id="job_8",
+            job_type="compile_captureone",
+            payload=CompileCaptureOnePayload(style_id="style_1", version="v1"),
+        )
+        result = executor.execute(job)
+
+    assert result.status == "failed"
+    assert result.result is not None
+    host_info = result.result.get("host_integration")
+    assert isinstance(host_info, dict)
+    assert host_info["error_code"] == "DOWNLOAD_FAILED"
+    assert list(import_dir.iterdir()) == []
+
+
+def test_job_executor_host_mode_recompiles_when_cached_download_url_is_stale(
+    tmp_path, monkeypatch
+) -> None:
+    monkeypatch.setattr(
+        "runner.captureone.host.subprocess.run",
+        lambda cmd, check, timeout: subprocess.CompletedProcess(cmd, 0),
+    )
+    calls: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(f"{request.method} {request.url.path}")
+        if request.method == "POST" and request.url.path == "/styles/style_1/versions/v1/compile":
+            return httpx.Response(
+                200,
+                json={"artifact_id": "artifact_c9", "download_url": "/artifacts/fresh"},
+            )
+        if request.method == "GET" and request.url.path == "/artifacts/fresh":
+            return httpx.Response(200, content=b"<SL Engine='13'>")
+        return httpx.Response(404, json={"detail": "not found"})
+
+    app_dir = tmp_path / "Capture One.app"
+    app_dir.mkdir()
+    import_dir = tmp_path / "imports"
+    settings = RunnerSettings(
+        api_base_url="http://localhost:8000",
+        http_retries=0,
+        execution_mode="host",
+        captureone_app_path=str(app_dir),
+        captureone_import_dir=str(import_dir),
+    )
+    cache = ArtifactCache(tmp_path / "cache", max_bytes=1024 * 1024)
+    # An entry whose blob was evicted and whose download URL has since expired.
+    cache.put_result(
+        "style_1",
+        "v1",
+        "captureone",
+        {"artifact_id": "artifact_c9", "download_url": "/artifacts/expired"},
+    )
+    job = Job(
+        job_id="job_c9",
+        job_type="compile_captureone",
+        payload=CompileCaptureOnePayload(style_id="style_1", version="v1"),
+    )
+    with RunnerHttpClient(settings, transport=httpx.MockTransport(handler)) as client:
+        result = JobExecutor(client, settings=settings, artifact_cache=cache).execute(job)
+
+    assert result.status == "succeeded"
+    assert calls == [
+        "GET /artifacts/expired",
+        "POST /styles/style_1/versions/v1/compile",
+        "GET /artifacts/fresh",
+    ]
+    cached = cache.get("style_1", "v1", "captureone")
+    assert cached is not None
+    assert cached.compile_result["download_url"] == "/artifacts/fresh"
+    assert cached.artifact_path is not None
+
+
+def test_async_job_executor_recompiles_when_cached_download_url_is_stale(
+    tmp_path, monkeypatch
+) -> None:
+    monkeypatch.setattr(
+        "runner.captureone.host.subprocess.run",
+        lambda cmd, check, timeout: subprocess.CompletedProcess(cmd, 0),
+    )
+    calls: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(f"{request.method} {request.url.path}")
+        if request.method == "POST":
+            return httpx.Response(
+                200,
+                json={"artifact_id": "artifact_c10", "download_url": "/artifacts/fresh"},
+            )
+        if request.url.path == "/artifacts/fresh":
+            return httpx.Response(200, content=b"<SL Engine='13'>")
+        return httpx.Response(404, json={"detail": "not found"})
+
+    app_dir = tmp_path / "Capture One.app"
+    app_dir.mkdir()
+    settings = RunnerSettings(
+        api_base_url="http://localhost:8000",
+        http_retries=0,
+        execution_mode="host",
+        captureone_app_path=str(app_dir),
+        captureone_import_dir=str(tmp_path / "imports"),
+    )
+    cache = ArtifactCache(tmp_path / "cache", max_bytes=1024 * 1024)
+    cache.put_result(
+        "style_1",
+        "v1",
+        "captureone",
+        {"artifact_id": "artifact_c10", "download_url": "/artifacts/expired"},
+    )
+    job = Job(
+        job_id="job_c10",
+        job_type="compile_captureone",
+        payload=CompileCaptureOnePayload(style_id="style_1", version="v1"),
+    )
+
+    async def run():
+        async with AsyncRunnerHttpClient(
+            settings, transport=httpx.MockTransport(handler)
+        ) as client:
+            return await AsyncJobExecutor(client, settings=settings, artifact_cache=cache).execute(
+                job
+            )
+
+    result = asyncio.run(run())
+
+    assert result.status == "succeeded"
+    assert calls == [
+        "GET /artifacts/expired",
+        "POST /styles/style_1/versions/v1/compile",
+        "GET /artifacts/fresh",
+    ]
@@ -0,0 +1,126 @@
+import urllib.error
+import urllib.request
+
+import httpx
+import pytest
+
+from runner.config import RunnerSettings
+from runner.http import RunnerHttpClient
+from runner.jobs import JobExecutor
+from runner.metrics import (
+    HTTP_REQUEST_SECONDS,
+    JOBS_TOTAL,
+    MergedMetrics,
+    MetricsRegistry,
+    MetricsServer,
+)
+from runner.types import CompileCaptureOnePayload, Job
+
+
+def test_registry_renders_prometheus_text() -> None:
+    registry = MetricsRegistry()
+    jobs = registry.counter("jobs_total", "Jobs.", ("status",))
+    latency = registry.histogram("latency_seconds", "Latency.", ("endpoint",), buckets=(0.1, 1.0))
+
+    jobs.inc(status="succeeded")
+    jobs.inc(2, status='fa"iled')
+    latency.observe(0.05, endpoint="claim-job")
+    latency.observe(0.5, endpoint="claim-job")
+    latency.observe(3.0, endpoint="claim-job")
+
+    text = registry.render()
+
+    assert "# TYPE jobs_total counter" in text
+    assert 'jobs_total{status="succeeded"} 1' in text
+    assert 'jobs_total{status="fa\\"iled"} 2' in text
+    assert "# TYPE latency_seconds histogram" in text
+    assert 'latency_seconds_bucket{endpoint="claim-job",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{endpoint="claim-job",le="1"} 2' in text
+    assert 'latency_seconds_bucket{endpoint="claim-job",le="+Inf"} 3' in text
+    assert 'latency_seconds_sum{endpoint="claim-job"} 3.55' in text
+    assert 'latency_seconds_count{endpoint="claim-job"} 3' in text
+
+
+def test_registry_rejects_conflicting_registration_and_labels() -> None:
+    registry = MetricsRegistry()
+    counter = registry.counter("jobs_total", "Jobs.", ("status",))
+    assert registry.counter("jobs_total", "Jobs.", ("status",)) is counter
+
+    with pytest.raises(ValueError, match="already registered"):
+        registry.histogram("jobs_total", "Jobs.", ("status",))
+    with pytest.raises(ValueError, match="Expected labels"):
+        counter.inc(state="succeeded")
+
+
+def test_histogram_time_observes_failed_blocks() -> None:
+    histogram = MetricsRegistry().histogram("phase_seconds", "Phases.", ("phase",))
+
+    with pytest.raises(RuntimeError):
+        with histogram.time(phase="launch"):
+            raise RuntimeError("boom")
+
+    assert histogram.count(phase="launch") == 1
+
+
+def test_metrics_server_serves_registry() -> None:
+    registry = MetricsRegistry()
+    registry.counter("jobs_total", "Jobs.").inc()
+    server = MetricsServer(port=0, registry=registry).start()
+    try:
+        url = f"http://127.0.0.1:{server.port}"
+        with urllib.request.urlopen(f"{url}/metrics", timeout=5) as response:
+            assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+            assert "jobs_total 1" in response.read().decode("utf-8")
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f"{url}/other", timeout=5)
+    finally:
+        server.close()
+
+
+def test_http_client_and_executor_record_metrics() -> None:
+    def handler(_: httpx.Request) -> httpx.Response:
+        return httpx.Response(500, json={"message": "backend down"})
+
+    settings = RunnerSettings(http_retries=0, http_breaker_failure_threshold=0)
+    errors_before = HTTP_REQUEST_SECONDS.count(endpoint="compile", outcome="error")
+    failed_before = JOBS_TOTAL.value(
+        job_type="compile_captureone", status="failed", error_code="RunnerHttpError"
+    )
+    with RunnerHttpClient(settings, transport=httpx.MockTransport(handler)) as client:
+        JobExecutor(client).execute(
+            Job(
+                job_id="job_1",
+                job_type="compile_captureone",
+                payload=CompileCaptureOnePayload(style_id="style_1", version="v1"),
+            )
+        )
+
+    assert HTTP_REQUEST_SECONDS.count(endpoint="compile", outcome="error") == errors_before + 1
+    assert (
+        JOBS_TOTAL.value(
+            job_type="compile_captureone", status="failed", error_code="RunnerHttpError"
+        )
+        == failed_before + 1
+    )
+
+
+def test_merged_metrics_sum_sources_and_keep_retired_totals() -> None:
+    child = MetricsRegistry()
+    jobs = child.counter("jobs_total", "Jobs.", ("status",))
+    latency = child.histogram("latency_seconds", "Latency.", buckets=(1.0,))
+    jobs.inc(status="succeeded")
+    latency.observe(0.5)
+    local = MetricsRegistry()
+    local.counter("restarts_total", "Restarts.").inc()
+    merged = MergedMetrics(local)
+
+    merged.update("a", child.snapshot())
+    merged.update("b", child.snapshot())
+    merged.retire("a")
+    merged.update("a", child.snapshot())
+    text = merged.render()
+
+    assert 'jobs_total{status="succeeded"} 2' in text
+    assert 'latency_seconds_bucket{le="1"} 2' in text
+    assert "latency_seconds_count 2" in text
+    assert "restarts_total 1" in text
@@ -1,18 +1,34 @@
-from runner.poller import RunnerPoller
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from runner.poller import AsyncRunnerPoller, PollBackoff, RunnerPoller
+from runner.scheduler import LaneScheduler
 from runner.types import CompileCaptureOnePayload, Job, JobExecutionResult, JobLog
 
 
 class FakeApi:
+    long_poll_active = False
+
     def __init__(self, jobs: list[Job]) -> None:
         self._jobs = jobs
         self.claimed: list[str] = []
         self.heartbeats: list[tuple[str, str]] = []
         self.completed: list[JobExecutionResult] = []
+        self.completion_batches: list[list[str]] = []
 
-    def list_pending_jobs(self, *, limit: int = 1) -> list[Job]:
+    def list_pending_jobs(self, *, limit: int = 1, long_poll: bool = True) -> list[Job]:
         if not self._jobs:
             return []
-        return [self._jobs.pop(0)][:limit]
+        batch = self._jobs[:limit]
+        del self._jobs[:limit]
+        return batch
+
+    def claim_next_jobs(self, *, limit: int = 1, long_poll: bool = True) -> list[Job] | None:
+        return None
 
     def claim_job(self, job_id: str) -> None:
         self.claimed.append(job_id)
@@ -26,9 +42,18 @@ class FakeApi:
     def heartbeat_job(self, job_id: str, status: str) -> None:
         self.heartbeats.append((job_id, status))
 
+    def heartbeat_jobs(self, job_ids: list[str], status: str) -> None:
+        for job_id in job_ids:
+            self.heartbeat_job(job_id, status)
+
     def complete_job(self, result: JobExecutionResult) -> None:
         self.completed.append(result)
 
+    def complete_jobs(self, results: list[JobExecutionResult]) -> list[JobExecutionResult]:
+        self.completion_batches.append([result.job_id for result in results])
+        self.completed.extend(results)
+        return []
+
 
 class FakeExecutor:
     def __init__(self) -> None:
@@ -100,6 +125,7 @@ def test_poller_poll_once_processes_one_job() -> None:
     assert api.claimed == ["job_1"]
     assert api.heartbeats == [("job_1", "running")]
     assert len(api.completed) == 1
+    assert set(api.completed[0].timings) == {"claim"}
     assert len(emitted) == 1
 
 
@@ -131,3 +157,991 @@ def test_poller_run_job_id_processes_specific_job() -> None:
     assert api.heartbeats == [("job_9", "running")]
     assert len(api.completed) == 1
     assert len(emitted) == 1
+
+
+def test_poller_poll_batch_executes_jobs_concurrently() -> None:
+    api = FakeApi(
+        jobs=[
+            Job(
+                job_id=f"job_{index}",
+                job_type="compile_captureone",
+                payload=CompileCaptureOnePayload(style_id="s1", version="v1"),
+            )
+            for index in range(3)
+        ]
+    )
+    barrier = threading.Barrier(3, timeout=5)
+
+    class BlockingExecutor(FakeExecutor):
+        def execute(self, job: Job) -> JobExecutionResult:
+            barrier.wait()
+            return super().execute(job)
+
+    executor = BlockingExecutor()
+    emitted: list[str] = []
+    poller = RunnerPoller(
+        api,
+        executor,
+        poll_interval_seconds=0.01,
+        workers=3,
+        sleep=lambda _: None,
+        emit=emitted.append,
+    )
+
+    results = poller.poll_batch()
+
+    assert [result.job_id for result in results] == ["job_0", "job_1", "job_2"]
+    assert sorted(executor.executed) == ["job_0", "job_1", "job_2"]
+    assert sorted(api.claimed) == ["job_0", "job_1", "job_2"]
+    assert len(api.completed) == 3
+    assert len(emitted) == 3
+
+
+def test_poller_rejects_non_positive_workers() -> None:
+    with pytest.raises(ValueError, match="workers"):
+        RunnerPoller(FakeApi(jobs=[]), FakeExecutor(), poll_interval_seconds=0.01, workers=0)
+
+
+class FakeAsyncApi:
+    long_poll_active = False
+
+    def __init__(self, jobs: list[Job]) -> None:
+        self._sync = FakeApi(jobs)
+
+    async def list_pending_jobs(self, *, limit: int = 1, long_poll: bool = True) -> list[Job]:
+        return self._sync.list_pending_jobs(limit=limit, long_poll=long_poll)
+
+    async def claim_next_jobs(self, *, limit: int = 1, long_poll: bool = True) -> list[Job] | None:
+        return self._sync.claim_next_jobs(limit=limit, long_poll=long_poll)
+
+    async def claim_job(self, job_id: str) -> None:
+        self._sync.claim_job(job_id)
+
+    async def get_job(self, job_id: str) -> Job:
+        return self._sync.get_job(job_id)
+
+    async def heartbeat_job(self, job_id: str, status: str) -> None:
+        self._sync.heartbeat_job(job_id, status)
+
+    async def complete_job(self, result: JobExecutionResult) -> None:
+        self._sync.complete_job(result)
+
+
+class FakeAsyncExecutor:
+    def __init__(self) -> None:
+        self._sync = FakeExecutor()
+        self.max_in_flight = 0
+        self._in_flight = 0
+
+    async def execute(self, job: Job) -> JobExecutionResult:
+        self._in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        await asyncio.sleep(0)
+        self._in_flight -= 1
+        return self._sync.execute(job)
+
+
+def test_async_poller_poll_batch_runs_jobs_on_one_loop() -> None:
+    api = FakeAsyncApi(
+        jobs=[
+            Job(
+                job_id=f"job_{index}",
+                job_type="compile_captureone",
+                payload=CompileCaptureOnePayload(style_id="s1", version="v1"),
+            )
+            for index in range(4)
+        ]
+    )
+    executor = FakeAsyncExecutor()
+    emitted: list[str] = []
+    poller = AsyncRunnerPoller(
+        api,
+        executor,
+        poll_interval_seconds=0.01,
+        workers=4,
+        emit=emitted.append,
+    )
+
+    results = asyncio.run(poller.poll_batch())
+
+    assert [result.job_id for result in results] == ["job_0", "job_1", "job_2", "job_3"]
+    assert executor.max_in_flight == 4
+    assert api._sync.claimed == ["job_0", "job_1", "job_2", "job_3"]
+    assert len(api._sync.completed) == 4
+    assert len(emitted) == 4
+
+
+def test_async_poller_poll_once_no_jobs_returns_none() -> None:
+    poller = AsyncRunnerPoller(
+        FakeAsyncApi(jobs=[]), FakeAsyncExecutor(), poll_interval_seconds=0.01
+    )
+
+    assert asyncio.run(poller.poll_once()) is None
+
+
+def test_poll_backoff_grows_when_idle_and_resets_on_work() -> None:
+    backoff = PollBackoff(min_seconds=1.0, max_seconds=6.0, jitter=lambda _low, high: high)
+
+    idle_delays = [backoff.next_delay(found_work=False) for _ in range(4)]
+    busy_delay = backoff.next_delay(found_work=True)
+    after_reset = backoff.next_delay(found_work=False)
+
+    assert idle_delays == [2.0, 4.0, 6.0, 6.0]
+    assert busy_delay == 0.0
+    assert after_reset == 2.0
+
+
+def test_poll_backoff_jitter_stays_within_bounds() -> None:
+    backoff = PollBackoff(min_seconds=0.5, max_seconds=4.0)
+
+    delays = [backoff.next_delay(found_work=False) for _ in range(50)]
+
+    assert all(0.5 <= delay <= 4.0 for delay in delays)
+
+
+def test_poller_poll_forever_repolls_immediately_after_pickup() -> None:
+    class StopPolling(Exception):
+        pass
+
+    api = FakeApi(
+        jobs=[
+            Job(
+                job_id=f"job_{index}",
+                job_type="compile_captureone",
+                payload=CompileCaptureOnePayload(style_id="s1", version="v1"),
+            )
+            for index in range(2)
+        ]
+    )
+    executor = FakeExecutor()
+    sleeps: list[float] = []
+
+    def fake_sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+        if len(sleeps) == 2:
+            raise StopPolling
+
+    poller = RunnerPoller(
+        api,
+        executor,
+        poll_interval_seconds=1.0,
+        max_poll_interval_seconds=10.0,
+        sleep=fake_sleep,
+        emit=lambda _: None,
+    )
+
+    with pytest.raises(StopPolling):
+        poller.poll_forever()
+
+    assert executor.executed == ["job_0", "job_1"]
+    assert len(sleeps) == 2
+    assert 1.0 <= sleeps[0] <= 2.0
+    assert 1.0 <= sleeps[1] <= 4.0
+
+
+def test_poller_skips_sleep_when_backend_holds_long_poll() -> None:
+    class StopPolling(Exception):
+        pass
+
+    class LongPollApi(FakeApi):
+        long_poll_active = True
+
+        def __init__(self) -> None:
+            super().__init__(jobs=[])
+            self.polls = 0
+
+        def list_pending_jobs(self, *, limit: int = 1, long_poll: bool = True) -> list[Job]:
+            self.polls += 1
+            if self.polls == 3:
+                raise StopPolling
+            return []
+
+    api = LongPollApi()
+    sleeps: list[float] = []
+    poller = RunnerPoller(
+        api,
+        FakeExecutor(),
+        poll_interval_seconds=1.0,
+        sleep=sleeps.append,
+        emit=lambda _: None,
+    )
+
+    with pytest.raises(StopPolling):
+        poller.poll_forever()
+
+    assert api.polls == 3
+    assert sleeps == []
+
+
+def test_poller_uses_claim_next_without_separate_claim() -> None:
+    class ClaimNextApi(FakeApi):
+        def __init__(self, jobs: list[Job]) -> None:
+            super().__init__(jobs)
+            self.listed = 0
+
+        def claim_next_jobs(self, *, limit: int = 1, long_poll: bool = True) -> list[Job] | None:
+            batch = self._jobs[:limit]
+            del self._jobs[:limit]
+            return batch
+
+        def list_pending_jobs(self, *, limit: int = 1, long_poll: bool = True) -> list[Job]:
+            self.listed += 1
+            return super().list_pending_jobs(limit=limit, long_poll=long_poll)
+
+    api = ClaimNextApi(
+        jobs=[
+            Job(
+                job_id=f"job_{index}",
+                job_type="compile_captureone",
+                payload=CompileCaptureOnePayload(style_id="s1", version="v1"),
+            )
+            for index in range(2)
+        ]
+    )
+    executor = FakeExecutor()
+    poller = RunnerPoller(
+        api,
+        executor,
+        poll_interval_seconds=0.01,
+        workers=2,
+        sleep=lambda _: None,
+        emit=lambda _: None,
+    )
+
+    results = poller.poll_batch()
+
+    assert [result.job_id for result in results] == ["job_0", "job_1"]
+    assert api.claimed == []
+    assert api.listed == 0
+    assert sorted(job_id for job_id, _ in api.heartbeats) == ["job_0", "job_1"]
+
+
+def test_poller_renews_lease_while_job_executes() -> None:
+    api = FakeApi(
+        jobs=[
+            Job(
+                job_id="job_slow",
+                job_type="compile_captureone",
+                payload=CompileCaptureOnePayload(style_id="s1", version="v1"),
+            )
+        ]
+    )
+
+    class SlowExecutor(FakeExecutor):
+        def execute(self, job: Job) -> JobExecutionResult:
+            for _ in range(500):
+                if len(api.heartbeats) >= 3:
+                    break
+                time.sleep(0.01)
+            return super().execute(job)
+
+    poller = RunnerPoller(
+        api,
+        SlowExecutor(),
+        poll_interval_seconds=0.01,
+        heartbeat_interval_seconds=0.01,
+        sleep=lambda _: None,
+        emit=lambda _: None,
+    )
+
+    result = poller.poll_once()
+    heartbeats_after_completion = len(api.heartbeats)
+    time.sleep(0.05)
+    poller.close()
+
+    assert result is not None
+    assert heartbeats_after_completion >= 3
+    assert set(api.heartbeats) == {("job_slow", "running")}
+    assert len(api.heartbeats) == heartbeats_after_completion
+
+
+def test_poller_buffers_completions_into_batches() -> None:
+    jobs = [
+        Job(
+            job_id=f"job_{index}",
+            job_type="compile_captureone",
+            payload=CompileCaptureOnePayload(style_id="s1", version="v1"),
+        )
+        for index in range(3)
+    ]
+    api = FakeApi(jobs=jobs)
+    emitted: list[str] = []
+    poller = RunnerPoller(
+        api,
+        FakeExecutor(),
+        poll_interval_seconds=0.01,
+        completion_batch_size=2,
+        completion_flush_interval_seconds=60,
+        sleep=lambda _: None,
+        emit=emitted.append,
+    )
+
+    for _ in range(3):
+        poller.poll_once()
+    assert api.completion_batches == [["job_0", "job_1"]]
+    assert len(emitted) == 3
+
+    poller.close()
+
+    assert api.completion_batches == [["job_0", "job_1"], ["job_2"]]
+    assert [result.job_id for result in api.completed] == ["job_0", "job_1", "job_2"]
+
+
+def test_poller_stop_drains_in_flight_jobs_and_returns() -> None:
+    api = FakeApi(
+        jobs=[
+            Job(
+                job_id=f"job_{index}",
+                job_type="compile_captureone",
+                payload=CompileCaptureOnePayload(style_id="s1", version="v1"),
+            )
+            for index in range(2)
+        ]
+    )
+    started = threading.Event()
+    release = threading.Event()
+
+    class BlockingExecutor(FakeExecutor):
+        def execute(self, job: Job) -> JobExecutionResult:
+            started.set()
+            release.wait(timeout=5)
+            return super().execute(job)
+
+    poller = RunnerPoller(
+        api,
+        BlockingExecutor(),
+        poll_interval_seconds=0.01,
+        workers=2,
+        sleep=lambda _: None,
+        emit=lambda _: None,
+    )
+    thread = threading.Thread(target=poller.poll_forever)
+    thread.start()
+    assert started.wait(timeout=5)
+
+    poller.stop()
+    release.set()
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert sorted(result.job_id for result in api.completed) == ["job_0", "job_1"]
+
+
+class PrefetchApi(FakeApi):
+    def __init__(self, jobs: list[Job]) -> None:
+        super().__init__(jobs)
+        self.claim_limits: list[int] = []
+        self.released: list[str] = []
+
+    def claim_next_jobs(self, *, limit: int = 1, long_poll: bool = True) -> list[Job] | None:
+        self.claim_limits.append(limit)
+        batch = self._jobs[:limit]
+        del self._jobs[:limit]
+        return batch
+
+    def release_job(self, job_id: str) -> bool:
+        self.released.append(job_id)
+        return True
+
+
+def _jobs(count: int) -> list[Job]:
+    return [
+        Job(
+            job_id=f"job_{index}",
+            job_type="compile_captureone",
+            payload=CompileCaptureOnePayload(style_id="s1", version="v1"),
+        )
+        for index in range(count)
+    ]
+
+
+def test_pipelined_poller_prefetches_and_releases_unstarted_jobs_on_stop() -> None:
+    api = PrefetchApi(jobs=_jobs(5))
+    started = threading.Event()
+    release = threading.Event()
+
+    class BlockingExecutor(FakeExecutor):
+        def execute(self, job: Job) -> JobExecutionResult:
+            started.set()
+            release.wait(timeout=5)
+            return super().execute(job)
+
+    executor = BlockingExecutor()
+    poller = RunnerPoller(
+        api,
+        executor,
+        poll_interval_seconds=0.01,
+        prefetch_depth=2,
+        sleep=lambda _: None,
+        emit=lambda _: None,
+    )
+    thread = threading.Thread(target=poller.poll_forever)
+    thread.start()
+    assert started.wait(timeout=5)
+
+    poller.stop()
+    release.set()
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert api.claim_limits == [3]
+    assert executor.executed == ["job_0"]
+    assert [result.job_id for result in api.completed] == ["job_0"]
+    assert api.released == ["job_1", "job_2"]
+
+
+def test_pipelined_poller_reports_every_job_in_order_before_returning() -> None:
+    api = PrefetchApi(jobs=_jobs(4))
+    emitted: list[str] = []
+
+    class StoppingExecutor(FakeExecutor):
+        def execute(self, job: Job) -> JobExecutionResult:
+            if job.job_id == "job_3":
+                poller.stop()
+            return super().execute(job)
+
+    poller = RunnerPoller(
+        api,
+        StoppingExecutor(),
+        poll_interval_seconds=0.01,
+        prefetch_depth=1,
+        sleep=lambda _: None,
+        emit=emitted.append,
+    )
+
+    poller.poll_forever()
+
+    assert [result.job_id for result in api.completed] == ["job_0", "job_1", "job_2", "job_3"]
+    assert len(emitted) == 4
+    assert api.released == []
+
+
+def test_pipelined_poller_reports_completion_failures_instead_of_raising() -> None:
+    class FailingApi(PrefetchApi):
+        def complete_job(self, result: JobExecutionResult) -> None:
+            raise RuntimeError("backend down")
+
+    api = FailingApi(jobs=_jobs(1))
+    emitted: list[str] = []
+    poller = RunnerPoller(
+        api,
+        FakeExecutor(),
+        poll_interval_seconds=0.01,
+        prefetch_depth=1,
+        sleep=lambda _: poller.stop(),
+        emit=emitted.append,
+    )
+
+    poller.poll_forever()
+
+    assert any('"event":"completion_failed"' in line for line in emitted)
+
+
+def test_async_pipelined_poller_prefetches_and_releases_on_stop() -> None:
+    sync_api = PrefetchApi(jobs=_jobs(4))
+
+    class AsyncPrefetchApi(FakeAsyncApi):
+        def __init__(self) -> None:
+            self._sync = sync_api
+
+        async def release_job(self, job_id: str) -> bool:
+            return sync_api.release_job(job_id)
+
+    class StoppingExecutor(FakeAsyncExecutor):
+        async def execute(self, job: Job) -> JobExecutionResult:
+            poller.stop()
+            return await super().execute(job)
+
+    poller = AsyncRunnerPoller(
+        AsyncPrefetchApi(),
+        StoppingExecutor(),
+        poll_interval_seconds=0.01,
+        prefetch_depth=2,
+        emit=lambda _: None,
+    )
+
+    asyncio.run(poller.poll_forever())
+
+    assert sync_api.claim_limits == [3]
+    assert [result.job_id for result in sync_api.completed] == ["job_0"]
+    assert sync_api.released == ["job_1", "job_2"]
+
+
+def test_poller_rejects_negative_prefetch_depth() -> None:
+    with pytest.raises(ValueError, match="prefetch_depth"):
+        RunnerPoller(
+            FakeApi(jobs=[]), FakeExecutor(), poll_interval_seconds=0.01, prefetch_depth=-1
+        )
+
+
+def test_poller_stop_abandons_jobs_past_the_grace_deadline() -> None:
+    api = PrefetchApi(jobs=_jobs(1))
+    started = threading.Event()
+    release = threading.Event()
+
+    class BlockingExecutor(FakeExecutor):
+        def execute(self, job: Job) -> JobExecutionResult:
+            started.set()
+            release.wait(timeout=5)
+            return super().execute(job)
+
+    emitted: list[str] = []
+    poller = RunnerPoller(
+        api,
+        BlockingExecutor(),
+        poll_interval_seconds=0.01,
+        shutdown_grace_seconds=0.05,
+        emit=emitted.append,
+    )
+    thread = threading.Thread(target=poller.poll_forever)
+    thread.start()
+    assert started.wait(timeout=5)
+
+    poller.stop("SIGTERM")
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    release.set()
+    time.sleep(0.05)
+    poller.close()
+
+    assert api.released == ["job_0"]
+    assert api.completed == []
+    summary = json.loads(emitted[-1])
+    assert summary["event"] == "runner_stopped"
+    assert summary["level"] == "error"
+    assert summary["reason"] == "SIGTERM"
+    assert summary["abandoned_job_ids"] == ["job_0"]
+
+
+def test_poller_close_after_stop_emits_drain_summary() -> None:
+    api = PrefetchApi(jobs=_jobs(2))
+    emitted: list[str] = []
+
+    class StoppingExecutor(FakeExecutor):
+        def execute(self, job: Job) -> JobExecutionResult:
+            poller.stop("SIGINT")
+            return super().execute(job)
+
+    poller = RunnerPoller(
+        api,
+        StoppingExecutor(),
+        poll_interval_seconds=0.01,
+        workers=2,
+        completion_batch_size=10,
+        shutdown_grace_seconds=5,
+        emit=emitted.append,
+    )
+
+    poller.poll_forever()
+    poller.close()
+
+    summary = json.loads(emitted[-1])
+    assert summary["level"] == "info"
+    assert summary["reason"] == "SIGINT"
+    assert sorted(summary["drained_job_ids"]) == ["job_0", "job_1"]
+    assert summary["abandoned_job_ids"] == []
+    assert summary["completions_flushed"] == 2
+    assert sorted(result.job_id for result in api.completed) == ["job_0", "job_1"]
+
+
+def test_poller_stop_interrupts_idle_sleep() -> None:
+    poller = RunnerPoller(
+        FakeApi(jobs=[]), FakeExecutor(), poll_interval_seconds=60, emit=lambda _: None
+    )
+    thread = threading.Thread(target=poller.poll_forever)
+    thread.start()
+    time.sleep(0.05)
+
+    poller.stop()
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+
+
+def test_async_poller_cancels_jobs_past_the_grace_deadline() -> None:
+    sync_api = PrefetchApi(jobs=_jobs(1))
+    emitted: list[str] = []
+
+    class AsyncPrefetchApi(FakeAsyncApi):
+        def __init__(self) -> None:
+            self._sync = sync_api
+
+        async def release_job(self, job_id: str) -> bool:
+            return sync_api.release_job(job_id)
+
+    class HangingExecutor(FakeAsyncExecutor):
+        async def execute(self, job: Job) -> JobExecutionResult:
+            poller.stop("SIGTERM")
+            await asyncio.sleep(60)
+            return await super().execute(job)
+
+    poller = AsyncRunnerPoller(
+        AsyncPrefetchApi(),
+        HangingExecutor(),
+        poll_interval_seconds=0.01,
+        shutdown_grace_seconds=0.05,
+        emit=emitted.append,
+    )
+
+    async def run() -> None:
+        await asyncio.wait_for(poller.poll_forever(), timeout=5)
+        await poller.aclose()
+
+    asyncio.run(run())
+
+    assert sync_api.released == ["job_0"]
+    assert sync_api.completed == []
+    summary = json.loads(emitted[-1])
+    assert summary["abandoned_job_ids"] == ["job_0"]
+    assert summary["reason"] == "SIGTERM"
+
+
+def test_async_poller_stop_interrupts_idle_sleep() -> None:
+    poller = AsyncRunnerPoller(
+        FakeAsyncApi(jobs=[]), FakeAsyncExecutor(), poll_interval_seconds=60, emit=lambda _: None
+    )
+
+    async def run() -> None:
+        task = asyncio.create_task(poller.poll_forever())
+        await asyncio.sleep(0.05)
+        poller.stop()
+        await asyncio.wait_for(task, timeout=5)
+
+    asyncio.run(run())
+
+
+def test_poller_claims_only_what_the_shared_slots_grant() -> None:
+    api = PrefetchApi(jobs=_jobs(3))
+
+    class OneSlot:
+        def __init__(self) -> None:
+            self.held: list[int] = []
+
+        def reserve(self, held: int, wanted: int) -> int:
+            self.held.append(held)
+            return max(0, min(wanted, 1 - held))
+
+        def settle(self, held: int) -> None:
+            self.held.append(held)
+
+    class StoppingExecutor(FakeExecutor):
+        def execute(self, job: Job) -> JobExecutionResult:
+            if job.job_id == "job_2":
+                poller.stop()
+            return super().execute(job)
+
+    slots = OneSlot()
+    poller = RunnerPoller(
+        api,
+        StoppingExecutor(),
+        poll_interval_seconds=0.01,
+        workers=3,
+        slots=slots,
+        emit=lambda _: None,
+    )
+
+    poller.poll_forever()
+
+    assert set(api.claim_limits) == {1}
+    assert [result.job_id for result in api.completed] == ["job_0", "job_1", "job_2"]
+    assert max(slots.held) == 1
+    assert slots.held[-1] == 0
+
+
+class ListingApi(FakeApi):
+    """Listing leaves jobs pending until they are claimed, like the real backend."""
+
+    def __init__(self, jobs: list[Job]) -> None:
+        super().__init__(jobs)
+        self.list_limits: list[int] = []
+
+    def list_pending_jobs(self, *, limit: int = 1, long_poll: bool = True) -> list[Job]:
+        self.list_limits.append(limit)
+        return self._jobs[:limit]
+
+    def claim_job(self, job_id: str) -> None:
+        super().claim_job(job_id)
+        self._jobs = [job for job in self._jobs if job.job_id != job_id]
+
+
+class RacingApi(ListingApi):
+    """Another runner claims ``job_1`` between listing and claiming it.
+
+    Claims of jobs no longer pending fail as well, as on the real backend.
+    """
+
+    def __init__(self, jobs: list[Job]) -> None:
+        super().__init__(jobs)
+        self._lock = threading.Lock()
+
+    def claim_job(self, job_id: str) -> None:
+        with self._lock:
+            pending = any(job.job_id == job_id for job in self._jobs)
+            if job_id == "job_1" or not pending:
+                self._jobs = [job for job in self._jobs if job.job_id != job_id]
+                raise RuntimeError("409 Conflict: job already claimed")
+            super().claim_job(job_id)
+
+
+def _failure_events(emitted: list[str]) -> list[tuple[str, list[str]]]:
+    lines = [json.loads(line) for line in emitted]
+    return [(line["event"], line["job_ids"]) for line in lines if "job_ids" in line]
+
+
+def test_pooled_poller_logs_a_lost_claim_race_and_keeps_polling() -> None:
+    api = RacingApi(jobs=_jobs(3))
+    emitted: list[str] = []
+    errors: list[BaseException] = []
+    poller = RunnerPoller(
+        api,
+        FakeExecutor(),
+        poll_interval_seconds=0.01,
+        workers=2,
+        emit=emitted.append,
+    )
+
+    def run() -> None:
+        try:
+            poller.poll_forever()
+        except BaseException as exc:
+            errors.append(exc)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    deadline = time.monotonic() + 5
+    while len(api.completed) < 2 and thread.is_alive() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    poller.stop()
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert errors == []
+    assert sorted(result.job_id for result in api.completed) == ["job_0", "job_2"]
+    failures = _failure_events(emitted)
+    assert ("job_run_failed", ["job_1"]) in failures
+    assert {event for event, _ in failures} == {"job_run_failed"}
+
+
+def test_async_pooled_poller_logs_a_lost_claim_race_and_keeps_polling() -> None:
+    api = FakeAsyncApi([])
+    api._sync = RacingApi(jobs=_jobs(3))
+    emitted: list[str] = []
+    poller = AsyncRunnerPoller(
+        api,
+        FakeAsyncExecutor(),
+        poll_interval_seconds=0.01,
+        workers=2,
+        emit=emitted.append,
+    )
+
+    async def run() -> None:
+        task = asyncio.create_task(poller.poll_forever())
+        deadline = time.monotonic() + 5
+        while len(api._sync.completed) < 2 and not task.done() and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        poller.stop()
+        await asyncio.wait_for(task, timeout=5)
+
+    asyncio.run(run())
+
+    assert sorted(result.job_id for result in api._sync.completed) == ["job_0", "job_2"]
+    failures = _failure_events(emitted)
+    assert ("job_run_failed", ["job_1"]) in failures
+    assert {event for event, _ in failures} == {"job_run_failed"}
+
+
+def _scheduled_job(job_id: str, mode: str = "api", priority: str = "normal") -> Job:
+    return Job(
+        job_id=job_id,
+        job_type="compile_captureone",
+        payload=CompileCaptureOnePayload(style_id="s1", version="v1", execution_mode=mode),
+        priority=priority,
+    )
+
+
+def test_poller_lookahead_picks_by_priority_and_lane_limits() -> None:
+    api = ListingApi(
+        jobs=[
+            _scheduled_job("h1", "host"),
+            _scheduled_job("h2", "host"),
+            _scheduled_job("low", priority="low"),
+            _scheduled_job("a1", priority="high"),
+        ]
+    )
+    poller = RunnerPoller(
+        api,
+        FakeExecutor(),
+        poll_interval_seconds=0.01,
+        workers=2,
+        scheduler=LaneScheduler({"compile_captureone:host": 1}),
+        lookahead=2,
+        emit=lambda _: None,
+    )
+
+    batch = poller.poll_batch()
+    single = poller.poll_once()
+
+    assert api.list_limits == [4, 2]
+    assert sorted(result.job_id for result in batch) == ["a1", "h1"]
+    assert single is not None and single.job_id == "h2"
+    assert sorted(api.claimed) == ["a1", "h1", "h2"]
+
+
+def test_poller_backs_off_when_a_full_lane_holds_back_every_listed_job() -> None:
+    api = ListingApi(jobs=[_scheduled_job(f"h{index}", "host") for index in range(10)])
+    started = threading.Event()
+    release = threading.Event()
+
+    class BlockingExecutor(FakeExecutor):
+        def execute(self, job: Job) -> JobExecutionResult:
+            started.set()
+            release.wait(timeout=5)
+            return super().execute(job)
+
+    poller = RunnerPoller(
+        api,
+        BlockingExecutor(),
+        poll_interval_seconds=5.0,
+        workers=4,
+        scheduler=LaneScheduler({"compile_captureone:host": 1}),
+        emit=lambda _: None,
+    )
+    thread = threading.Thread(target=poller.poll_forever)
+    thread.start()
+    assert started.wait(timeout=5)
+    time.sleep(0.2)
+
+    poller.stop()
+    release.set()
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    # One listing started h0; the next found only h-jobs its lane cannot run yet.
+    assert len(api.list_limits) == 2
+    assert api.claimed == ["h0"]
+
+
+def test_poller_renews_leases_of_claimed_jobs_waiting_behind_a_full_lane() -> None:
+    api = PrefetchApi(jobs=[_scheduled_job("h0", "host"), _scheduled_job("h1", "host")])
+    api.released = []
+    release = threading.Event()
+
+    class BlockingExecutor(FakeExecutor):
+        def execute(self, job: Job) -> JobExecutionResult:
+            release.wait(timeout=5)
+            return super().execute(job)
+
+    poller = RunnerPoller(
+        api,
+        BlockingExecutor(),
+        poll_interval_seconds=0.01,
+        workers=2,
+        heartbeat_interval_seconds=0.01,
+        scheduler=LaneScheduler({"compile_captureone:host": 1}),
+        emit=lambda _: None,
+    )
+    thread = threading.Thread(target=poller.poll_forever)
+    thread.start()
+    deadline = time.monotonic() + 5
+    while ("h1", "running") not in api.heartbeats and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    poller.stop()
+    release.set()
+    thread.join(timeout=5)
+    poller.close()
+
+    assert not thread.is_alive()
+    # h1 never started, yet its lease was renewed until it was released.
+    assert ("h1", "running") in api.heartbeats
+    assert api.released == ["h1"]
+    assert poller._heartbeats is not None and poller._heartbeats.tracked() == []
+
+
+def test_poller_releases_a_claimed_job_whose_first_heartbeat_fails() -> None:
+    class FailingHeartbeatApi(PrefetchApi):
+        def heartbeat_job(self, job_id: str, status: str) -> None:
+            raise RuntimeError("backend down")
+
+    api = FailingHeartbeatApi(jobs=_jobs(1))
+    executor = FakeExecutor()
+    poller = RunnerPoller(
+        api,
+        executor,
+        poll_interval_seconds=0.01,
+        heartbeat_interval_seconds=60,
+        emit=lambda _: None,
+    )
+
+    with pytest.raises(RuntimeError, match="backend down"):
+        poller.poll_once()
+    poller.close()
+
+    assert executor.executed == []
+    assert api.released == ["job_0"]
+    assert poller._heartbeats is not None and poller._heartbeats.tracked() == []
+
+
+def test_async_poller_releases_a_job_whose_first_heartbeat_fails() -> None:
+    class FailingHeartbeatApi(FakeAsyncApi):
+        def __init__(self, jobs: list[Job]) -> None:
+            super().__init__(jobs)
+            self.released: list[str] = []
+
+        async def heartbeat_job(self, job_id: str, status: str) -> None:
+            raise RuntimeError("backend down")
+
+        async def release_job(self, job_id: str) -> bool:
+            self.released.append(job_id)
+            return True
+
+    api = FailingHeartbeatApi(jobs=_jobs(1))
+    executor = FakeAsyncExecutor()
+    poller = AsyncRunnerPoller(
+        api,
+        executor,
+        poll_interval_seconds=0.01,
+        heartbeat_interval_seconds=60,
+        emit=lambda _: None,
+    )
+
+    async def run() -> None:
+        with pytest.raises(RuntimeError, match="backend down"):
+            await poller.poll_once()
+        await poller.aclose()
+
+    asyncio.run(run())
+
+    assert executor._sync.executed == []
+    assert api.released == ["job_0"]
+    assert poller._heartbeats is not None and poller._heartbeats.tracked() == []
+
+
+def test_async_poller_backs_off_when_a_full_lane_holds_back_every_listed_job() -> None:
+    api = FakeAsyncApi([])
+    api._sync = ListingApi(jobs=[_scheduled_job(f"h{index}", "host") for index in range(10)])
+
+    class SlowExecutor(FakeAsyncExecutor):
+        async def execute(self, job: Job) -> JobExecutionResult:
+            await asyncio.sleep(0.2)
+            return await super().execute(job)
+
+    poller = AsyncRunnerPoller(
+        api,
+        SlowExecutor(),
+        poll_interval_seconds=5.0,
+        workers=4,
+        scheduler=LaneScheduler({"compile_captureone:host": 1}),
+        emit=lambda _: None,
+    )
+
+    async def run() -> None:
+        task = asyncio.create_task(poller.poll_forever())
+        await asyncio.sleep(0.1)
+        poller.stop()
+        await asyncio.wait_for(task, timeout=5)
+
+    asyncio.run(run())
+
+    assert len(api._sync.list_limits) == 2
+    assert api._sync.claimed == ["h0"]
@@ -0,0 +1,157 @@
+import pytest
+
+from runner.resilience import CircuitBreaker, RetryBudget, RetryPolicy
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_circuit_breaker_opens_after_threshold_and_probes_after_timeout() -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout_seconds=10, clock=clock)
+
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.allow() is False
+
+    clock.now = 10
+    assert breaker.state == "half_open"
+    assert breaker.allow() is True
+    assert breaker.allow() is False
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow() is True
+
+
+def test_circuit_breaker_failed_probe_reopens() -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout_seconds=5, clock=clock)
+    for _ in range(3):
+        breaker.record_failure()
+
+    clock.now = 5
+    assert breaker.allow() is True
+    breaker.record_failure()
+
+    assert breaker.state == "open"
+    clock.now = 9
+    assert breaker.allow() is False
+
+
+def test_retry_budget_limits_retries_to_ratio_of_requests() -> None:
+    budget = RetryBudget(ratio=0.5, reserve=1)
+
+    assert budget.withdraw() is True
+    assert budget.withdraw() is False
+    budget.deposit()
+    assert budget.withdraw() is False
+    budget.deposit()
+    assert budget.withdraw() is True
+
+
+def test_retry_policy_uses_decorrelated_jitter_capped_at_max() -> None:
+    bounds: list[tuple[float, float]] = []
+
+    def jitter(low: float, high: float) -> float:
+        bounds.append((low, high))
+        return high
+
+    policy = RetryPolicy(
+        retries=4,
+        backoff_base_seconds=1.0,
+        backoff_max_seconds=20.0,
+        breaker_failure_threshold=0,
+        jitter=jitter,
+    )
+    attempts = policy.begin("GET /runner/jobs")
+    assert attempts is not None
+
+    delays = [attempts.failed() for _ in range(5)]
+
+    assert delays == [3.0, 9.0, 20.0, 20.0, None]
+    assert bounds[:3] == [(1.0, 3.0), (1.0, 9.0), (1.0, 27.0)]
+
+
+def test_retry_policy_honors_retry_after_and_gives_up_beyond_max() -> None:
+    policy = RetryPolicy(retries=3, backoff_max_seconds=10.0, jitter=lambda low, high: low)
+    attempts = policy.begin("POST /runner/jobs/claim-next")
+    assert attempts is not None
+
+    assert attempts.failed(retry_after=4.0) == 4.0
+    assert attempts.failed(retry_after=30.0) is None
+
+
+def test_retry_policy_stops_when_budget_is_empty_or_breaker_opens() -> None:
+    # The breaker counts failed requests, not attempts: two requests open it.
+    policy = RetryPolicy(
+        retries=5,
+        breaker_failure_threshold=2,
+        budget=RetryBudget(ratio=0.0, reserve=1),
+        jitter=lambda low, high: low,
+    )
+    attempts = policy.begin("complete")
+    assert attempts is not None
+    assert attempts.failed() is not None
+    assert attempts.failed() is None
+
+    attempts = policy.begin("complete")
+    assert attempts is not None
+    assert attempts.failed() is None
+    assert policy.begin("complete") is None
+    assert policy.begin("heartbeat") is not None
+
+
+@pytest.mark.parametrize(
+    ("failure_threshold", "reset_timeout_seconds"),
+    [(0, 1.0), (1, 0.0)],
+)
+def test_circuit_breaker_validates_arguments(
+    failure_threshold: int, reset_timeout_seconds: float
+) -> None:
+    with pytest.raises(ValueError):
+        CircuitBreaker(
+            failure_threshold=failure_threshold, reset_timeout_seconds=reset_timeout_seconds
+        )
+
+
+def test_retry_policy_counts_one_breaker_failure_per_request() -> None:
+    policy = RetryPolicy(retries=2, breaker_failure_threshold=3, jitter=lambda low, high: low)
+
+    for _ in range(2):
+        attempts = policy.begin("complete")
+        assert attempts is not None
+        assert [attempts.failed() for _ in range(3)][-1] is None
+
+    breaker = policy.breaker("complete")
+    assert breaker is not None and breaker.state == "closed"
+
+
+def test_retry_attempts_free_the_probe_of_a_request_that_ends_without_an_outcome() -> None:
+    now = [0.0]
+    policy = RetryPolicy(
+        retries=2, breaker_failure_threshold=1, breaker_reset_seconds=5.0, clock=lambda: now[0]
+    )
+    attempts = policy.begin("complete")
+    assert attempts is not None
+    assert [attempts.failed() for _ in range(3)][-1] is None
+    now[0] = 5.0
+
+    probe = policy.begin("complete")
+    assert probe is not None
+    assert policy.begin("complete") is None
+    with pytest.raises(KeyboardInterrupt), probe:
+        raise KeyboardInterrupt
+
+    retried = policy.begin("complete")
+    assert retried is not None
+    # The probe gets a single attempt; its failure reopens the breaker.
+    assert retried.failed() is None
+    assert policy.begin("complete") is None
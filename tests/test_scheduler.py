@@ -0,0 +1,85 @@
+import pytest
+
+from runner.config import RunnerSettings
+from runner.scheduler import LaneScheduler, job_lane
+from runner.types import CompileCaptureOnePayload, ExecutionMode, Job, Priority
+
+_HOST = "compile_captureone:host"
+_API = "compile_captureone:api"
+
+
+def _job(job_id: str, mode: ExecutionMode = "api", priority: Priority = "normal") -> Job:
+    return Job(
+        job_id=job_id,
+        job_type="compile_captureone",
+        payload=CompileCaptureOnePayload(style_id="s1", version="v1", execution_mode=mode),
+        priority=priority,
+    )
+
+
+def _drain_started(scheduler: LaneScheduler) -> list[str]:
+    started = []
+    while (job := scheduler.next_job()) is not None:
+        started.append(job.job_id)
+    return started
+
+
+def test_job_lane_follows_the_default_execution_mode() -> None:
+    assert job_lane(_job("a", "host")) == _HOST
+    assert job_lane(_job("a")) == _API
+    assert job_lane(_job("a"), default_execution_mode="host") == _HOST
+
+
+def test_scheduler_caps_running_jobs_per_lane() -> None:
+    scheduler = LaneScheduler({_HOST: 1})
+    scheduler.offer([_job("h1", "host"), _job("h2", "host"), _job("a1"), _job("a2")])
+
+    assert _drain_started(scheduler) == ["h1", "a1", "a2"]
+    assert scheduler.running(_HOST) == 1
+    assert scheduler.queued() == 1
+    assert scheduler.runnable() == 0
+
+    scheduler.finished(_job("h1", "host"))
+    assert scheduler.runnable() == 1
+    assert _drain_started(scheduler) == ["h2"]
+
+
+def test_scheduler_runs_higher_priority_first_and_rotates_lanes() -> None:
+    scheduler = LaneScheduler()
+    scheduler.offer(
+        [
+            _job("h1", "host"),
+            _job("h2", "host"),
+            _job("h3", "host"),
+            _job("a1"),
+            _job("a2"),
+            _job("low", priority="low"),
+            _job("urgent", "host", priority="high"),
+        ]
+    )
+
+    assert _drain_started(scheduler) == ["urgent", "a1", "h1", "a2", "h2", "h3", "low"]
+
+
+def test_scheduler_select_leaves_unpicked_candidates_unqueued() -> None:
+    scheduler = LaneScheduler({_HOST: 1})
+    scheduler.offer([_job("queued")])
+    candidates = [_job("h1", "host"), _job("h2", "host"), _job("a1", priority="high")]
+
+    assert [job.job_id for job in scheduler.select(candidates, 3)] == ["a1", "h1"]
+    assert scheduler.running(_HOST) == 1
+    assert [job.job_id for job in scheduler.drain()] == ["queued"]
+
+    preview = scheduler.select([_job("h3", "host"), _job("a2")], 2, start=False)
+    assert [job.job_id for job in preview] == ["a2"]
+    assert scheduler.running(_API) == 1
+
+
+def test_scheduler_from_settings_and_validation() -> None:
+    settings = RunnerSettings(lane_limits={_HOST: 2}, execution_mode="host")
+    scheduler = LaneScheduler.from_settings(settings)
+    scheduler.offer([_job("a1"), _job("a2"), _job("a3")])
+
+    assert _drain_started(scheduler) == ["a1", "a2"]
+    with pytest.raises(ValueError, match="Lane limit"):
+        LaneScheduler({_HOST: 0})
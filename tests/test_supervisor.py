@@ -0,0 +1,85 @@
+import json
+import multiprocessing
+import os
+import signal
+import threading
+import time
+
+from runner.metrics import REGISTRY, MergedMetrics, MetricsRegistry
+from runner.supervisor import SharedJobSlots, Supervisor, push_metrics
+
+# Fork keeps the test targets importable without a spawn-safe module path.
+_FORK = multiprocessing.get_context("fork")
+
+
+def _crash(index: int, slots: object, metrics_queue: object) -> None:
+    os._exit(3)
+
+
+def _count_until_terminated(index: int, slots: object, metrics_queue: object) -> None:
+    stopped = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stopped.set())
+    with push_metrics(metrics_queue, index, interval_seconds=0.05):
+        REGISTRY.counter("supervised_jobs_total", "Jobs.").inc()
+        stopped.wait(10)
+
+
+def test_shared_job_slots_cap_jobs_held_by_all_processes() -> None:
+    shared = SharedJobSlots(5, 2, _FORK)
+    first, second = shared.for_process(0), shared.for_process(1)
+
+    assert first.reserve(0, 4) == 4
+    assert second.reserve(0, 4) == 1
+    first.settle(2)
+    assert second.reserve(1, 4) == 2
+    assert shared.held() == 5
+
+    shared.reset(1)
+    assert first.reserve(2, 4) == 3
+
+
+def test_supervisor_restarts_crashed_processes_with_backoff() -> None:
+    emitted: list[str] = []
+    supervisor = Supervisor(
+        _crash,
+        processes=1,
+        restart_backoff_seconds=0.01,
+        max_restart_backoff_seconds=0.04,
+        stable_after_seconds=60,
+        emit=emitted.append,
+        context=_FORK,
+    )
+    timer = threading.Timer(2.0, supervisor.stop)
+    timer.start()
+
+    supervisor.run()
+
+    exits = [json.loads(line) for line in emitted if '"process_exited"' in line]
+    assert len(exits) >= 4
+    assert all(event["exitcode"] == 3 for event in exits)
+    delays = [event["restart_in_seconds"] for event in exits]
+    assert delays[:4] == [0.01, 0.02, 0.04, 0.04]
+
+
+def test_supervisor_stop_terminates_children_and_merges_their_metrics() -> None:
+    metrics = MergedMetrics(MetricsRegistry())
+    emitted: list[str] = []
+    supervisor = Supervisor(
+        _count_until_terminated,
+        processes=2,
+        metrics=metrics,
+        emit=emitted.append,
+        context=_FORK,
+    )
+    timer = threading.Timer(0.5, supervisor.stop, args=("SIGTERM",))
+    timer.start()
+
+    started = time.monotonic()
+    assert supervisor.run() == 0
+
+    assert time.monotonic() - started < 5
+    assert "supervised_jobs_total 2" in metrics.render()
+    events = [json.loads(line)["event"] for line in emitted]
+    assert events.count("process_started") == 2
+    assert "supervisor_stopping" in events
+    assert events.count("process_exited") == 2
@@ -0,0 +1,139 @@
+import json
+from collections.abc import Iterator
+
+import httpx
+import pytest
+
+from runner.config import RunnerSettings
+from runner.http import RunnerHttpClient
+from runner.poller import RunnerPoller
+from runner.tracing import (
+    JsonLinesSpanExporter,
+    Span,
+    configure_tracing,
+    inject_traceparent,
+    start_span,
+)
+from runner.types import CompileCaptureOnePayload, Job, JobExecutionResult
+
+
+class MemoryExporter:
+    def __init__(self) -> None:
+        self.spans: list[Span] = []
+
+    def export(self, span: Span) -> None:
+        self.spans.append(span)
+
+
+@pytest.fixture
+def exporter() -> Iterator[MemoryExporter]:
+    memory = MemoryExporter()
+    configure_tracing(memory)
+    yield memory
+    configure_tracing(None)
+
+
+def test_start_span_is_noop_while_tracing_is_off() -> None:
+    with start_span("job") as span:
+        assert span is None
+        assert inject_traceparent({"X-Request-ID": "r1"}) == {"X-Request-ID": "r1"}
+
+
+def test_child_spans_share_the_trace_and_errors_are_recorded(exporter: MemoryExporter) -> None:
+    with start_span("job") as root:
+        with pytest.raises(RuntimeError):
+            with start_span("host_import"):
+                raise RuntimeError("launch failed")
+
+    child, parent = exporter.spans
+    assert root is parent
+    assert parent.parent_span_id is None
+    assert child.trace_id == parent.trace_id
+    assert child.parent_span_id == parent.span_id
+    assert child.status == "error"
+    assert child.status_message == "launch failed"
+    assert parent.status == "unset"
+    assert parent.end_time_unix_nano >= child.end_time_unix_nano
+
+
+def test_http_requests_carry_traceparent_of_their_client_span(exporter: MemoryExporter) -> None:
+    seen: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers["traceparent"])
+        return httpx.Response(200, json={})
+
+    settings = RunnerSettings(http_retries=0)
+    with RunnerHttpClient(settings, transport=httpx.MockTransport(handler)) as client:
+        with start_span("job"):
+            client.request_json("POST", "/runner/jobs/job_1/claim", endpoint="claim")
+
+    claim, job = exporter.spans
+    assert claim.name == "claim"
+    assert claim.kind == "client"
+    assert claim.parent_span_id == job.span_id
+    assert claim.attributes["http.response.status_code"] == 200
+    assert seen == [f"00-{job.trace_id}-{claim.span_id}-01"]
+
+
+def test_poller_wraps_each_job_in_a_span(exporter: MemoryExporter) -> None:
+    class Api:
+        long_poll_active = False
+
+        def claim_job(self, job_id: str) -> None:
+            with start_span("claim"):
+                pass
+
+        def heartbeat_job(self, job_id: str, status: str) -> None:
+            pass
+
+        def complete_job(self, result: JobExecutionResult) -> None:
+            with start_span("complete"):
+                pass
+
+    class Executor:
+        def execute(self, job: Job) -> JobExecutionResult:
+            return JobExecutionResult(
+                job_id=job.job_id, status="failed", result=None, error="boom", logs=[]
+            )
+
+    poller = RunnerPoller(Api(), Executor(), poll_interval_seconds=1, emit=lambda _: None)
+    poller.execute_job(
+        Job(
+            job_id="job_1",
+            job_type="compile_captureone",
+            payload=CompileCaptureOnePayload(style_id="s1", version="v1"),
+        )
+    )
+
+    claim, complete, job = exporter.spans
+    assert job.name == "job"
+    assert job.attributes["runner.job.id"] == "job_1"
+    assert job.status == "error"
+    assert {claim.parent_span_id, complete.parent_span_id} == {job.span_id}
+
+
+def test_json_lines_exporter_writes_otlp_json(tmp_path) -> None:
+    path = tmp_path / "spans.jsonl"
+    configure_tracing(JsonLinesSpanExporter(path))
+    try:
+        with start_span("compile", kind="client", attributes={"http.response.status_code": 200}):
+            pass
+    finally:
+        configure_tracing(None)
+
+    (line,) = path.read_text(encoding="utf-8").splitlines()
+    resource_spans = json.loads(line)["resourceSpans"][0]
+    assert resource_spans["resource"]["attributes"] == [
+        {"key": "service.name", "value": {"stringValue": "styleagent-runner"}}
+    ]
+    (span,) = resource_spans["scopeSpans"][0]["spans"]
+    assert span["name"] == "compile"
+    assert span["kind"] == 3
+    assert len(span["traceId"]) == 32
+    assert len(span["spanId"]) == 16
+    assert "parentSpanId" not in span
+    assert span["attributes"] == [
+        {"key": "http.response.status_code", "value": {"intValue": "200"}}
+    ]
+    assert int(span["endTimeUnixNano"]) >= int(span["startTimeUnixNano"])
@@ -1,3 +1,5 @@
+from datetime import datetime, timezone
+
 import pytest
 
 from runner.types import job_from_dict, transition_status
@@ -63,3 +65,34 @@ def test_job_from_dict_invalid_execution_mode_raises() -> None:
                 "payload": {"style_id": "style_1", "version": "v2", "execution_mode": "desktop"},
             }
         )
+
+
+def test_job_from_dict_parses_priority() -> None:
+    base = {
+        "job_id": "job_1",
+        "job_type": "compile_captureone",
+        "payload": {"style_id": "style_1", "version": "v1"},
+    }
+
+    assert job_from_dict(base).priority == "normal"
+    high = job_from_dict({**base, "payload": {**base["payload"], "priority": "high"}})
+    assert high.priority == "high"
+    unknown = job_from_dict({**base, "payload": {**base["payload"], "priority": 5}})
+    assert unknown.priority == "normal"
+
+
+def test_job_from_dict_parses_created_at() -> None:
+    base = {
+        "job_id": "job_3",
+        "job_type": "compile_captureone",
+        "payload": {"style_id": "style_3", "version": "v1"},
+    }
+
+    job = job_from_dict({**base, "created_at": "2026-01-02T03:04:05Z"})
+    naive = job_from_dict({**base, "created_at": "2026-01-02T03:04:05"})
+    invalid = job_from_dict({**base, "created_at": "yesterday"})
+
+    assert job.created_at == datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    assert naive.created_at == job.created_at
+    assert invalid.created_at is None
+    assert job_from_dict(base).created_at is None